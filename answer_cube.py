@@ -0,0 +1,277 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from column_rc import calculate_column_size
+from beam_rc import calculate_beam_size
+from slab_rc import calculate_slab_thickness, hcs_selected_slab_check
+from design_options import available_combinations
+from file_cache import load_cached
+
+# The discrete UI input domain covered by the cube. Sizing does not depend on
+# the building footprint, and the column type only changes the column weight,
+# so the cube is indexed by (beam/slab pair, s1, s2, live load step, f2f).
+S1_VALUES = tuple(range(5, 14))
+S2_VALUES = tuple(range(0, 13))
+LIVE_LOAD_STEPS = 201  # 0.0 to 20.0 kN/m² in 0.1 steps
+F2F_VALUES = tuple(range(2, 7))
+DESIGN_PAIRS = tuple(dict.fromkeys((c["beam"], c["slab"]) for c in available_combinations))
+
+# Effective slab types after the HCS check, stored as codes
+SLAB_TYPES = ("CIS Slab", "1.2HC Slab", "2.4HC Slab", "PT Flat Slab", "1.2HCS_S3", "2.4HCS_S3")
+
+# status: 0 = sizing succeeded, 1 = the live pipeline raises for these inputs
+CUBE_DTYPE = np.dtype([
+    ("status", "u1"),
+    ("effective_slab", "u1"),
+    ("column_size", "u2"),  # mm
+    ("b_s1", "u2"),
+    ("d_s1", "u2"),
+    ("b_s2", "u2"),
+    ("d_s2", "u2"),
+    ("b_s3", "u2"),
+    ("d_s3", "u2"),
+    ("slab_thickness", "u2"),
+    ("slab_max_spacing_pt", "u2"),
+    ("hcs_slab_thickness", "u2"),
+])
+
+CUBE_SHAPE = (len(DESIGN_PAIRS), len(S1_VALUES), len(S2_VALUES), LIVE_LOAD_STEPS, len(F2F_VALUES))
+
+# Files whose content determines the cube; a cube built from other versions is ignored
+SOURCE_FILES = ("column_rc.py", "beam_rc.py", "slab_rc.py", "hcs_data.csv", "design_options.py", "answer_cube.py")
+
+SIZING_FIELDS = ("b_s1", "d_s1", "b_s2", "d_s2", "b_s3", "d_s3")
+
+
+def source_fingerprint(directory=None):
+    """
+    SHA-256 over the sizing modules, the HCS catalogue, the design options and
+    this module.
+    """
+    directory = directory or os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in SOURCE_FILES:
+        with open(os.path.join(directory, name), "rb") as f:
+            digest.update(name.encode() + b"\0" + f.read())
+    return digest.hexdigest()
+
+
+def cube_metadata():
+    """
+    Domain of the cube and fingerprint of the code that builds it, as stored in
+    the .json sidecar. A cube is only used when its sidecar equals this.
+    """
+    return {
+        "fingerprint": source_fingerprint(),
+        "shape": list(CUBE_SHAPE),
+        "design_pairs": [list(pair) for pair in DESIGN_PAIRS],
+        "s1": list(S1_VALUES),
+        "s2": list(S2_VALUES),
+        "live_load_steps": LIVE_LOAD_STEPS,
+        "f2f": list(F2F_VALUES),
+        "slab_types": list(SLAB_TYPES),
+    }
+
+
+def column_weight(column_size_mm, selected_column, f2f):
+    # Same expressions as calculate_column_size
+    if selected_column == "CIS Column":
+        return column_size_mm ** 2 * (f2f) * 2.5 * 0
+    if selected_column == "PC Column":
+        return column_size_mm ** 2 * (f2f) * 2.5
+    raise ValueError(f"Unsupported column type: {selected_column}")
+
+
+def build_cube(progress=None):
+    """
+    Evaluate column, slab and beam sizing over the whole cube domain with the
+    scalar (reference) functions.
+
+    Returns:
+    - cube (ndarray): Structured array of CUBE_DTYPE with shape CUBE_SHAPE.
+    """
+    cube = np.zeros(CUBE_SHAPE, dtype=CUBE_DTYPE)
+    limit = np.iinfo(np.uint16).max
+
+    for p, (selected_beam, selected_slab) in enumerate(DESIGN_PAIRS):
+        for i, s1 in enumerate(S1_VALUES):
+            for j, s2 in enumerate(S2_VALUES):
+                for k in range(LIVE_LOAD_STEPS):
+                    live_load = k / 10
+                    cells = cube[p, i, j, k]
+                    try:
+                        effective_slab = hcs_selected_slab_check(s1, live_load, selected_slab)
+                        slab_sizes = calculate_slab_thickness(s1, s2, live_load, effective_slab)
+                    except Exception:
+                        cells["status"] = 1
+                        continue
+
+                    for f, f2f in enumerate(F2F_VALUES):
+                        cell = cells[f]
+                        try:
+                            column_size_mm, _ = calculate_column_size(s1, s2, live_load, "CIS Column", f2f)
+                            beam_sizes = calculate_beam_size(s1, s2, live_load, column_size_mm, selected_beam, effective_slab)
+                        except Exception:
+                            cell["status"] = 1
+                            continue
+                        values = (round(column_size_mm * 1000), *beam_sizes, *slab_sizes)
+                        if any(not 0 <= v <= limit for v in values):
+                            raise ValueError(f"Sizing result out of range for the cube: {values}")
+                        cells[f] = (0, SLAB_TYPES.index(effective_slab), *values)
+        if progress:
+            progress(p + 1, len(DESIGN_PAIRS))
+    return cube
+
+
+def write_cube(cube, path):
+    """
+    Save the cube as a .npy file plus a .json sidecar with the domain and
+    source fingerprint.
+    """
+    np.save(path, cube)
+    with open(os.path.splitext(path)[0] + ".json", "w") as f:
+        json.dump(cube_metadata(), f, indent=2)
+
+
+class AnswerCube:
+    """
+    Memory-mapped sizing cube answering run_pipeline's sizing stage with one
+    index lookup.
+    """
+
+    def __init__(self, cube):
+        self.cube = cube
+        self._pairs = {pair: index for index, pair in enumerate(DESIGN_PAIRS)}
+
+    def index(self, selected_beam, selected_slab, s1, s2, live_load, f2f):
+        """
+        Cube index for the inputs, or None when they are outside the domain.
+
+        live_load is matched to its 0.1 step, tolerating floating point noise
+        from the UI (as the pipeline cache key does).
+        """
+        p = self._pairs.get((selected_beam, selected_slab))
+        k = round(live_load * 10)
+        if p is None or abs(live_load * 10 - k) > 1e-6 or not 0 <= k < LIVE_LOAD_STEPS:
+            return None
+        indices = [p]
+        for value, axis in ((s1, S1_VALUES), (s2, S2_VALUES), (f2f, F2F_VALUES)):
+            if value != int(value) or int(value) not in axis:
+                return None
+            indices.append(int(value) - axis[0])
+        return (indices[0], indices[1], indices[2], k, indices[3])
+
+    def lookup(self, selected_column, selected_beam, selected_slab, s1, s2, live_load, f2f):
+        """
+        Sizing results exactly as run_pipeline computes them live.
+
+        Returns:
+        - sizing (dict): effective selected_slab, column_size_mm,
+          column_weight_tonnes, beam and slab sizes; or None when the inputs are
+          outside the domain or the live computation raises for them.
+        """
+        if selected_column not in ("CIS Column", "PC Column"):
+            return None
+        index = self.index(selected_beam, selected_slab, s1, s2, live_load, f2f)
+        if index is None:
+            return None
+        cell = self.cube[index]
+        if cell["status"]:
+            return None
+
+        column_size_mm = int(cell["column_size"]) / 1000
+        sizing = {
+            "selected_slab": SLAB_TYPES[cell["effective_slab"]],
+            "column_size_mm": column_size_mm,
+            "column_weight_tonnes": column_weight(column_size_mm, selected_column, f2f),
+        }
+        for name in SIZING_FIELDS:
+            sizing[f"{name}_mm"] = int(cell[name])
+        sizing["slab_thickness_mm"] = int(cell["slab_thickness"])
+        sizing["slab_max_spacing_pt_mm"] = int(cell["slab_max_spacing_pt"])
+        sizing["hcs_slab_thickness_mm"] = int(cell["hcs_slab_thickness"])
+        return sizing
+
+
+def _load_answer_cube(path):
+    with open(os.path.splitext(path)[0] + ".json") as f:
+        meta = json.load(f)
+    if meta != cube_metadata():
+        return None  # built from other sizing code, data or domain axes: ignore it
+    cube = np.load(path, mmap_mode="r")
+    if cube.dtype != CUBE_DTYPE or cube.shape != CUBE_SHAPE:
+        return None
+    return AnswerCube(cube)
+
+
+def get_answer_cube(file_name=None):
+    """
+    Return the shared AnswerCube, or None if no up-to-date cube file exists.
+
+    The file is DFMA_ANSWER_CUBE (default dfma_cube.npy); it is memory-mapped,
+    so every session and process shares the same pages.
+    """
+    file_name = file_name or os.environ.get("DFMA_ANSWER_CUBE", "dfma_cube.npy")
+    if not os.path.exists(file_name):
+        return None
+    return load_cached(file_name, _load_answer_cube)
+
+
+def verify_cube(answer_cube, samples=2000, seed=0):
+    """
+    Compare random cube lookups against the live sizing functions.
+
+    Returns:
+    - mismatches (list): Inputs whose cube answer differs from the live one.
+    """
+    rng = random.Random(seed)
+    mismatches = []
+    for _ in range(samples):
+        column = rng.choice(("CIS Column", "PC Column"))
+        beam, slab = rng.choice(DESIGN_PAIRS)
+        s1, s2, f2f = rng.choice(S1_VALUES), rng.choice(S2_VALUES), rng.choice(F2F_VALUES)
+        live_load = rng.randrange(LIVE_LOAD_STEPS) / 10
+        try:
+            column_size_mm, column_weight_tonnes = calculate_column_size(s1, s2, live_load, column, f2f)
+            effective_slab = hcs_selected_slab_check(s1, live_load, slab)
+            beam_sizes = calculate_beam_size(s1, s2, live_load, column_size_mm, beam, effective_slab)
+            slab_sizes = calculate_slab_thickness(s1, s2, live_load, effective_slab)
+            live = {"selected_slab": effective_slab, "column_size_mm": column_size_mm, "column_weight_tonnes": column_weight_tonnes}
+            live.update(zip([f"{name}_mm" for name in SIZING_FIELDS], beam_sizes))
+            live.update(zip(("slab_thickness_mm", "slab_max_spacing_pt_mm", "hcs_slab_thickness_mm"), slab_sizes))
+        except Exception:
+            live = None
+        cached = answer_cube.lookup(column, beam, slab, s1, s2, live_load, f2f)
+        if cached != live or (live is not None and any(type(cached[key]) is not type(live[key]) for key in live)):
+            mismatches.append((column, beam, slab, s1, s2, live_load, f2f))
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the precomputed sizing cube for the UI input domain.")
+    parser.add_argument("--output", default="dfma_cube.npy", help="Cube file to write (default: dfma_cube.npy)")
+    parser.add_argument("--verify", type=int, default=2000, help="Random lookups checked against live sizing (default: 2000)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    cube = build_cube(progress=lambda done, total: print(f"{done}/{total} beam/slab pairs", file=sys.stderr))
+    write_cube(cube, args.output)
+    print(f"Wrote {cube.size} cells ({cube.nbytes / 1024 / 1024:.1f} MiB) to {args.output} in {time.perf_counter() - start:.1f} s")
+
+    if args.verify:
+        mismatches = verify_cube(_load_answer_cube(os.path.abspath(args.output)), args.verify)
+        print(f"{len(mismatches)} of {args.verify} sampled lookups differ from live sizing")
+        if mismatches:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
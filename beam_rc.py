@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 def calculate_beam_size(s1, s2, live_load, column_size_mm, selected_beam, selected_slab, dead_load=7.0, f_ck=40, b_to_d_ratio=0.5, k_con=0.167, k_pt = 0.25,
     gamma_c=1.5, gamma_s=1.15, gamma_DL=1.35, gamma_LL=1.5):
@@ -132,3 +133,95 @@ def calculate_beam_size(s1, s2, live_load, column_size_mm, selected_beam, select
             d_s3_mm = round(d_s3_mm / 100) * 100 
     
     return int(b_s1_mm), int(d_s1_mm), int(b_s2_mm), int(d_s2_mm), int(b_s3_mm), int(d_s3_mm)
+
+
+def calculate_beam_size_batch(s1, s2, live_load, column_size_mm, selected_beam, selected_slab, dead_load=7.0, f_ck=40, b_to_d_ratio=0.5, k_con=0.167, k_pt = 0.25,
+    gamma_c=1.5, gamma_s=1.15, gamma_DL=1.35, gamma_LL=1.5):
+    """
+    Vectorised version of calculate_beam_size.
+
+    s1, s2, live_load and column_size_mm may be NumPy arrays (or scalars) and are
+    broadcast against each other. selected_beam applies to the whole batch, while
+    selected_slab may be a single slab type or an array of slab types (e.g. the
+    output of hcs_selected_slab_check_batch) so that "_S3" layouts are handled
+    per element. Results are identical to calculate_beam_size element by element.
+
+    Returns:
+    - b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm (ndarray of int): Beam sizes in mm.
+    """
+    s1, s2, live_load, column_size_mm = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (s1, s2, live_load, column_size_mm)))
+    is_s3 = np.broadcast_to(np.isin(np.asarray(selected_slab), ["1.2HCS_S3", "2.4HCS_S3"]), s1.shape)
+
+    # Apply safety factors to loads
+    design_dead_load = dead_load * gamma_DL
+    design_live_load = live_load * gamma_LL
+    q_total = design_dead_load + design_live_load
+
+    f_cd = f_ck / gamma_c
+
+    w = q_total * s2
+    M = (w * s1**2) / 8
+    M_Nmm = M * 1e6
+
+    column_width_mm = column_size_mm * 1000
+    zeros = np.zeros(s1.shape)
+
+    if selected_beam == "CIS Beam":
+        d_s2_mm = np.sqrt(M_Nmm / (k_con * 300 * f_cd))
+        b_s2_mm = np.maximum(column_width_mm, d_s2_mm * b_to_d_ratio)
+        d_s2_mm = np.round(d_s2_mm / 100) * 100
+
+        b_s1_mm = column_width_mm
+        d_s1_mm = np.round(s1 / 15 * 1000 / 100) * 100
+        d_s1_mm = np.maximum(d_s1_mm, b_s1_mm)
+
+        # Secondary beam (S3) layouts
+        d_s2_s3 = np.sqrt(M_Nmm/2 / (k_con * 300 * f_cd))
+        b_s2_s3 = np.maximum(column_width_mm, d_s2_s3 * b_to_d_ratio)
+        d_s2_s3 = np.round(d_s2_s3 / 100) * 100
+
+        d_s1_s3 = np.sqrt(M_Nmm / (k_con * 300 * f_cd))
+        b_s1_s3 = np.maximum(column_width_mm, b_s2_s3)
+        d_s1_s3 = np.round(d_s1_s3 / 100) * 100
+
+        b_s3_s3 = b_s2_s3
+        d_s3_s3 = d_s2_s3
+
+    elif selected_beam == "PT Beam":
+        d_s2_mm = np.sqrt(M_Nmm / (k_pt * 300 * f_cd))
+        b_s2_mm = d_s2_mm * b_to_d_ratio
+        d_s2_mm = np.round(d_s2_mm / 100) * 100
+        b_s2_mm = np.round(b_s2_mm / 100) * 100
+
+        b_s1_mm = column_width_mm
+        d_s1_mm = np.round(s1 / 15 * 1000 / 100) * 100
+        d_s1_mm = np.minimum(d_s1_mm, b_s1_mm)
+
+        # Secondary beam (S3) layouts
+        d_s2_s3 = np.sqrt(M_Nmm/2 / (k_pt * 300 * f_cd))
+        b_s2_s3 = np.round(d_s2_s3 * b_to_d_ratio / 100) * 100
+        d_s2_s3 = np.round(d_s2_s3 / 100) * 100
+
+        d_s1_s3 = np.sqrt(M_Nmm / (k_pt * 300 * f_cd))
+        b_s1_s3 = np.maximum(column_width_mm, b_s2_s3)
+        d_s1_s3 = np.round(d_s1_s3 / 100) * 100
+
+        d_s3_s3 = np.sqrt(M_Nmm/2 / (k_con * 300 * f_cd))
+        b_s3_s3 = np.maximum(column_width_mm, d_s3_s3 * b_to_d_ratio)
+        d_s3_s3 = np.maximum(d_s3_s3, d_s2_s3)
+        d_s3_s3 = np.round(d_s3_s3 / 100) * 100
+
+    elif selected_beam == "PT Flat Slab":
+        return tuple(zeros.astype(int) for _ in range(6))
+
+    else:
+        raise ValueError(f"Unsupported beam type: {selected_beam}")
+
+    b_s1_mm = np.where(is_s3, b_s1_s3, b_s1_mm)
+    d_s1_mm = np.where(is_s3, d_s1_s3, d_s1_mm)
+    b_s2_mm = np.where(is_s3, b_s2_s3, b_s2_mm)
+    d_s2_mm = np.where(is_s3, d_s2_s3, d_s2_mm)
+    b_s3_mm = np.where(is_s3, b_s3_s3, zeros)
+    d_s3_mm = np.where(is_s3, d_s3_s3, zeros)
+
+    return tuple(np.trunc(v).astype(int) for v in (b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm))
@@ -0,0 +1,248 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from column_rc import calculate_column_size
+from beam_rc import calculate_beam_size
+from slab_rc import calculate_slab_thickness, hcs_selected_slab_check
+from output_data import calculate_layout_outputs
+from design_options import available_combinations
+from pipeline import create_result_plot, figure_to_png, grid_footprint, run_pipeline
+
+# Building footprints (length, width in meters) at the ends and default of the UI ranges,
+# plus a campus-scale site for large-site mode
+BUILDING_SIZES = {
+    "small": (20, 20),
+    "default": (60, 40),
+    "max": (100, 40),
+    "campus": (2000, 1000),
+}
+
+# Remaining UI defaults used for every benchmark case
+DEFAULT_INPUTS = {"s1": 10, "s2": 10, "live_load": 3.0, "f2f": 6}
+
+STAGES = [
+    "calculate_column_size",
+    "hcs_selected_slab_check",
+    "calculate_beam_size",
+    "calculate_slab_thickness",
+    "calculate_layout_outputs",
+    "create_grid_plot",
+    "render_png",
+    "end_to_end",
+]
+
+
+def time_call(func, repeat=5, min_time=0.1):
+    """
+    Time func like timeit: calls are batched so one sample lasts at least
+    min_time seconds, and repeat samples are taken.
+
+    Returns:
+    - timing (dict): Per-call min, median and max in seconds, with the number of
+      calls per sample and samples taken.
+    """
+    func()  # warm up caches (catalogues, fonts, lru caches)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+
+    return {
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "max_s": max(samples),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def stage_functions(combination, length, width, s1, s2, live_load, f2f):
+    """
+    Build one zero-argument callable per pipeline stage for a benchmark case.
+    Each stage is fed the outputs of the previous ones, computed once up front.
+    """
+    import matplotlib.pyplot as plt
+
+    selected_column, selected_beam, selected_slab = combination["column"], combination["beam"], combination["slab"]
+    result = run_pipeline(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f)
+    effective_slab = result["selected_slab"]
+    column_size_mm = result["column_size_mm"]
+    beam_sizes = [result[name] for name in ("b_s1_mm", "d_s1_mm", "b_s2_mm", "d_s2_mm", "b_s3_mm", "d_s3_mm")]
+    slab_sizes = [result[name] for name in ("slab_thickness_mm", "slab_max_spacing_pt_mm", "hcs_slab_thickness_mm")]
+
+    def render_png():
+        figure_to_png(create_result_plot(result))
+
+    def end_to_end():
+        figure_to_png(create_result_plot(
+            run_pipeline(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f)))
+
+    return {
+        "calculate_column_size": lambda: calculate_column_size(s1, s2, live_load, selected_column, f2f),
+        "hcs_selected_slab_check": lambda: hcs_selected_slab_check(s1, live_load, selected_slab),
+        "calculate_beam_size": lambda: calculate_beam_size(s1, s2, live_load, column_size_mm, selected_beam, effective_slab),
+        "calculate_slab_thickness": lambda: calculate_slab_thickness(s1, s2, live_load, effective_slab),
+        "calculate_layout_outputs": lambda: calculate_layout_outputs(
+            s1, s2, live_load, column_size_mm, selected_column, selected_beam, effective_slab, length, width,
+            *beam_sizes, *slab_sizes, f2f),
+        "create_grid_plot": lambda: plt.close(create_result_plot(result)),
+        "render_png": render_png,
+        "end_to_end": end_to_end,
+    }
+
+
+def combination_name(combination):
+    return f'{combination["column"]} / {combination["beam"]} / {combination["slab"]}'
+
+
+def run_benchmarks(sizes=None, stages=None, repeat=5, min_time=0.1, combinations=None, progress=None):
+    """
+    Time every stage for each combination and building size.
+
+    Returns:
+    - results (list): One dict per (combination, size, stage) with the timing
+      from time_call, or an "error" entry when the case cannot be evaluated.
+    """
+    sizes = sizes or list(BUILDING_SIZES)
+    stages = stages or STAGES
+    combinations = combinations or available_combinations
+    s1, s2, live_load, f2f = (DEFAULT_INPUTS[k] for k in ("s1", "s2", "live_load", "f2f"))
+
+    results = []
+    for combination in combinations:
+        for size in sizes:
+            length, width = grid_footprint(*BUILDING_SIZES[size], s1, s2)
+            case = {"combination": combination_name(combination), "size": size, "length": length, "width": width}
+            try:
+                functions = stage_functions(combination, length, width, s1, s2, live_load, f2f)
+            except Exception as e:
+                results.append(dict(case, stage="setup", error=f"{type(e).__name__}: {e}"))
+                continue
+            for stage in stages:
+                timing = time_call(functions[stage], repeat=repeat, min_time=min_time)
+                results.append(dict(case, stage=stage, **timing))
+                if progress:
+                    progress(results[-1])
+    return results
+
+
+def environment_info():
+    """
+    Interpreter, library and commit details stored alongside the results.
+    """
+    import numpy
+    import pandas
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "matplotlib": matplotlib.__version__,
+    }
+
+
+def compare_results(baseline, current, threshold=0.1):
+    """
+    Compare the median timings of two benchmark runs.
+
+    Returns:
+    - rows (list): (combination, size, stage, baseline_s, current_s, ratio) for
+      every case present in both runs.
+    - regressions (list): The rows whose ratio exceeds 1 + threshold.
+    """
+    def key(r):
+        return r["combination"], r["size"], r["stage"]
+
+    baseline_by_key = {key(r): r for r in baseline["results"] if "median_s" in r}
+    rows = []
+    for r in current["results"]:
+        old = baseline_by_key.get(key(r))
+        if old is None or "median_s" not in r:
+            continue
+        rows.append((*key(r), old["median_s"], r["median_s"], r["median_s"] / old["median_s"]))
+    regressions = [row for row in rows if row[-1] > 1 + threshold]
+    return rows, regressions
+
+
+def format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time each DfMA pipeline stage and the whole Generate path for every available combination.")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write (default: benchmark_results.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Earlier results JSON to compare the new run against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown ratio reported as a regression (default: 0.1 = 10%%)")
+    parser.add_argument("--sizes", nargs="+", choices=list(BUILDING_SIZES), help="Building sizes to run (default: all)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, help="Stages to time (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per case (default: 5)")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum seconds per sample (default: 0.1)")
+    parser.add_argument("--quick", action="store_true", help="One short sample per case, for smoke runs")
+    parser.add_argument("--quiet", action="store_true", help="Do not print per-case timings")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.repeat, args.min_time = 1, 0.01
+
+    def progress(result):
+        if not args.quiet:
+            print(f'{result["combination"]:<40} {result["size"]:<8} {result["stage"]:<26} {format_seconds(result["median_s"])}')
+
+    results = run_benchmarks(args.sizes, args.stages, args.repeat, args.min_time, progress=progress)
+    run = {"environment": environment_info(), "settings": {"repeat": args.repeat, "min_time": args.min_time, **DEFAULT_INPUTS,
+                                                            "building_sizes": BUILDING_SIZES}, "results": results}
+    with open(args.output, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"Wrote {len(results)} timings to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows, regressions = compare_results(baseline, run, args.threshold)
+        for combination, size, stage, old, new, ratio in rows:
+            flag = "  SLOWER" if ratio > 1 + args.threshold else ""
+            print(f"{combination:<40} {size:<8} {stage:<26} {format_seconds(old):>10} -> {format_seconds(new):>10} x{ratio:.2f}{flag}")
+        print(f"{len(regressions)} of {len(rows)} cases slower than the baseline by more than {args.threshold:.0%}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
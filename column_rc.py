@@ -1,8 +1,11 @@
 import math
+import numpy as np
 
-def calculate_column_size(s1, s2, live_load,selected_column, f2f):
+def calculate_column_size(s1, s2, live_load,selected_column, f2f, dead_load=27, storeys=5):
     """
-    Calculate the required column size for a 5-storey building with realistic outputs.
+    Calculate the required column size for a building of the given number of storeys (default 5) with realistic outputs.
+
+    dead_load is the dead load per storey in kN/m² (default = 27).
     """
     # Material properties and constants
     alpha = 0.85  # Reduction factor for slenderness
@@ -23,10 +26,10 @@ def calculate_column_size(s1, s2, live_load,selected_column, f2f):
     effective_length = storey_height  # Simplified effective length
 
     # Dead and live load calculations
-    dead_load = 27 * s1 * s2 * 5  # Dead load for all 5 storeys (25 kN/m²)
-    live_load_total = live_load * s1 * s2 * 5  # Live load for all 5 storeys
+    dead_load_total = dead_load * s1 * s2 * storeys  # Dead load for all storeys
+    live_load_total = live_load * s1 * s2 * storeys  # Live load for all storeys
     column_self_weight = 0.03 * 25 * effective_length  # Self-weight of column
-    total_load = dead_load + live_load_total + column_self_weight  # Total load in kN
+    total_load = dead_load_total + live_load_total + column_self_weight  # Total load in kN
 
     # Required cross-sectional area (mm²)
     required_area = total_load * 1000 / axial_resistance  # Convert kN to N for consistency
@@ -42,10 +45,60 @@ def calculate_column_size(s1, s2, live_load,selected_column, f2f):
     
     if selected_column == "CIS Column":
         # Column weight
-        column_weight_tonnes = (column_size_mm/1000) ** 2 * (storey_height) * 2.5 * 0
+        column_weight_tonnes = column_size_mm ** 2 * (storey_height) * 2.5 * 0
         
     if selected_column == "PC Column":
-        # Column weight
-        column_weight_tonnes = (column_size_mm/1000) ** 2 * (storey_height) * 2.5
+        # Column weight (column_size_mm is in meters after rounding)
+        column_weight_tonnes = column_size_mm ** 2 * (storey_height) * 2.5
+
+    return column_size_mm, column_weight_tonnes
+
+
+def calculate_column_size_batch(s1, s2, live_load, selected_column, f2f, dead_load=27, storeys=5):
+    """
+    Vectorised version of calculate_column_size.
+
+    s1, s2, live_load, f2f and dead_load may be NumPy arrays (or scalars) and are
+    broadcast against each other; selected_column and storeys apply to the whole batch.
+    Element by element the results are identical to calculate_column_size.
+
+    Returns:
+    - column_size_mm (ndarray): Column size (m, rounded up to 50 mm).
+    - column_weight_tonnes (ndarray): Precast column weight (0 for CIS columns).
+    """
+    s1, s2, live_load, f2f, dead_load = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (s1, s2, live_load, f2f, dead_load)))
+
+    # Material properties and constants (see calculate_column_size)
+    alpha = 0.85
+    gamma_c = 1.5
+    gamma_s = 1.15
+    f_cd = 30 / gamma_c
+    f_yd = 500 / gamma_s
+    reinforcement_ratio = 0.02
+    storey_height = f2f
+
+    f_cc = alpha * f_cd
+    concrete_contribution = (1 - reinforcement_ratio) * f_cc
+    steel_contribution = reinforcement_ratio * f_yd
+    axial_resistance = concrete_contribution + steel_contribution
+
+    effective_length = storey_height
+
+    dead_load_total = dead_load * s1 * s2 * storeys
+    live_load_total = live_load * s1 * s2 * storeys
+    column_self_weight = 0.03 * 25 * effective_length
+    total_load = dead_load_total + live_load_total + column_self_weight
+
+    required_area = total_load * 1000 / axial_resistance
+    column_size_mm = np.sqrt(required_area)
+    column_size_mm = np.maximum(column_size_mm, 500)
+    column_size_mm = (np.ceil(column_size_mm / 50) * 50) / 1000
+
+    if selected_column == "CIS Column":
+        column_weight_tonnes = column_size_mm ** 2 * (storey_height) * 2.5 * 0
+    elif selected_column == "PC Column":
+        column_weight_tonnes = column_size_mm ** 2 * (storey_height) * 2.5
+    else:
+        raise ValueError(f"Unsupported column type: {selected_column}")
 
     return column_size_mm, column_weight_tonnes
@@ -0,0 +1,258 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely import STRtree
+
+from geometry import BEAM_S1, BEAM_S2, BEAM_S3, CRANE_REACH_RADII, ELEMENT_TYPES, crane_centres, layout_elements
+from metrics import stage_timer
+
+# Tower crane reach coverage: which columns, beams, hollow core panels and drop
+# panels each crane can lift at each reach radius. Elements are indexed once in
+# an STRtree (rectangles for columns and panels, centre-line segments for
+# beams) and a single bulk "dwithin" query of all crane centres at the largest
+# radius finds the candidate pairs; every radius is then an array filter.
+
+# When an element counts as liftable by a crane:
+# - "centre": the hook reaches its centre (the lifting point)
+# - "whole": every point of it is within reach
+# - "any": some point of it is within reach
+COVERAGE_CRITERIA = ("centre", "whole", "any")
+
+
+def _beam_axes(types):
+    # Beams spanning x (S1) and spanning y (S2, S3), drawn as segments
+    along_x = types == BEAM_S1
+    along_y = (types == BEAM_S2) | (types == BEAM_S3)
+    return along_x, along_y
+
+
+def _half_extents(elements):
+    # Half sizes of the indexed shapes: beams have no width
+    along_x, along_y = _beam_axes(elements["type"])
+    half_w = np.where(along_y, 0.0, elements["w"] / 2)
+    half_h = np.where(along_x, 0.0, elements["h"] / 2)
+    return half_w, half_h
+
+
+def element_geometries(elements):
+    """
+    Shapely geometries of an element array: rectangles for columns, hollow
+    core panels and drop panels, centre-line segments for beams.
+
+    Parameters:
+    - elements (ndarray): Element array (geometry.ELEMENT_DTYPE).
+
+    Returns:
+    - geometries (ndarray): One shapely geometry per element.
+    """
+    x, y = elements["x"], elements["y"]
+    half_w, half_h = _half_extents(elements)
+    along_x, along_y = _beam_axes(elements["type"])
+    beams = along_x | along_y
+
+    geometries = np.empty(len(elements), dtype=object)
+    geometries[~beams] = shapely.box(x[~beams] - half_w[~beams], y[~beams] - half_h[~beams],
+                                     x[~beams] + half_w[~beams], y[~beams] + half_h[~beams])
+    if beams.any():
+        segments = np.empty((int(beams.sum()), 2, 2))
+        segments[:, 0, 0] = x[beams] - half_w[beams]
+        segments[:, 0, 1] = y[beams] - half_h[beams]
+        segments[:, 1, 0] = x[beams] + half_w[beams]
+        segments[:, 1, 1] = y[beams] + half_h[beams]
+        geometries[beams] = shapely.linestrings(segments)
+    return geometries
+
+
+class CraneCoverage:
+    """
+    Reach coverage of a set of tower cranes over the elements of a layout.
+
+    Attributes:
+    - elements (ndarray): Element array (geometry.ELEMENT_DTYPE).
+    - centres (ndarray): Crane centres, shape (n_cranes, 2).
+    - criterion (str): One of COVERAGE_CRITERIA.
+    - pairs (dict): Radius -> (crane index, element index) arrays of every
+      crane/element pair within reach.
+    - assigned (dict): Radius -> index of the nearest crane that can lift each
+      element, -1 when none can.
+    """
+
+    def __init__(self, elements, centres, criterion, pairs, assigned):
+        self.elements = elements
+        self.centres = centres
+        self.criterion = criterion
+        self.pairs = pairs
+        self.assigned = assigned
+
+    @property
+    def radii(self):
+        return tuple(self.pairs)
+
+    def uncovered(self, radius):
+        """
+        Indices of the elements no crane can lift at a reach radius.
+        """
+        return np.flatnonzero(self.assigned[radius] < 0)
+
+    def summary(self):
+        """
+        Covered and uncovered elements at every reach radius.
+
+        Returns:
+        - table (DataFrame): One row per radius with the element count, the
+          covered count and share and the uncovered count of each element type
+          in the layout.
+        """
+        types = self.elements["type"]
+        present = np.unique(types)
+        rows = {}
+        for radius, assigned in self.assigned.items():
+            uncovered = assigned < 0
+            row = {"elements": len(types), "covered": int((~uncovered).sum()), "uncovered": int(uncovered.sum()),
+                   "coverage": (~uncovered).mean() if len(types) else 1.0}
+            by_type = np.bincount(types[uncovered], minlength=len(ELEMENT_TYPES))
+            for element_type in present:
+                row[f"uncovered_{ELEMENT_TYPES[element_type]}"] = int(by_type[element_type])
+            rows[radius] = row
+        table = pd.DataFrame.from_dict(rows, orient="index")
+        table.index.name = "radius"
+        return table
+
+    def crane_lifts(self, radius):
+        """
+        Lift counts of every crane at a reach radius.
+
+        Returns:
+        - table (DataFrame): One row per crane with its centre, the number of
+          elements within its reach ("reachable"), the number it lifts when
+          every element goes to the nearest crane able to lift it ("lifts")
+          and that number per element type.
+        """
+        crane_index, _ = self.pairs[radius]
+        assigned = self.assigned[radius]
+        n_cranes = len(self.centres)
+        table = pd.DataFrame({
+            "x": self.centres[:, 0],
+            "y": self.centres[:, 1],
+            "reachable": np.bincount(crane_index, minlength=n_cranes),
+            "lifts": np.bincount(assigned[assigned >= 0], minlength=n_cranes),
+        })
+        types = self.elements["type"]
+        for element_type in np.unique(types):
+            mine = (types == element_type) & (assigned >= 0)
+            table[f"lifts_{ELEMENT_TYPES[element_type]}"] = np.bincount(assigned[mine], minlength=n_cranes)
+        table.index.name = "crane"
+        return table
+
+
+def crane_coverage(elements, centres, radii=CRANE_REACH_RADII, criterion="centre", tree=None):
+    """
+    Which elements each crane can lift at each reach radius.
+
+    Parameters:
+    - elements (ndarray): Element array (geometry.ELEMENT_DTYPE).
+    - centres (array-like): Crane centres, shape (n_cranes, 2).
+    - radii (sequence): Reach radii (m).
+    - criterion (str): One of COVERAGE_CRITERIA.
+    - tree (STRtree): Index of element_geometries(elements), to reuse it
+      across calls (built when None).
+
+    Returns:
+    - coverage (CraneCoverage)
+    """
+    if criterion not in COVERAGE_CRITERIA:
+        raise ValueError(f"Unknown coverage criterion: {criterion}")
+    centres = np.asarray(centres, dtype=float).reshape(-1, 2)
+
+    with stage_timer("crane_coverage"):
+        if tree is None:
+            tree = STRtree(element_geometries(elements))
+        crane_points = shapely.points(centres)
+        x, y = elements["x"], elements["y"]
+        half_w, half_h = _half_extents(elements)
+
+        # One query at the largest radius: the pairs within any smaller radius
+        # are a subset, found by filtering on the exact reach distance
+        crane_index, element_index = tree.query(crane_points, predicate="dwithin", distance=max(radii, default=0))
+        dx = np.abs(centres[crane_index, 0] - x[element_index])
+        dy = np.abs(centres[crane_index, 1] - y[element_index])
+        centre_distance = np.hypot(dx, dy)
+        if criterion == "centre":
+            reach_distance = centre_distance
+        elif criterion == "whole":
+            reach_distance = np.hypot(dx + half_w[element_index], dy + half_h[element_index])
+        else:
+            reach_distance = np.hypot(np.maximum(dx - half_w[element_index], 0), np.maximum(dy - half_h[element_index], 0))
+
+        # Pairs by element, nearest crane first
+        order = np.lexsort((centre_distance, element_index))
+        crane_index, element_index, reach_distance = crane_index[order], element_index[order], reach_distance[order]
+
+        pairs, assigned = {}, {}
+        for radius in radii:
+            keep = reach_distance <= radius
+            cranes, indices = crane_index[keep], element_index[keep]
+            first = np.ones(len(indices), dtype=bool)
+            first[1:] = indices[1:] != indices[:-1]
+            nearest = np.full(len(elements), -1, dtype=np.intp)
+            nearest[indices[first]] = cranes[first]
+            pairs[radius] = (cranes, indices)
+            assigned[radius] = nearest
+
+    return CraneCoverage(elements, centres, criterion, pairs, assigned)
+
+
+def result_elements(result):
+    """
+    Element array of a run_pipeline result, with the member sizes.
+    """
+    return layout_elements(
+        result["length"], result["width"], result["s1"], result["s2"], result["column_size_mm"],
+        result["selected_beam"], result["selected_slab"],
+        result["b_s1_mm"], result["d_s1_mm"], result["b_s2_mm"], result["d_s2_mm"], result["b_s3_mm"], result["d_s3_mm"],
+        result["slab_thickness_mm"], result["hcs_slab_thickness_mm"], result["f2f"])
+
+
+def layout_coverage(result, radii=CRANE_REACH_RADII, criterion="centre", centres=None):
+    """
+    Crane reach coverage of a run_pipeline result.
+
+    Parameters:
+    - result (dict): See pipeline.run_pipeline.
+    - radii (sequence): Reach radii (m).
+    - criterion (str): One of COVERAGE_CRITERIA.
+    - centres (array-like): Crane centres (default: the cranes of the plot).
+
+    Returns:
+    - coverage (CraneCoverage)
+    """
+    if centres is None:
+        centres = crane_centres(result["length"], result["width"], result["s1"], result["s2"])
+    return crane_coverage(result_elements(result), centres, radii, criterion)
+
+
+def main(argv=None):
+    from pipeline import add_scenario_arguments, scenario_result
+
+    parser = argparse.ArgumentParser(description="Tower crane reach coverage of one DfMA scenario.")
+    add_scenario_arguments(parser)
+    parser.add_argument("--radii", type=float, nargs="+", default=list(CRANE_REACH_RADII), help="Reach radii (m)")
+    parser.add_argument("--criterion", choices=COVERAGE_CRITERIA, default="centre",
+                        help="centre: the hook reaches the element centre; whole: all of it; any: part of it")
+    args = parser.parse_args(argv)
+
+    result = scenario_result(args)
+    coverage = layout_coverage(result, args.radii, args.criterion)
+    print(coverage.summary().round(3).to_string())
+    for radius in coverage.radii:
+        print()
+        print(f"Reach {radius:g} m")
+        print(coverage.crane_lifts(radius).round(2).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
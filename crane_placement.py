@@ -0,0 +1,329 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely import STRtree
+
+from crane_coverage import result_elements
+from geometry import COLUMN, CRANE_REACH_RADII, ELEMENT_TYPES, HCS_PANEL
+from metrics import stage_timer
+from slab_rc import get_hcs_catalog
+
+# Tower crane placement: the fewest cranes, chosen from a grid of candidate
+# positions, that can lift every precast column and hollow core panel, with
+# lifts shared as evenly as possible between them. A crane lifts an element
+# when its hook reaches the element centre and the load moment allows the
+# element weight at that radius.
+
+# Default tower crane: load moment (t·m), heaviest lift (t) and jib radius (m)
+TOWER_CRANE_LOAD_MOMENT = 300.0
+TOWER_CRANE_MAX_LOAD = 16.0
+TOWER_CRANE_JIB = float(max(CRANE_REACH_RADII))
+
+# Most candidate positions scored; the candidate spacing grows beyond it, but
+# never so far that some element is out of reach of every candidate
+MAX_CANDIDATES = 2500
+
+
+def lift_elements(result):
+    """
+    Precast elements of a run_pipeline result that the tower cranes lift, with
+    their weights: PC columns and hollow core panels.
+
+    Returns:
+    - elements (ndarray): Element array (geometry.ELEMENT_DTYPE).
+    - weights (ndarray): Weight of each element (tonnes).
+    """
+    elements = result_elements(result)
+    types = elements["type"]
+    precast = types == HCS_PANEL
+    if result["column_weight_tonnes"] > 0:
+        precast |= types == COLUMN
+    elements = elements[precast]
+
+    weights = np.zeros(len(elements))
+    columns = elements["type"] == COLUMN
+    weights[columns] = result["column_weight_tonnes"]
+    panels = ~columns
+    if panels.any():
+        weight_kgm2 = get_hcs_catalog().weight_kgm2(result["hcs_slab_thickness_mm"])
+        if weight_kgm2 is None:
+            raise ValueError(f"No hollow core weight for a thickness of {result['hcs_slab_thickness_mm']} mm")
+        weights[panels] = elements["w"][panels] * elements["h"][panels] * weight_kgm2 / 1000
+    return elements, weights
+
+
+def lift_reach(weights, load_moment=TOWER_CRANE_LOAD_MOMENT, max_load=TOWER_CRANE_MAX_LOAD, jib=TOWER_CRANE_JIB):
+    """
+    Longest radius (m) at which a crane can lift each weight: the jib, or less
+    where the load moment limits it; NaN above the heaviest lift.
+    """
+    weights = np.asarray(weights, dtype=float)
+    with np.errstate(divide="ignore"):
+        reach = np.minimum(jib, load_moment / weights)
+    return np.where(weights <= max_load, reach, np.nan)
+
+
+def coverage_spacing(weights, load_moment=TOWER_CRANE_LOAD_MOMENT, max_load=TOWER_CRANE_MAX_LOAD, jib=TOWER_CRANE_JIB):
+    """
+    Widest candidate spacing (m) at which every liftable weight has a
+    candidate within its lift_reach: every point of a square grid cell is
+    within half its diagonal of the cell centre. A margin of 0.1 % keeps the
+    cell corners inside the reach despite rounding.
+    """
+    reach = lift_reach(weights, load_moment, max_load, jib)
+    reach = reach[np.isfinite(reach)]
+    return 0.999 * np.sqrt(2) * (reach.min() if len(reach) else jib)
+
+
+def candidate_positions(length, width, s1, s2, spacing=None, max_candidates=MAX_CANDIDATES, max_spacing=None):
+    """
+    Grid of candidate crane positions over the plot (grid margin included).
+
+    The plot is split into cells of at most the spacing, with a candidate at
+    the centre of each. The default spacing is half the smaller span; it
+    grows until at most max_candidates remain, but not beyond max_spacing
+    (see coverage_spacing), so large plots may get more candidates.
+    """
+    total_length = length + 2*s1
+    total_width = width + 2*s2
+    if spacing is None:
+        spacing = min(s1, s2) / 2
+    spacing = max(spacing, np.sqrt(total_length * total_width / max_candidates))
+    if max_spacing is not None:
+        spacing = min(spacing, max_spacing)
+    nx = max(int(np.ceil(total_length / spacing)), 1)
+    ny = max(int(np.ceil(total_width / spacing)), 1)
+    x = (np.arange(nx) + 0.5) * (total_length / nx)
+    y = (np.arange(ny) + 0.5) * (total_width / ny)
+    x, y = np.meshgrid(x, y, indexing='ij')
+    return np.column_stack([x.ravel(), y.ravel()])
+
+
+def _ranges(starts, stops):
+    # Concatenation of arange(start, stop) for every pair
+    lengths = stops - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(lengths.sum())
+
+
+def _group_first(groups):
+    # Whether each entry of a sorted group array starts its group
+    first = np.ones(len(groups), dtype=bool)
+    first[1:] = groups[1:] != groups[:-1]
+    return first
+
+
+class CranePlan:
+    """
+    Tower crane positions and the lifts of each crane.
+
+    Attributes:
+    - centres (ndarray): Crane centres, shape (n_cranes, 2).
+    - elements (ndarray): Lifted elements (geometry.ELEMENT_DTYPE).
+    - weights (ndarray): Weight of each element (tonnes).
+    - assigned (ndarray): Crane lifting each element, -1 when none can.
+    - candidates (int): Candidate positions considered.
+    """
+
+    def __init__(self, centres, elements, weights, assigned, candidates):
+        self.centres = centres
+        self.elements = elements
+        self.weights = weights
+        self.assigned = assigned
+        self.candidates = candidates
+
+    def __len__(self):
+        return len(self.centres)
+
+    def unlifted(self):
+        """
+        Indices of the elements no candidate position can lift (too heavy or out of reach).
+        """
+        return np.flatnonzero(self.assigned < 0)
+
+    def crane_lifts(self):
+        """
+        Lifts of every crane.
+
+        Returns:
+        - table (DataFrame): One row per crane with its centre, lift count
+          overall and per element type, heaviest lift (t), longest radius (m)
+          and largest load moment (t·m) used.
+        """
+        n_cranes = len(self.centres)
+        lifted = self.assigned >= 0
+        cranes = self.assigned[lifted]
+        weights = self.weights[lifted]
+        radius = np.hypot(self.centres[cranes, 0] - self.elements["x"][lifted], self.centres[cranes, 1] - self.elements["y"][lifted])
+        table = pd.DataFrame({
+            "x": self.centres[:, 0],
+            "y": self.centres[:, 1],
+            "lifts": np.bincount(cranes, minlength=n_cranes),
+        })
+        types = self.elements["type"][lifted]
+        for element_type in np.unique(types):
+            table[f"lifts_{ELEMENT_TYPES[element_type]}"] = np.bincount(cranes[types == element_type], minlength=n_cranes)
+        for name, values in (("heaviest_lift", weights), ("max_radius", radius), ("max_load_moment", weights * radius)):
+            column = np.zeros(n_cranes)
+            np.maximum.at(column, cranes, values)
+            table[name] = column
+        table.index.name = "crane"
+        return table
+
+
+def optimize_cranes(elements, weights, candidates, load_moment=TOWER_CRANE_LOAD_MOMENT, max_load=TOWER_CRANE_MAX_LOAD,
+                    jib=TOWER_CRANE_JIB, balance_rounds=50):
+    """
+    Choose crane positions among candidates to lift every element with as few
+    cranes as possible, then share the lifts between them.
+
+    Cranes are chosen greedily (set cover): each time the candidate lifting
+    the most elements not lifted yet, ties going to the candidate reaching
+    more elements overall, and cranes made redundant by later choices are
+    dropped. Lifts are then balanced by pricing: every element goes to the
+    crane that can lift it with the lowest price plus distance (in jibs),
+    and the price of each crane follows its lifts above or below the
+    average, keeping the assignment with the fewest lifts on the busiest
+    crane.
+
+    Parameters:
+    - elements (ndarray): Element array (geometry.ELEMENT_DTYPE).
+    - weights (ndarray): Weight of each element (tonnes).
+    - candidates (ndarray): Candidate crane positions, shape (n, 2).
+    - load_moment (float): Crane load moment (t·m).
+    - max_load (float): Heaviest lift of the crane (t).
+    - jib (float): Jib radius (m).
+    - balance_rounds (int): Pricing rounds of the balancing (0 lifts each
+      element with the nearest crane that can).
+
+    Returns:
+    - plan (CranePlan)
+    """
+    candidates = np.asarray(candidates, dtype=float).reshape(-1, 2)
+    with stage_timer("crane_placement"):
+        # Candidate/element pairs within the jib (element centres in an
+        # STRtree), then within the weight-limited reach
+        tree = STRtree(shapely.points(elements["x"], elements["y"]))
+        crane_index, element_index = tree.query(shapely.points(candidates), predicate="dwithin", distance=jib)
+        distance = np.hypot(candidates[crane_index, 0] - elements["x"][element_index],
+                            candidates[crane_index, 1] - elements["y"][element_index])
+        keep = distance <= lift_reach(weights, load_moment, max_load, jib)[element_index]
+        crane_index, element_index, distance = crane_index[keep], element_index[keep], distance[keep]
+
+        # Pairs by candidate and by element (CSR offsets into each order)
+        n_candidates, n_elements = len(candidates), len(elements)
+        by_crane = np.argsort(crane_index, kind="stable")
+        crane_offsets = np.searchsorted(crane_index[by_crane], np.arange(n_candidates + 1))
+        by_element = np.argsort(element_index, kind="stable")
+        element_offsets = np.searchsorted(element_index[by_element], np.arange(n_elements + 1))
+
+        # Greedy set cover, scores updated only for the candidates sharing newly lifted elements
+        reachable = np.bincount(crane_index, minlength=n_candidates)
+        score = reachable.astype(np.int64)
+        tie_break = reachable.max(initial=0) + 1
+        lifted = np.zeros(n_elements, dtype=bool)
+        lifted[np.bincount(element_index, minlength=n_elements) == 0] = True
+        chosen = []
+        while not lifted.all():
+            best = int(np.argmax(score * tie_break + reachable))
+            chosen.append(best)
+            covered = element_index[by_crane[crane_offsets[best]:crane_offsets[best + 1]]]
+            covered = covered[~lifted[covered]]
+            lifted[covered] = True
+            pairs = by_element[_ranges(element_offsets[covered], element_offsets[covered + 1])]
+            np.subtract.at(score, crane_index[pairs], 1)
+
+        # Drop cranes whose elements all have another chosen crane, latest choices first
+        chosen = np.array(chosen, dtype=np.intp)
+        is_chosen = np.zeros(n_candidates, dtype=bool)
+        is_chosen[chosen] = True
+        multiplicity = np.bincount(element_index[is_chosen[crane_index]], minlength=n_elements)
+        for crane in chosen[::-1]:
+            covered = element_index[by_crane[crane_offsets[crane]:crane_offsets[crane + 1]]]
+            if (multiplicity[covered] > 1).all():
+                is_chosen[crane] = False
+                multiplicity[covered] -= 1
+        chosen = np.flatnonzero(is_chosen)
+
+        # Pairs with a chosen crane, by element; crane numbers in chosen order
+        crane_number = np.full(n_candidates, -1, dtype=np.intp)
+        crane_number[chosen] = np.arange(len(chosen))
+        pairs = by_element[is_chosen[crane_index[by_element]]]
+        pair_crane, pair_element, pair_distance = crane_number[crane_index[pairs]], element_index[pairs], distance[pairs]
+        first = _group_first(pair_element)
+        group_starts = np.flatnonzero(first)
+        group_lengths = np.diff(np.append(group_starts, len(pairs)))
+
+        def assign(price):
+            # Crane with the lowest price plus distance for every element
+            key = price[pair_crane] + pair_distance / jib
+            cheapest = np.repeat(np.minimum.reduceat(key, group_starts), group_lengths) if len(pairs) else key
+            best = np.flatnonzero(key == cheapest)
+            best = best[_group_first(pair_element[best])]
+            assigned = np.full(n_elements, -1, dtype=np.intp)
+            assigned[pair_element[best]] = pair_crane[best]
+            return assigned
+
+        n_cranes = len(chosen)
+        price = np.zeros(n_cranes)
+        assigned = best_assigned = assign(price)
+        best_peak = np.bincount(assigned[assigned >= 0], minlength=n_cranes).max(initial=0)
+        target = max(np.count_nonzero(assigned >= 0) / max(n_cranes, 1), 1)
+        for _ in range(balance_rounds):
+            lifts = np.bincount(assigned[assigned >= 0], minlength=n_cranes)
+            price += 0.1 * (lifts - target) / target
+            assigned = assign(price)
+            peak = np.bincount(assigned[assigned >= 0], minlength=n_cranes).max(initial=0)
+            if peak < best_peak:
+                best_assigned, best_peak = assigned, peak
+
+    return CranePlan(candidates[chosen], elements, weights, best_assigned, n_candidates)
+
+
+def plan_cranes(result, load_moment=TOWER_CRANE_LOAD_MOMENT, max_load=TOWER_CRANE_MAX_LOAD, jib=TOWER_CRANE_JIB,
+                spacing=None, max_candidates=MAX_CANDIDATES, balance_rounds=50):
+    """
+    Tower crane plan for a run_pipeline result. See optimize_cranes.
+
+    Parameters:
+    - result (dict): See pipeline.run_pipeline.
+    - spacing (float): Candidate spacing (m), default half the smaller span.
+    - max_candidates (int): Most candidate positions; the spacing grows beyond
+      it up to coverage_spacing, so every liftable element stays in reach.
+    - Other parameters as optimize_cranes.
+
+    Returns:
+    - plan (CranePlan)
+    """
+    elements, weights = lift_elements(result)
+    candidates = candidate_positions(result["length"], result["width"], result["s1"], result["s2"], spacing, max_candidates,
+                                     coverage_spacing(weights, load_moment, max_load, jib))
+    return optimize_cranes(elements, weights, candidates, load_moment, max_load, jib, balance_rounds)
+
+
+def main(argv=None):
+    from pipeline import add_scenario_arguments, scenario_result
+
+    parser = argparse.ArgumentParser(description="Fewest tower cranes lifting every precast column and hollow core panel of one DfMA scenario.")
+    add_scenario_arguments(parser, column="PC Column", slab="1.2HC Slab")
+    parser.add_argument("--load-moment", type=float, default=TOWER_CRANE_LOAD_MOMENT, help="Crane load moment (t·m)")
+    parser.add_argument("--max-load", type=float, default=TOWER_CRANE_MAX_LOAD, help="Heaviest lift (t)")
+    parser.add_argument("--jib", type=float, default=TOWER_CRANE_JIB, help="Jib radius (m)")
+    parser.add_argument("--spacing", type=float, help="Candidate spacing (m, default half the smaller span)")
+    parser.add_argument("--max-candidates", type=int, default=MAX_CANDIDATES,
+                        help="Most candidate positions, unless more are needed to keep every element in reach")
+    args = parser.parse_args(argv)
+
+    result = scenario_result(args)
+    plan = plan_cranes(result, args.load_moment, args.max_load, args.jib, args.spacing, args.max_candidates)
+    print(f"{len(plan)} tower crane(s) from {plan.candidates} candidate positions "
+          f"(rule of thumb: {result['outputs'].no_tower_cranes:g}); {len(plan.elements) - len(plan.unlifted())} of {len(plan.elements)} precast elements lifted")
+    print(plan.crane_lifts().round(2).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
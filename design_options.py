@@ -0,0 +1,45 @@
+# Define the options for columns, beams, and slabs
+column_options = [
+    "CIS Column",
+    "PC Column",
+    "Steel Column (Not Available)",
+    "CES Column (Not Available)",
+    "SEC Column (Not Available)",
+]
+
+beam_options = [
+    "CIS Beam",
+    "PT Beam",
+    "PT Flat Slab",
+    "CES Beam (Not Available)",
+    "I Beam (Not Available)",
+    "Castellated I Beam (Not Available)",
+]
+
+slab_options = [
+    "CIS Slab",
+    "1.2HC Slab",
+    "2.4HC Slab",
+    "PT Flat Slab",
+    "Bubble Deck Slab (Not Available)",
+    "DoubleTee Slab (Not Available)",
+    "Bondek (Not Available)",
+]
+
+# Available column/beam/slab combinations
+available_combinations = [
+    {"beam": "CIS Beam", "slab": "CIS Slab", "column": "CIS Column"},
+    {"beam": "CIS Beam", "slab": "CIS Slab", "column": "PC Column"},
+    {"beam": "CIS Beam", "slab": "1.2HC Slab", "column": "CIS Column"},
+    {"beam": "CIS Beam", "slab": "1.2HC Slab", "column": "PC Column"},
+    {"beam": "CIS Beam", "slab": "2.4HC Slab", "column": "CIS Column"},
+    {"beam": "CIS Beam", "slab": "2.4HC Slab", "column": "PC Column"},
+    {"beam": "PT Beam", "slab": "CIS Slab", "column": "CIS Column"},
+    {"beam": "PT Beam", "slab": "CIS Slab", "column": "PC Column"},
+    {"beam": "PT Beam", "slab": "1.2HC Slab", "column": "CIS Column"},
+    {"beam": "PT Beam", "slab": "1.2HC Slab", "column": "PC Column"},
+    {"beam": "PT Beam", "slab": "2.4HC Slab", "column": "CIS Column"},
+    {"beam": "PT Beam", "slab": "2.4HC Slab", "column": "PC Column"},
+    {"beam": "PT Flat Slab", "slab": "PT Flat Slab", "column": "CIS Column"},
+    {"beam": "PT Flat Slab", "slab": "PT Flat Slab", "column": "PC Column"},
+]
@@ -0,0 +1,168 @@
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from output_data import LAYOUT_OUTPUT_FIELDS
+from pipeline import grid_footprint, run_pipeline
+
+# Columns expected in a scenario file (length/width are the building dimensions before snapping to whole bays)
+SCENARIO_COLUMNS = ["column", "beam", "slab", "s1", "s2", "live_load", "length", "width", "f2f"]
+
+SIZING_COLUMNS = [
+    "column_size_mm",
+    "column_weight_tonnes",
+    "b_s1_mm",
+    "d_s1_mm",
+    "b_s2_mm",
+    "d_s2_mm",
+    "b_s3_mm",
+    "d_s3_mm",
+    "slab_thickness_mm",
+    "slab_max_spacing_pt_mm",
+    "hcs_slab_thickness_mm",
+]
+
+OUTPUT_COLUMNS = list(LAYOUT_OUTPUT_FIELDS) + ["floor_cycle_days", "unique_headcount"]
+
+RESULT_COLUMNS = SCENARIO_COLUMNS + ["building_length", "building_width", "effective_slab"] + SIZING_COLUMNS + OUTPUT_COLUMNS + ["error"]
+
+NUMERIC_RESULT_COLUMNS = [c for c in RESULT_COLUMNS if c not in ("column", "beam", "slab", "effective_slab", "error")]
+
+
+def evaluate_scenario(column, beam, slab, s1, s2, live_load, length, width, f2f):
+    """
+    Run the full pipeline for one scenario row and flatten it into a result record.
+
+    Scenarios that cannot be evaluated (e.g. no suitable hollow core slab) are
+    returned with NaN outputs and the exception message in "error".
+    """
+    record = dict(zip(SCENARIO_COLUMNS, (column, beam, slab, s1, s2, live_load, length, width, f2f)))
+    try:
+        building_length, building_width = grid_footprint(length, width, s1, s2)
+        result = run_pipeline(column, beam, slab, s1, s2, live_load, building_length, building_width, f2f)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    record["building_length"] = building_length
+    record["building_width"] = building_width
+    record["effective_slab"] = result["selected_slab"]
+    for name in SIZING_COLUMNS:
+        record[name] = result[name]
+    outputs = result["outputs"]
+    record.update(outputs.to_dict())
+    record["floor_cycle_days"] = outputs.floor_cycle_days
+    record["unique_headcount"] = outputs.unique_headcount
+    record["error"] = ""
+    return record
+
+
+def evaluate_scenarios(scenarios):
+    """
+    Evaluate a DataFrame of scenarios and return the results with a fixed column
+    order and dtypes, so that consecutive chunks can be appended to one file.
+    """
+    missing = [c for c in SCENARIO_COLUMNS if c not in scenarios.columns]
+    if missing:
+        raise ValueError(f"Scenario file is missing columns: {', '.join(missing)}")
+
+    records = [evaluate_scenario(*row) for row in scenarios[SCENARIO_COLUMNS].itertuples(index=False, name=None)]
+    results = pd.DataFrame.from_records(records, columns=RESULT_COLUMNS)
+    results[NUMERIC_RESULT_COLUMNS] = results[NUMERIC_RESULT_COLUMNS].astype(np.float64)
+    for name in ("column", "beam", "slab", "effective_slab", "error"):
+        results[name] = results[name].fillna("").astype(str)
+    return results
+
+
+def read_scenarios(path, chunk_size):
+    """
+    Yield the scenario file (CSV or Parquet) as DataFrames of at most chunk_size rows.
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def write_results(chunks, path):
+    """
+    Stream result DataFrames to a CSV or Parquet file, one chunk at a time.
+
+    Returns the number of rows written.
+    """
+    rows = 0
+    if path.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        for chunk in chunks:
+            chunk.to_csv(path, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+            rows += len(chunk)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the DfMA model headlessly over a scenario file and stream the results to CSV or Parquet.")
+    parser.add_argument("scenarios", help="Scenario file (.csv or .parquet) with columns: " + ", ".join(SCENARIO_COLUMNS))
+    parser.add_argument("output", help="Result file (.csv or .parquet)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Scenarios evaluated and written per chunk (default: 10000)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes; chunks are evaluated in parallel when > 1 (default: 1)")
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress on stderr")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.scenarios) and os.path.exists(args.output) and os.path.samefile(args.scenarios, args.output):
+        parser.error("the output file must not be the scenario file")
+
+    def evaluated_chunks(results_stream):
+        done = 0
+        for results in results_stream:
+            done += len(results)
+            if not args.quiet:
+                print(f"{done} scenarios evaluated", file=sys.stderr)
+            yield results
+
+    # Results go to a temporary file next to the output, which replaces the
+    # output only once every chunk is written
+    fd, partial = tempfile.mkstemp(suffix=os.path.splitext(args.output)[1], prefix=".dfma_batch_",
+                                   dir=os.path.dirname(os.path.abspath(args.output)))
+    os.close(fd)
+    try:
+        chunks = read_scenarios(args.scenarios, args.chunk_size)
+        if args.workers > 1:
+            from parallel import create_executor, imap_ordered
+
+            with create_executor(args.workers) as executor:
+                rows = write_results(evaluated_chunks(imap_ordered(executor, evaluate_scenarios, chunks, 2 * args.workers)), partial)
+        else:
+            rows = write_results(evaluated_chunks(map(evaluate_scenarios, chunks)), partial)
+        os.replace(partial, args.output)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    if not args.quiet:
+        print(f"Wrote {rows} results to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
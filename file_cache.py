@@ -0,0 +1,42 @@
+import os
+import threading
+
+from metrics import stage_timer
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def load_cached(file_name, loader):
+    """
+    Return loader(path) for a data file, parsing it only once per process.
+
+    The parsed value is shared by every caller (and every Streamlit session) and
+    is rebuilt only when the file's modification time changes.
+
+    Parameters:
+    - file_name (str): Path of the data file (relative paths use the working directory).
+    - loader (callable): Function taking the absolute path and returning the parsed value.
+    """
+    path = os.path.abspath(file_name)
+    mtime = os.stat(path).st_mtime_ns
+    key = (path, loader)
+
+    with _lock:
+        entry = _cache.get(key)
+    if entry is not None and entry[0] == mtime:
+        return entry[1]
+
+    with stage_timer("catalog_load"):
+        value = loader(path)
+    with _lock:
+        _cache[key] = (mtime, value)
+    return value
+
+
+def clear_cache():
+    """
+    Drop every cached data file so the next access re-parses it.
+    """
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,560 @@
+import functools
+import math
+
+import numpy as np
+
+# Plan geometry of a layout as plain NumPy arrays, shared by the matplotlib
+# plot (plot_data.py) and the DXF/SVG exporters (plan_export.py).
+#
+# Coordinates are in meters with the grid margin included: the first grid line
+# is at (0, 0) and the first column at (s1, s2). Polygons are (n, vertices, 2)
+# arrays, line segments (n, 2, 2) arrays. Columns, beams, hollow core panels
+# and drop panels are structured ELEMENT_DTYPE arrays, which the quantities
+# count and the plot and exporters draw. Element families are built from 1D
+# arrays of grid positions, so callers can build them in slices of positions
+# and keep memory bounded on large sites.
+
+HCS_SLABS = ["1.2HC Slab", "2.4HC Slab", "1.2HCS_S3", "2.4HCS_S3"]
+S3_SLABS = ["1.2HCS_S3", "2.4HCS_S3"]
+HCS_PANEL_WIDTHS = {"1.2HC Slab": 1.2, "2.4HC Slab": 2.4, "1.2HCS_S3": 1.2, "2.4HCS_S3": 2.4}
+
+# Beam types laid out as beams between the columns (a PT flat slab has none)
+BEAM_TYPES = ["CIS Beam", "PT Beam"]
+
+# Structural element types of an element array
+COLUMN, BEAM_S1, BEAM_S2, BEAM_S3, HCS_PANEL, DROP_PANEL = range(6)
+ELEMENT_TYPES = ("column", "beam_s1", "beam_s2", "beam_s3", "hcs_panel", "drop_panel")
+
+# One record per structural element: its type, centre (x, y), plan size along
+# x (w) and y (h) and depth, in meters. Beams span centre to centre of the
+# columns and are as wide as the beam. Depth is the storey height for columns,
+# the beam depth for beams, the HCS thickness for panels and twice the slab
+# thickness for drop panels.
+ELEMENT_DTYPE = np.dtype([("type", "u1"), ("x", "f8"), ("y", "f8"), ("w", "f8"), ("h", "f8"), ("depth", "f8")])
+
+# Tower crane symbol: base squares (side in m) and reach circles (radius in m)
+CRANE_SQUARES = (2.3, 5)
+CRANE_REACH_RADII = (15, 20, 25, 30)
+
+
+def polygon_array(xs, ys):
+    """
+    Stack per-vertex coordinate arrays into an (n, vertices, 2) polygon array.
+
+    xs and ys list the vertices in drawing order, each entry being an array
+    with one coordinate per polygon (scalars broadcast).
+    """
+    coords = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in (*xs, *ys)])
+    return np.stack([np.stack(coords[:len(xs)], axis=-1), np.stack(coords[len(xs):], axis=-1)], axis=-1).reshape(-1, len(xs), 2)
+
+
+def grid_label(index):
+    """
+    Grid line letter: A..Z, then AA, AB, ... as in spreadsheet columns.
+    """
+    label = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(ord("A") + remainder) + label
+    return label
+
+
+def boundary_polyline(length, width, s1, s2):
+    """
+    Outline of the plotted area (grid margin included) as a closed (5, 2) polyline.
+    """
+    return np.array([[0, 0], [length + 2 * s1, 0], [length + 2 * s1, width + 2 * s2], [0, width + 2 * s2], [0, 0]], dtype=float)
+
+
+def grid_positions(length, width, s1, s2):
+    """
+    Grid line positions along x and y.
+    """
+    return np.arange(0, length + 2 * s1, s1), np.arange(0, width + 2 * s2, s2)
+
+
+def grid_segments(x, y, length, width, s1, s2):
+    """
+    Grid lines at positions x (vertical lines) and y (horizontal lines), each
+    spanning the whole plotted area.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    vertical = polygon_array([x, x], [0, width + 2 * s2])
+    horizontal = polygon_array([0, length + 2 * s1], [y, y])
+    return np.concatenate([vertical, horizontal])
+
+
+def bay_counts(length, width, s1, s2):
+    """
+    Number of bays along x and y of a footprint snapped to whole bays.
+    """
+    return int(round(length / s1)), int(round(width / s2))
+
+
+def element_counts(length, width, s1, s2, column_size_mm, selected_beam, selected_slab):
+    """
+    Closed-form number of elements of each type in a layout.
+
+    For footprints snapped to whole bays the counts equal
+    count_elements(layout_elements(...)), without building the elements. For
+    other footprints the column and beam counts are pro rata, as the quantities
+    have always used them.
+
+    Numeric arguments may be NumPy arrays and selected_slab an array of slab
+    types; the counts are then arrays.
+
+    Returns:
+    - counts (dict): Count per ELEMENT_TYPES name.
+    """
+    bays_x = length / s1
+    bays_y = width / s2
+    columns = (bays_x + 1) * (bays_y + 1)
+    zero = 0 * columns
+
+    if isinstance(selected_slab, str):
+        # One slab type: plain comparisons keep per-scenario calls cheap
+        s3 = selected_slab in S3_SLABS
+        hcs = selected_slab in HCS_SLABS
+        flat_slab = selected_slab == "PT Flat Slab"
+        panel_width = HCS_PANEL_WIDTHS.get(selected_slab, 1.2)
+        trunc, maximum = math.trunc, max
+
+        def select(mask, value):
+            return value if mask else zero
+    else:
+        selected_slab = np.asarray(selected_slab)
+        s3 = np.isin(selected_slab, S3_SLABS)
+        hcs = np.isin(selected_slab, HCS_SLABS)
+        flat_slab = selected_slab == "PT Flat Slab"
+        panel_width = np.where(np.isin(selected_slab, ["2.4HC Slab", "2.4HCS_S3"]), 2.4, 1.2)
+        trunc, maximum = np.trunc, np.maximum
+
+        def select(mask, value):
+            return np.where(mask, value, zero)
+
+    # S3 panels span half a bay, so each bay holds two panels along x
+    panels = trunc(trunc((1 + s3) * bays_x) * trunc(bays_y) * maximum(trunc((s2 - column_size_mm) / panel_width), 0))
+
+    beams = selected_beam in BEAM_TYPES
+    return {
+        "column": columns,
+        "beam_s1": bays_x * (bays_y + 1) if beams else zero,
+        "beam_s2": (bays_x + 1) * bays_y if beams else zero,
+        "beam_s3": select(s3, bays_x * bays_y) if beams else zero,
+        "hcs_panel": select(hcs, panels),
+        "drop_panel": select(flat_slab, columns),
+    }
+
+
+def count_elements(elements):
+    """
+    Number of elements of each type in an element array.
+
+    Returns:
+    - counts (dict): Count per ELEMENT_TYPES name.
+    """
+    counts = np.bincount(elements["type"], minlength=len(ELEMENT_TYPES))
+    return dict(zip(ELEMENT_TYPES, counts.tolist()))
+
+
+def column_positions(length, width, s1, s2):
+    """
+    Column centre positions along x and y.
+    """
+    bays_x, bays_y = bay_counts(length, width, s1, s2)
+    return s1 + np.arange(bays_x + 1) * s1, s2 + np.arange(bays_y + 1) * s2
+
+
+def bay_positions(length, width, s1, s2):
+    """
+    Lower-left column of every bay along x and y.
+    """
+    bays_x, bays_y = bay_counts(length, width, s1, s2)
+    return s1 + np.arange(bays_x) * s1, s2 + np.arange(bays_y) * s2
+
+
+def s1_beam_positions(length, width, s1, s2):
+    """
+    Start column of every beam spanning s1, along x and y.
+    """
+    return bay_positions(length, width, s1, s2)[0], column_positions(length, width, s1, s2)[1]
+
+
+def s2_beam_positions(length, width, s1, s2):
+    """
+    Start column of every beam spanning s2, along x and y.
+    """
+    return column_positions(length, width, s1, s2)[0], bay_positions(length, width, s1, s2)[1]
+
+
+def hcs_panel_layout(length, width, s1, s2, column_size_mm, selected_slab):
+    """
+    Hollow core panel arrangement of a layout.
+
+    Returns:
+    - x (ndarray): Panel centres along x.
+    - y (ndarray): Centre of the first panel of each stack along y.
+    - count (int): Panels stacked per bay.
+    - panel_width (float): Panel width (m).
+    - panel_length (float): Panel length (m).
+    Or None when the slab is not made of hollow core panels.
+    """
+    if selected_slab not in HCS_SLABS:
+        return None
+    bays_x, bays_y = bay_counts(length, width, s1, s2)
+    panel_width = HCS_PANEL_WIDTHS[selected_slab]
+    count = max(int((s2 - column_size_mm) / panel_width), 0)
+    y = (s2 + 2*column_size_mm) + np.arange(bays_y) * s2
+    if selected_slab in S3_SLABS:
+        # Panels span from the columns to the S3 beam at mid-span
+        return s1 + s1/4 + np.arange(2 * bays_x) * (s1/2), y, count, panel_width, s1/2
+    return s1 * 1.5 + np.arange(bays_x) * s1, y, count, panel_width, s1
+
+
+def _elements(element_type, x, y, w, h, depth):
+    # Element array from broadcastable centre, size and depth arrays
+    x, y, w, h, depth = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (x, y, w, h, depth)))
+    elements = np.empty(x.size, dtype=ELEMENT_DTYPE)
+    elements["type"] = element_type
+    elements["x"] = x.ravel()
+    elements["y"] = y.ravel()
+    elements["w"] = w.ravel()
+    elements["h"] = h.ravel()
+    elements["depth"] = depth.ravel()
+    return elements
+
+
+def column_elements(x, y, column_size_mm, f2f=0):
+    """
+    Columns at every (x, y) pair of column positions.
+    """
+    x, y = np.meshgrid(x, y, indexing='ij')
+    return _elements(COLUMN, x, y, column_size_mm, column_size_mm, f2f)
+
+
+def s1_beam_elements(x, y, s1, b_mm=0, d_mm=0):
+    """
+    Beams spanning s1 from the columns at every (x, y) pair.
+    """
+    x, y = np.meshgrid(x, y, indexing='ij')
+    return _elements(BEAM_S1, x + s1/2, y, s1, b_mm / 1000, d_mm / 1000)
+
+
+def s2_beam_elements(x, y, s2, b_mm=0, d_mm=0):
+    """
+    Beams spanning s2 from the columns at every (x, y) pair.
+    """
+    x, y = np.meshgrid(x, y, indexing='ij')
+    return _elements(BEAM_S2, x, y + s2/2, b_mm / 1000, s2, d_mm / 1000)
+
+
+def s3_beam_elements(x, y, s1, s2, b_mm=0, d_mm=0):
+    """
+    Secondary (S3) beams spanning s2 at mid-span of the bays at every (x, y) pair.
+    """
+    x, y = np.meshgrid(x, y, indexing='ij')
+    return _elements(BEAM_S3, x + s1/2, y + s2/2, b_mm / 1000, s2, d_mm / 1000)
+
+
+def hcs_panel_elements(x, y, count, panel_width, panel_length, thickness_mm=0):
+    """
+    Hollow core panels, count panels stacked at every (x, y) position
+    (see hcs_panel_layout).
+    """
+    x, y, i = np.meshgrid(x, y, np.arange(count), indexing='ij')
+    return _elements(HCS_PANEL, x, y + i * panel_width, panel_length, panel_width, thickness_mm / 1000)
+
+
+def drop_panel_elements(x, y, column_size_mm, length, width, s1, s2, slab_thickness_mm=0):
+    """
+    PT flat slab drop panels around the columns at (x, y), clipped to the slab edge.
+    """
+    # Slab boundaries based on the grid
+    x_min_boundary = s1 - column_size_mm/2
+    x_max_boundary = length + s1 + column_size_mm/2
+    y_min_boundary = s2 - column_size_mm/2
+    y_max_boundary = width + s2 + column_size_mm/2
+
+    x, y = np.meshgrid(x, y, indexing='ij')
+    x_min = np.maximum(x - column_size_mm, x_min_boundary)
+    x_max = np.minimum(x + column_size_mm, x_max_boundary)
+    y_min = np.maximum(y - column_size_mm, y_min_boundary)
+    y_max = np.minimum(y + column_size_mm, y_max_boundary)
+    return _elements(DROP_PANEL, (x_min + x_max) / 2, (y_min + y_max) / 2, x_max - x_min, y_max - y_min, 2 * slab_thickness_mm / 1000)
+
+
+def iter_layout_elements(length, width, s1, s2, column_size_mm, selected_beam, selected_slab,
+                         b_s1_mm=0, d_s1_mm=0, b_s2_mm=0, d_s2_mm=0, b_s3_mm=0, d_s3_mm=0,
+                         slab_thickness_mm=0, hcs_slab_thickness_mm=0, f2f=0, chunk_size=None):
+    """
+    Yield the element arrays of a layout family by family: columns, beams
+    spanning s1, s2 and S3, hollow core panels and drop panels.
+
+    With chunk_size each family is split along x into arrays of about
+    chunk_size elements at most, so any layout can be processed in bounded
+    memory. Sizes default to 0 when only the plan is needed.
+    """
+    def slices(x, per_x):
+        if chunk_size is None:
+            yield x
+            return
+        step = max(chunk_size // max(per_x, 1), 1)
+        for start in range(0, len(x), step):
+            yield x[start:start + step]
+
+    x, y = column_positions(length, width, s1, s2)
+    for chunk in slices(x, len(y)):
+        yield column_elements(chunk, y, column_size_mm, f2f)
+
+    if selected_beam in BEAM_TYPES:
+        x, y = s1_beam_positions(length, width, s1, s2)
+        for chunk in slices(x, len(y)):
+            yield s1_beam_elements(chunk, y, s1, b_s1_mm, d_s1_mm)
+        x, y = s2_beam_positions(length, width, s1, s2)
+        for chunk in slices(x, len(y)):
+            yield s2_beam_elements(chunk, y, s2, b_s2_mm, d_s2_mm)
+        if selected_slab in S3_SLABS:
+            x, y = bay_positions(length, width, s1, s2)
+            for chunk in slices(x, len(y)):
+                yield s3_beam_elements(chunk, y, s1, s2, b_s3_mm, d_s3_mm)
+
+    panels = hcs_panel_layout(length, width, s1, s2, column_size_mm, selected_slab)
+    if panels is not None:
+        x, y, count, panel_width, panel_length = panels
+        for chunk in slices(x, len(y) * count):
+            yield hcs_panel_elements(chunk, y, count, panel_width, panel_length, hcs_slab_thickness_mm)
+
+    if selected_slab == "PT Flat Slab":
+        x, y = column_positions(length, width, s1, s2)
+        for chunk in slices(x, len(y)):
+            yield drop_panel_elements(chunk, y, column_size_mm, length, width, s1, s2, slab_thickness_mm)
+
+
+def layout_elements(length, width, s1, s2, column_size_mm, selected_beam, selected_slab,
+                    b_s1_mm=0, d_s1_mm=0, b_s2_mm=0, d_s2_mm=0, b_s3_mm=0, d_s3_mm=0,
+                    slab_thickness_mm=0, hcs_slab_thickness_mm=0, f2f=0):
+    """
+    Every column, beam, hollow core panel and drop panel of a layout as one
+    ELEMENT_DTYPE array (see iter_layout_elements).
+    """
+    return np.concatenate(list(iter_layout_elements(
+        length, width, s1, s2, column_size_mm, selected_beam, selected_slab, b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm,
+        b_s3_mm, d_s3_mm, slab_thickness_mm, hcs_slab_thickness_mm, f2f)))
+
+
+def rectangle_polygons(elements, closed=True):
+    """
+    Plan outline of every element, counter-clockwise from the lower-left
+    corner; closed outlines repeat the first vertex.
+    """
+    x, y = elements["x"], elements["y"]
+    half_w, half_h = elements["w"] / 2, elements["h"] / 2
+    xs = [x - half_w, x + half_w, x + half_w, x - half_w]
+    ys = [y - half_h, y - half_h, y + half_h, y + half_h]
+    if closed:
+        xs.append(xs[0])
+        ys.append(ys[0])
+    return polygon_array(xs, ys)
+
+
+def beam_outline_polygons(elements, column_size_mm):
+    """
+    Closed outlines of beams as drawn on the plan: a band as wide as the
+    columns, between the column faces for beams spanning s1 and from the
+    column face over one span for beams spanning s2 and S3.
+    """
+    x, y, w, h = elements["x"], elements["y"], elements["w"], elements["h"]
+    along_x = elements["type"] == BEAM_S1
+    c = column_size_mm / 2
+
+    # Beams spanning s1, from their start column at (x0, y)
+    x0 = x - w/2
+    xs_1 = [x0 + c, x0 + c, x0 + w - c, x0 + w - c, x0 + c]
+    ys_1 = [y - c, y + c, y + c, y - c, y - c]
+
+    # Beams spanning s2 or S3, from their start at (x, y0)
+    y0 = y - h/2
+    xs_2 = [x - c, x - c, x + c, x + c, x - c]
+    ys_2 = [y0 + c, y0 + c + h, y0 + c + h, y0 + c, y0 + c]
+
+    return polygon_array([np.where(along_x, a, b) for a, b in zip(xs_1, xs_2)],
+                         [np.where(along_x, a, b) for a, b in zip(ys_1, ys_2)])
+
+
+def cis_slab_marks(x, y, s1, s2):
+    """
+    Centres of the one-way slab marks ("~") for the bays at (x, y), as an (n, 2) array.
+    """
+    x, y = np.meshgrid(np.asarray(x, dtype=float) + s1/2, np.asarray(y, dtype=float) + s2/2, indexing='ij')
+    return np.column_stack([x.ravel(), y.ravel()])
+
+
+def flat_slab_edge(length, width, s1, s2, column_size_mm):
+    """
+    Edge of a PT flat slab as a closed (5, 2) polyline.
+    """
+    return np.array([
+        [s1- column_size_mm/2, s2 - column_size_mm/2],
+        [s1- column_size_mm/2, s2 + width + column_size_mm/2],
+        [s1 + length + column_size_mm/2, s2 + width + column_size_mm/2],
+        [s1 + length + column_size_mm/2, s2 - column_size_mm/2],
+        [s1- column_size_mm/2, s2 - column_size_mm/2],
+    ], dtype=float)
+
+
+@functools.lru_cache(maxsize=1)
+def _staircase_template():
+    """
+    Staircase and lift line segments in local coordinates.
+
+    Returns one (n, 2, 2) segment array per anchor point used by
+    staircase_segments. The template is built once per process; a layout only
+    translates it.
+    """
+    # Staircase parameters (in meters)
+    floor_to_floor_height = 6.0  # m
+    riser_height = 0.15  # m
+    tread_depth = 0.3  # m
+    landing_length = 2  # m
+    stair_width = 1.2  # m
+    wall_width = 0.2
+    Lift_external = 2.5
+
+    # Calculate number of risers and treads
+    num_risers = int(floor_to_floor_height / riser_height)
+    num_treads_per_flight = (num_risers // 2) - 1
+    flight_length = num_treads_per_flight * tread_depth
+
+    def treads(x_start, x_end, y_start):
+        # Three edges per tread (bottom, top and riser)
+        y_end = y_start + stair_width
+        y_start = np.full_like(x_start, y_start)
+        y_end = np.full_like(x_start, y_end)
+        return np.stack([
+            np.stack([np.stack([x_start, y_start], -1), np.stack([x_end, y_start], -1)], 1),
+            np.stack([np.stack([x_start, y_end], -1), np.stack([x_end, y_end], -1)], 1),
+            np.stack([np.stack([x_start, y_start], -1), np.stack([x_start, y_end], -1)], 1),
+        ], 1).reshape(-1, 2, 2)
+
+    def box(x0, x1, y0, y1):
+        # Bottom, top and both sides of a landing
+        return np.array([[[x0, y0], [x1, y0]], [[x0, y1], [x1, y1]], [[x0, y0], [x0, y1]], [[x1, y0], [x1, y1]]], dtype=float)
+
+    def polyline(xs, ys):
+        points = np.column_stack([xs, ys]).astype(float)
+        return np.stack([points[:-1], points[1:]], 1)
+
+    i = np.arange(num_treads_per_flight)
+    lower = -stair_width - stair_width - wall_width - wall_width
+
+    # Staircase 1, anchored at (s1 + column/2, s2 - column/2)
+    x_start = i * tread_depth + landing_length
+    stair_1 = np.concatenate([
+        treads(x_start, x_start + tread_depth, -stair_width - wall_width),  # First flight
+        treads(x_start, x_start + tread_depth, lower),  # Second flight
+        box(0, landing_length, lower, 0),  # Intermediate landing
+        box(flight_length + landing_length, flight_length + 2 * landing_length, lower, -wall_width),  # 2nd intermediate landing
+        polyline(  # Wall
+            [-wall_width, -wall_width, flight_length + 2 * landing_length + wall_width, flight_length + 2 * landing_length + wall_width, landing_length],
+            [-wall_width, lower - wall_width, lower - wall_width, 0, 0],
+        ),
+    ])
+
+    # Lift 1, anchored at (s1 - column/2, s2 + column/2)
+    lift_1 = np.concatenate([
+        polyline([0, -Lift_external, -Lift_external, 0], [0, 0, Lift_external, Lift_external]),
+        polyline([0, -Lift_external + wall_width, -Lift_external + wall_width, 0], [wall_width, wall_width, Lift_external - wall_width, Lift_external - wall_width]),
+    ])
+
+    # Staircase 2 flights, anchored at (length + s1, width + s2 + column/2)
+    x_start = -(i * tread_depth) - landing_length
+    flights_2 = np.concatenate([
+        treads(x_start, x_start - tread_depth, wall_width),
+        treads(x_start, x_start - tread_depth, wall_width + wall_width + stair_width),
+    ])
+
+    # Staircase 2 landings and wall, anchored at (length + s1 - column/2, width + s2 + column/2)
+    landing_start = -landing_length + tread_depth
+    wall_start = landing_start - flight_length - landing_length
+    wall_end = wall_start + flight_length + 2 * landing_length
+    upper = wall_width + wall_width + stair_width + stair_width
+    landings_2 = np.concatenate([
+        box(landing_start, landing_start + landing_length, upper, wall_width),
+        box(wall_start, wall_start + landing_length, upper, 0),
+        polyline(
+            [wall_start - wall_width, wall_start - wall_width, wall_end + wall_width, wall_end + wall_width, landing_start - flight_length],
+            [0, upper + wall_width, upper + wall_width, 0, 0],
+        ),
+    ])
+
+    # Lift 2, anchored at (length + s1 + column/2, width + s2 - column/2)
+    lift_2 = np.concatenate([
+        polyline([0, Lift_external, Lift_external, 0], [0, 0, -Lift_external, -Lift_external]),
+        polyline([0, Lift_external + wall_width, Lift_external + wall_width, 0], [wall_width, wall_width, -Lift_external - wall_width, -Lift_external - wall_width]),
+    ])
+
+    return stair_1, lift_1, flights_2, landings_2, lift_2
+
+
+@functools.lru_cache(maxsize=64)
+def staircase_segments(s1, s2, column_size_mm, length, width):
+    """
+    All staircase and lift line segments for a layout as one (n, 2, 2) array.
+
+    The cached template is translated to the anchor points implied by the grid
+    and column size; results are cached per layout and returned read-only.
+    """
+    anchors = [
+        (s1 + column_size_mm/2, s2 - column_size_mm/2),
+        (s1 - column_size_mm/2, s2 + column_size_mm/2),
+        (length + s1, width + s2 + column_size_mm/2),
+        (length + s1 - column_size_mm/2, width + s2 + column_size_mm/2),
+        (length + s1 + column_size_mm/2, width + s2 - column_size_mm/2),
+    ]
+    segments = np.concatenate([piece + np.asarray(anchor, dtype=float) for piece, anchor in zip(_staircase_template(), anchors)])
+    segments.flags.writeable = False
+    return segments
+
+
+def crane_centres(length, width, s1, s2):
+    """
+    Tower crane positions for a layout (plot coordinates, grid margin included).
+    """
+    from output_data import is_large_site, tower_crane_grid
+
+    total_length = length + 2*s1
+    total_width = width + 2*s2
+    # Large sites: evenly spaced rows of evenly spaced cranes
+    if is_large_site(length, width):
+        cranes_per_row, crane_rows = tower_crane_grid(length, width)
+        return [((i + 1) * total_length / (cranes_per_row + 1), (j + 1) * total_width / (crane_rows + 1))
+                for j in range(crane_rows) for i in range(cranes_per_row)]
+
+    # Determine number of cranes based on length
+    if length <= 31:
+        return [(total_length / 2, total_width / 2)]
+    elif 31 < length <= 61:
+        return [(total_length / 3, total_width / 2), (2 * total_length / 3, total_width / 2)]
+    return [(total_length / 4, total_width / 2), (total_length / 2, total_width / 2), (3 * total_length / 4, total_width / 2)]
+
+
+def crane_base_squares(centres, side):
+    """
+    Closed square outlines (side in m) around each crane centre.
+    """
+    centres = np.asarray(centres, dtype=float).reshape(-1, 2)
+    half = side / 2
+    square = np.array([[-half, -half], [half, -half], [half, half], [-half, half], [-half, -half]])
+    return square[None, :, :] + centres[:, None, :]
+
+
+def crane_cross_segments(centres, half=1.15):
+    """
+    Horizontal and vertical line segments of the cross marking each crane centre.
+    """
+    centres = np.asarray(centres, dtype=float).reshape(-1, 2)
+    horizontal = np.stack([centres - [half, 0], centres + [half, 0]], axis=1)
+    vertical = np.stack([centres - [0, half], centres + [0, half]], axis=1)
+    return np.stack([horizontal, vertical], axis=1).reshape(-1, 2, 2)
@@ -0,0 +1,349 @@
+import argparse
+import heapq
+import math
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from metrics import stage_timer
+from output_data import HOIST_HOURS
+
+# Discrete-event replay of the per-floor hoists of calculate_layout_outputs
+# through the tower cranes, the passenger/material hoists and the concrete
+# pumps. Each floor lifts its columns, then its beams, then its slab; lifts of
+# delivered material (precast pieces, rebar) wait for their trailer, formwork
+# is on site from the floor below. Once the last crane lift of a floor is done
+# the concrete trucks are called off and poured one at a time per pump, and the
+# next floor starts when the pour (and any curing time) is over.
+#
+# Events are (time, sequence, kind, argument) tuples on a heapq, so no object
+# is created per event beyond the tuple; random lift times and arrival gaps
+# are drawn per floor as numpy arrays up front.
+
+# Event kinds
+FLOOR_START, TRAILER, LIFT_DONE, HOIST_DONE, TRUCK, POUR_DONE = range(6)
+
+# Crane lifts of a floor, in the order they are done
+LIFT_PHASES = ("column", "beam", "slab")
+
+FLOOR_COLUMNS = ["floor", "start_day", "lifts_end_day", "end_day", "cycle_days", "crane_hours", "crane_utilisation"]
+
+
+@dataclass(slots=True)
+class SiteLogistics:
+    """
+    Durations (hours) and arrival processes of the hoisting simulation.
+
+    With lift_spread 0 and deliveries that keep up with the cranes, the crane
+    lifts of a floor take weather_factor*hoist_hours*hoist_count_tower_crane
+    /no_tower_cranes working hours, as LayoutOutputs.floor_cycle_days assumes,
+    except that each phase is rounded up to whole lifts per crane.
+    """
+    hoist_hours: float = HOIST_HOURS
+    weather_factor: float = 1.3
+    # Lift times are triangular between (1 - lift_spread) and (1 + lift_spread) times the mean
+    lift_spread: float = 0.0
+    # Mean gaps between trailer and between concrete truck arrivals:
+    # exponential (Poisson arrivals) when poisson_arrivals, fixed otherwise.
+    # By default the trailers of a floor are spread over the time the cranes
+    # need for its lifts.
+    trailer_interval_hours: float = None
+    truck_interval_hours: float = 0.25
+    poisson_arrivals: bool = True
+    pour_hours: float = 0.4
+    cure_hours: float = 0.0
+    material_hoist_hours: float = 0.25
+    hours_per_day: float = 8.0
+
+
+def floor_lifts(outputs):
+    """
+    Crane lifts of one floor by phase (LIFT_PHASES), and how many of them are
+    delivered material (precast pieces and rebar) rather than formwork.
+
+    Parameters:
+    - outputs (LayoutOutputs): See output_data.calculate_layout_outputs.
+
+    Returns:
+    - lifts (list): Lifts of each phase.
+    - delivered (list): Lifts of each phase waiting for a trailer.
+    """
+    lifts = [int(outputs.column_hoist_count_tower_crane), int(outputs.beam_hoist_count_tower_crane),
+             int(outputs.slab_hoist_count_tower_crane)]
+    # Pieces and rebar tonnes per lift as in calculate_layout_outputs
+    if outputs.no_vertical_pc_com:
+        column = outputs.no_vertical_pc_com
+    else:
+        column = outputs.weight_column_rebar / 6
+    beam = outputs.weight_beam_rebar / 4
+    slab = outputs.no_unpropped_slabs + outputs.weight_slab_rebar / 4
+    delivered = [min(count, math.ceil(pieces)) for count, pieces in zip(lifts, (column, beam, slab))]
+    return lifts, delivered
+
+
+class HoistSimResult:
+    """
+    Outcome of a hoisting simulation.
+
+    Attributes:
+    - floors (DataFrame): One row per floor (FLOOR_COLUMNS): its start, the
+      end of its crane lifts and its end (days), its cycle (days), the
+      crane-hours spent lifting and the crane utilisation while its lifts
+      were under way.
+    - events (int): Events processed.
+    - cranes (int): Tower cranes simulated.
+    - expected_cycle_days (float): LayoutOutputs.floor_cycle_days.
+    - hours_per_day (float): Working hours per day.
+    """
+
+    def __init__(self, floors, events, cranes, expected_cycle_days, hours_per_day):
+        self.floors = floors
+        self.events = events
+        self.cranes = cranes
+        self.expected_cycle_days = expected_cycle_days
+        self.hours_per_day = hours_per_day
+
+    def summary(self):
+        """
+        Mean and longest simulated floor cycle next to the closed-form one.
+
+        Returns:
+        - summary (dict): floors, mean_cycle_days, max_cycle_days,
+          expected_cycle_days, programme_days, crane_utilisation (over all
+          lifting periods) and events.
+        """
+        floors = self.floors
+        lifting_hours = (floors["lifts_end_day"] - floors["start_day"]).sum() * self.hours_per_day
+        return {
+            "floors": len(floors),
+            "mean_cycle_days": floors["cycle_days"].mean(),
+            "max_cycle_days": floors["cycle_days"].max(),
+            "expected_cycle_days": self.expected_cycle_days,
+            "programme_days": floors["end_day"].iloc[-1] if len(floors) else 0.0,
+            "crane_utilisation": floors["crane_hours"].sum() / (self.cranes * lifting_hours) if lifting_hours > 0 else 0.0,
+            "events": self.events,
+        }
+
+
+def simulate_hoisting(outputs, floors=5, cranes=None, logistics=None, seed=None):
+    """
+    Simulate the hoisting of a multi-floor programme, floor after floor.
+
+    Parameters:
+    - outputs (LayoutOutputs): Per-floor quantities, see
+      output_data.calculate_layout_outputs.
+    - floors (int): Floors to build.
+    - cranes (int): Tower cranes (default: outputs.no_tower_cranes).
+    - logistics (SiteLogistics): Durations and arrival processes.
+    - seed (int): Seed of the random lift times and arrival gaps.
+
+    Returns:
+    - result (HoistSimResult)
+    """
+    logistics = logistics or SiteLogistics()
+    rng = np.random.default_rng(seed)
+    cranes = int(outputs.no_tower_cranes if cranes is None else cranes)
+    if cranes < 1:
+        raise ValueError("At least one tower crane is needed")
+    hoists = int(outputs.no_passenger_material_hoists)
+    pumps = max(int(outputs.no_concrete_pumps), 1)
+    lifts, delivered = floor_lifts(outputs)
+    total_lifts = sum(lifts)
+    total_delivered = sum(delivered)
+    # Delivered lifts are numbered floor-wide in phase order; phase p owns [bounds[p], bounds[p + 1])
+    bounds = np.cumsum([0] + delivered).tolist()
+    trailers = int(outputs.no_trailer_deliveries) if total_delivered else 0
+    trucks = int(outputs.no_concrete_truck_deliveries)
+    hoist_lifts = int(outputs.hoist_count_passenger_material) if hoists else 0
+    lift_hours = logistics.hoist_hours * logistics.weather_factor
+    trailer_interval_hours = logistics.trailer_interval_hours
+    if trailer_interval_hours is None:
+        trailer_interval_hours = lift_hours * total_lifts / cranes / max(trailers, 1)
+    pour_hours = logistics.pour_hours
+    material_hoist_hours = logistics.material_hoist_hours
+
+    def gaps(count, mean):
+        if logistics.poisson_arrivals:
+            return rng.exponential(mean, count).tolist()
+        return [mean] * count
+
+    heap = []
+    push = heapq.heappush
+    pop = heapq.heappop
+    sequence = 0
+    events = 0
+    records = []
+
+    # State of the floor under way
+    floor = -1
+    floor_start = lifts_end = 0.0
+    available = remaining = None
+    phase = 0
+    durations = trailer_gaps = truck_gaps = None
+    next_lift = next_trailer = released = 0
+    idle_cranes = list(range(cranes))
+    crane_hours = 0.0
+    hoists_left = hoists_running = 0
+    trucks_arrived = trucks_poured = trucks_waiting = 0
+    idle_pumps = pumps
+    pour_called = False
+
+    push(heap, (0.0, sequence, FLOOR_START, 0))
+    sequence += 1
+    with stage_timer("hoist_simulation"):
+        while heap:
+            time, _, kind, argument = pop(heap)
+            events += 1
+
+            if kind == LIFT_DONE:
+                idle_cranes.append(argument)
+                remaining[phase] -= 1
+                while phase < 3 and remaining[phase] == 0:
+                    phase += 1
+                if phase == 3 and not pour_called:
+                    lifts_end = time
+                    pour_called = True
+                    if trucks:
+                        push(heap, (time + truck_gaps[0], sequence, TRUCK, 0))
+                        sequence += 1
+
+            elif kind == TRAILER:
+                # Release the next share of the floor's delivered lifts
+                upto = (argument + 1) * total_delivered // trailers
+                for p in range(3):
+                    low, high = max(released, bounds[p]), min(upto, bounds[p + 1])
+                    if high > low:
+                        available[p] += high - low
+                released = upto
+                next_trailer = argument + 1
+                if next_trailer < trailers:
+                    push(heap, (time + trailer_gaps[next_trailer], sequence, TRAILER, next_trailer))
+                    sequence += 1
+
+            elif kind == TRUCK:
+                trucks_arrived += 1
+                trucks_waiting += 1
+                if trucks_arrived < trucks:
+                    push(heap, (time + truck_gaps[trucks_arrived], sequence, TRUCK, 0))
+                    sequence += 1
+                while idle_pumps and trucks_waiting:
+                    idle_pumps -= 1
+                    trucks_waiting -= 1
+                    push(heap, (time + pour_hours, sequence, POUR_DONE, 0))
+                    sequence += 1
+
+            elif kind == POUR_DONE:
+                trucks_poured += 1
+                if trucks_waiting:
+                    trucks_waiting -= 1
+                    push(heap, (time + pour_hours, sequence, POUR_DONE, 0))
+                    sequence += 1
+                else:
+                    idle_pumps += 1
+
+            elif kind == HOIST_DONE:
+                hoists_running -= 1
+                if hoists_left:
+                    hoists_left -= 1
+                    hoists_running += 1
+                    push(heap, (time + material_hoist_hours, sequence, HOIST_DONE, 0))
+                    sequence += 1
+
+            else:  # FLOOR_START
+                floor = argument
+                floor_start = lifts_end = time
+                available = [count - pieces for count, pieces in zip(lifts, delivered)]
+                remaining = list(lifts)
+                phase = 0
+                while phase < 3 and remaining[phase] == 0:
+                    phase += 1
+                if logistics.lift_spread:
+                    spread = logistics.lift_spread
+                    durations = (lift_hours * rng.triangular(1 - spread, 1, 1 + spread, total_lifts)).tolist()
+                else:
+                    durations = [lift_hours] * total_lifts
+                next_lift = 0
+                crane_hours = 0.0
+                released = 0
+                if trailers:
+                    trailer_gaps = gaps(trailers, trailer_interval_hours)
+                    push(heap, (time + trailer_gaps[0], sequence, TRAILER, 0))
+                    sequence += 1
+                else:
+                    available = list(lifts)
+                truck_gaps = gaps(trucks, logistics.truck_interval_hours)
+                trucks_arrived = trucks_poured = trucks_waiting = 0
+                idle_pumps = pumps
+                pour_called = phase == 3
+                if pour_called and trucks:
+                    push(heap, (time + truck_gaps[0], sequence, TRUCK, 0))
+                    sequence += 1
+                hoists_left = hoist_lifts
+                while hoists_left and hoists_running < hoists:
+                    hoists_left -= 1
+                    hoists_running += 1
+                    push(heap, (time + material_hoist_hours, sequence, HOIST_DONE, 0))
+                    sequence += 1
+
+            # Idle cranes take the ready lifts of the current phase
+            if phase < 3:
+                while idle_cranes and available[phase]:
+                    available[phase] -= 1
+                    duration = durations[next_lift]
+                    next_lift += 1
+                    crane_hours += duration
+                    push(heap, (time + duration, sequence, LIFT_DONE, idle_cranes.pop()))
+                    sequence += 1
+
+            # Floor over: crane lifts, material hoists and pour all done
+            if floor >= 0 and phase == 3 and pour_called and trucks_poured == trucks and not hoists_running and not hoists_left:
+                records.append((floor, floor_start, lifts_end, time, crane_hours))
+                if floor + 1 < floors:
+                    push(heap, (time + logistics.cure_hours, sequence, FLOOR_START, floor + 1))
+                    sequence += 1
+                floor = -1
+
+    day = logistics.hours_per_day
+    table = pd.DataFrame(records, columns=["floor", "start", "lifts_end", "end", "crane_hours"])
+    table["floor"] += 1
+    lifting = table["lifts_end"] - table["start"]
+    table["crane_utilisation"] = np.where(lifting > 0, table["crane_hours"] / (cranes * lifting.where(lifting > 0, 1)), 0.0)
+    table["start_day"] = table["start"] / day
+    table["lifts_end_day"] = table["lifts_end"] / day
+    table["end_day"] = table["end"] / day
+    table["cycle_days"] = (table["end"] - table["start"]) / day
+    return HoistSimResult(table[FLOOR_COLUMNS], events, cranes, outputs.floor_cycle_days, day)
+
+
+def main(argv=None):
+    from pipeline import add_scenario_arguments, scenario_result
+
+    parser = argparse.ArgumentParser(description="Simulate the hoisting of a multi-floor programme for one DfMA scenario.")
+    add_scenario_arguments(parser)
+    parser.add_argument("--floors", type=int, default=5)
+    parser.add_argument("--cranes", type=int, help="Tower cranes (default: as in the quantities)")
+    parser.add_argument("--lift-spread", type=float, default=0.0, help="Relative spread of the lift times (triangular)")
+    parser.add_argument("--trailer-interval", type=float, help="Mean hours between trailer arrivals (default: spread over the crane lifts)")
+    parser.add_argument("--truck-interval", type=float, default=0.25, help="Mean hours between concrete truck arrivals")
+    parser.add_argument("--fixed-arrivals", action="store_true", help="Fixed instead of exponential gaps between arrivals")
+    parser.add_argument("--pour-hours", type=float, default=0.4, help="Hours to pour one truck")
+    parser.add_argument("--cure-hours", type=float, default=0.0, help="Hours between the end of a pour and the next floor")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    result = scenario_result(args)
+    logistics = SiteLogistics(lift_spread=args.lift_spread, trailer_interval_hours=args.trailer_interval,
+                              truck_interval_hours=args.truck_interval, poisson_arrivals=not args.fixed_arrivals,
+                              pour_hours=args.pour_hours, cure_hours=args.cure_hours)
+    simulation = simulate_hoisting(result["outputs"], args.floors, args.cranes, logistics, args.seed)
+    print(simulation.floors.round(2).to_string(index=False))
+    print()
+    for name, value in simulation.summary().items():
+        print(f"{name:<20} {value:.2f}" if isinstance(value, float) else f"{name:<20} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+# A page with no app code: whatever it imports is charged to Streamlit, not the app
+BASELINE_SCRIPT = """import streamlit as st
+st.set_page_config(page_title="baseline")
+st.selectbox("x", options=["a"])
+st.number_input("y", value=1)
+st.button("z")
+"""
+
+
+def parse_importtime(stderr):
+    """
+    Parse the output of python -X importtime.
+
+    Returns:
+    - imports (list): (module, depth, self_us, cumulative_us) in import order,
+      depth 0 being a module imported directly by the measured code.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return imports
+
+
+def measure(script, env=None):
+    """
+    Run script (executed the way `streamlit run` would, without a server) under
+    -X importtime and return the parsed imports.
+    """
+    run_env = dict(os.environ, DFMA_PREWARM="0", **(env or {}))
+    completed = subprocess.run([sys.executable, "-X", "importtime", script], capture_output=True, text=True,
+                               env=run_env, cwd=os.path.dirname(os.path.abspath(script)))
+    return parse_importtime(completed.stderr)
+
+
+def measure_baseline():
+    """
+    Imports of a bare Streamlit page, measured like the app.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "baseline_app.py")
+        with open(path, "w") as f:
+            f.write(BASELINE_SCRIPT)
+        return measure(path)
+
+
+def summarize(imports, exclude=()):
+    """
+    Group the top-level imports by root package, skipping modules in exclude.
+
+    Returns:
+    - totals (dict): Cumulative milliseconds per root package, largest first.
+    """
+    totals = {}
+    for name, depth, _, cumulative_us in imports:
+        if depth == 0 and name not in exclude:
+            root = name.split(".")[0]
+            totals[root] = totals.get(root, 0) + cumulative_us / 1000
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Report the import time the app pays before its first form renders (python -X importtime).")
+    parser.add_argument("script", nargs="?", default="streamlit_app.py", help="App script to measure (default: streamlit_app.py)")
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="Allowed import time beyond a bare Streamlit page, in ms (default: 150)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs to take the fastest of (default: 3)")
+    parser.add_argument("--top", type=int, default=15, help="Root packages to list (default: 15)")
+    args = parser.parse_args(argv)
+
+    framework_ms = None
+    best = None
+    for _ in range(args.runs):
+        baseline = measure_baseline()
+        baseline_modules = {name for name, _, _, _ in baseline}
+        framework_ms = min(framework_ms or float("inf"), sum(summarize(baseline).values()))
+        totals = summarize(measure(args.script), exclude=baseline_modules)
+        if best is None or sum(totals.values()) < sum(best.values()):
+            best = totals
+
+    app_ms = sum(best.values())
+    for root, ms in list(best.items())[:args.top]:
+        print(f"{root:<30} {ms:9.1f} ms")
+    print(f"{'streamlit (bare page)':<30} {framework_ms:9.1f} ms")
+    print(f"{'app imports':<30} {app_ms:9.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    if app_ms > args.budget_ms:
+        print("Import budget exceeded", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Cumulative latency histogram in the Prometheus style (bucket counts, sum, count).
+    """
+    __slots__ = ("buckets", "counts", "total", "count", "max", "last")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        self.max = max(self.max, seconds)
+        self.last = seconds
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation inside the matching bucket,
+        as Prometheus' histogram_quantile does.
+        """
+        if self.count == 0:
+            return float("nan")
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if cumulative + n >= rank and n:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - cumulative) / n, self.max)
+            cumulative += n
+        return self.max
+
+
+class MetricsRegistry:
+    """
+    Process-wide store of per-stage latency histograms and gauges.
+
+    Histograms are keyed by stage name and exported as the single metric
+    dfma_stage_duration_seconds with a stage label. Gauges are callables
+    returning a number, evaluated at export time.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def stage_timer(self, stage):
+        """
+        Context manager recording the wall time of its block under stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def register_gauge(self, name, help_text, func):
+        """
+        Export func() as a Prometheus gauge called name.
+        """
+        with self._lock:
+            self._gauges[name] = (help_text, func)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def summary(self):
+        """
+        Return one dict per stage (count, mean, p50, p95, max and last latency
+        in milliseconds), in the order the stages were first seen.
+        """
+        with self._lock:
+            return [
+                {
+                    "stage": stage,
+                    "count": h.count,
+                    "mean_ms": 1000 * h.total / h.count,
+                    "p50_ms": 1000 * h.quantile(0.5),
+                    "p95_ms": 1000 * h.quantile(0.95),
+                    "max_ms": 1000 * h.max,
+                    "last_ms": 1000 * h.last,
+                }
+                for stage, h in self._histograms.items()
+            ]
+
+    def to_prometheus(self):
+        """
+        Render every histogram and gauge in the Prometheus text exposition format.
+        """
+        lines = [
+            "# HELP dfma_stage_duration_seconds Latency of each DfMA pipeline stage.",
+            "# TYPE dfma_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            for stage, h in self._histograms.items():
+                cumulative = 0
+                for bound, n in zip(self.buckets, h.counts):
+                    cumulative += n
+                    lines.append(f'dfma_stage_duration_seconds_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'dfma_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'dfma_stage_duration_seconds_sum{{stage="{stage}"}} {h.total!r}')
+                lines.append(f'dfma_stage_duration_seconds_count{{stage="{stage}"}} {h.count}')
+            gauges = list(self._gauges.items())
+
+        for name, (help_text, func) in gauges:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {float(func())!r}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """
+        Atomically write the Prometheus text to path (e.g. for node_exporter's
+        textfile collector).
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics():
+    """
+    Return the process-wide MetricsRegistry shared by every Streamlit session.
+    """
+    return _registry
+
+
+def stage_timer(stage):
+    """
+    Time a block into the shared registry: `with stage_timer("beam_sizing"): ...`
+    """
+    return _registry.stage_timer(stage)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port, host="127.0.0.1", registry=None):
+    """
+    Serve the registry at http://host:port/metrics from a daemon thread.
+
+    Only one server is started per process; later calls return the running one.
+    """
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = registry or _registry
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="dfma-metrics", daemon=True).start()
+        return _server
+
+
+def configure_from_env():
+    """
+    Start the metrics endpoint if DFMA_METRICS_PORT is set (bound to
+    DFMA_METRICS_HOST, default 127.0.0.1).
+    """
+    port = os.environ.get("DFMA_METRICS_PORT")
+    if port:
+        start_metrics_server(int(port), os.environ.get("DFMA_METRICS_HOST", "127.0.0.1"))
+
+
+def export_metrics():
+    """
+    Write the registry to DFMA_METRICS_FILE, if that environment variable is set.
+    """
+    path = os.environ.get("DFMA_METRICS_FILE")
+    if path:
+        _registry.write_prometheus(path)
@@ -0,0 +1,247 @@
+import argparse
+import sys
+from dataclasses import fields
+
+import numpy as np
+import pandas as pd
+
+from output_data import HOIST_HOURS, ProductivityRates, calculate_layout_outputs_batch, get_productivity_rates
+from pipeline import add_scenario_arguments, run_pipeline, scenario_inputs
+
+# Manhour rates used by the model, plus the crane time per hoist
+RATE_FIELDS = tuple(f.name for f in fields(ProductivityRates) if f.name != "all_rates")
+UNCERTAIN_INPUTS = RATE_FIELDS + ("hoist_hours",)
+
+# Per-sample outputs kept from every Monte Carlo run
+MONTE_CARLO_METRICS = ("total_mandays_crane", "floor_cycle_days", "unique_headcount",
+                       "beam_manhours", "slab_manhours", "column_manhours", "casting_manhours")
+
+MONTE_CARLO_LABELS = {
+    "total_mandays_crane": "Expected Mandays (Structure only)",
+    "floor_cycle_days": "Floor Cycle (days)",
+    "unique_headcount": "Unique Headcount",
+    "beam_manhours": "Beam Manhours",
+    "slab_manhours": "Slab Manhours",
+    "column_manhours": "Column Manhours",
+    "casting_manhours": "Casting Manhours",
+}
+
+DISTRIBUTION_KINDS = ("fixed", "uniform", "triangular", "pert", "normal", "lognormal")
+
+
+class Distribution:
+    """
+    A sampling distribution for one uncertain input.
+
+    Parameters by kind:
+    - fixed: value
+    - uniform: low, high
+    - triangular, pert: low, mode, high
+    - normal: mean, standard deviation (negative samples are clipped to 0)
+    - lognormal: median, sigma of the underlying normal
+    """
+
+    def __init__(self, kind, *params):
+        if kind not in DISTRIBUTION_KINDS:
+            raise ValueError(f"Unsupported distribution: {kind}")
+        expected = {"fixed": 1, "uniform": 2, "triangular": 3, "pert": 3, "normal": 2, "lognormal": 2}[kind]
+        if len(params) != expected:
+            raise ValueError(f"A {kind} distribution takes {expected} parameter(s), got {len(params)}")
+        params = tuple(float(p) for p in params)
+        if kind in ("uniform", "triangular", "pert") and list(params) != sorted(params):
+            raise ValueError(f"The parameters of a {kind} distribution must be in increasing order: {params}")
+        self.kind = kind
+        self.params = params
+
+    def __repr__(self):
+        return f"{self.kind}:{','.join(f'{p:g}' for p in self.params)}"
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Parse a "kind:p1,p2,..." specification, e.g. "triangular:20,25,35".
+        """
+        kind, _, params = text.partition(":")
+        return cls(kind.strip(), *(p for p in params.split(",") if p.strip()))
+
+    @classmethod
+    def around(cls, value, spread, kind="triangular"):
+        """
+        A distribution centred on a point value with a relative spread (0.2 = ±20%).
+        """
+        low, high = value * (1 - spread), value * (1 + spread)
+        if kind == "fixed" or spread == 0:
+            return cls("fixed", value)
+        if kind == "uniform":
+            return cls("uniform", low, high)
+        if kind in ("triangular", "pert"):
+            return cls(kind, low, value, high)
+        if kind == "normal":
+            return cls("normal", value, value * spread / 2)  # ±spread covers about 95%
+        return cls("lognormal", value, np.log1p(spread) / 2)
+
+    def sample(self, rng, size):
+        kind, p = self.kind, self.params
+        if kind == "fixed":
+            return np.full(size, p[0])
+        if kind == "uniform":
+            return rng.uniform(p[0], p[1], size)
+        if p[0] == p[-1] and kind in ("triangular", "pert"):
+            return np.full(size, p[0])
+        if kind == "triangular":
+            return rng.triangular(p[0], p[1], p[2], size)
+        if kind == "pert":
+            low, mode, high = p
+            alpha = 1 + 4 * (mode - low) / (high - low)
+            beta = 1 + 4 * (high - mode) / (high - low)
+            return low + (high - low) * rng.beta(alpha, beta, size)
+        if kind == "normal":
+            return np.maximum(rng.normal(p[0], p[1], size), 0)
+        return p[0] * np.exp(rng.normal(0, p[1], size))
+
+
+def default_distributions(spread=0.2, kind="triangular", rates=None):
+    """
+    Distributions centred on the point values of productivity_list.csv (and
+    HOIST_HOURS) with a relative spread.
+    """
+    rates = rates or get_productivity_rates()
+    values = {name: getattr(rates, name) for name in RATE_FIELDS}
+    values["hoist_hours"] = HOIST_HOURS
+    return {name: Distribution.around(value, spread, kind) for name, value in values.items()}
+
+
+class MonteCarloResult:
+    """
+    Samples of the Monte Carlo outputs for one scenario.
+
+    Attributes:
+    - samples (dict): One array per MONTE_CARLO_METRICS entry.
+    - point (dict): The same outputs with the point rates (as Generate reports them).
+    - distributions (dict): The distribution used for each uncertain input.
+    """
+
+    def __init__(self, samples, point, distributions):
+        self.samples = samples
+        self.point = point
+        self.distributions = distributions
+
+    def __len__(self):
+        return len(self.samples["total_mandays_crane"])
+
+    def percentiles(self, percentiles=(10, 50, 90)):
+        """
+        Percentiles, mean and point estimate of every output.
+
+        Returns:
+        - table (DataFrame): One row per output, columns "P10", "P50", ..., "mean", "point".
+        """
+        rows = {}
+        for name, values in self.samples.items():
+            row = dict(zip((f"P{p:g}" for p in percentiles), np.percentile(values, percentiles)))
+            row["mean"] = values.mean()
+            row["point"] = self.point[name]
+            rows[name] = row
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def histogram(self, name, bins=50):
+        """
+        Histogram of one output.
+
+        Returns:
+        - histogram (DataFrame): Bin centres ("value") and sample counts ("count").
+        """
+        counts, edges = np.histogram(self.samples[name], bins=bins)
+        return pd.DataFrame({"value": (edges[:-1] + edges[1:]) / 2, "count": counts})
+
+
+def run_monte_carlo(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f,
+                    distributions=None, samples=1_000_000, seed=None, chunk_size=200_000):
+    """
+    Sample the productivity rates (and the crane time per hoist) and evaluate
+    the scenario's mandays, floor cycle and headcount for every sample.
+
+    Sizing does not depend on the rates, so the scenario is sized once by
+    run_pipeline; the layout formulas are then evaluated over the samples as
+    array operations by calculate_layout_outputs_batch, chunk by chunk to bound
+    memory.
+
+    Parameters:
+    - length, width (float): Snapped building dimensions, as for run_pipeline.
+    - distributions (dict): Distribution per UNCERTAIN_INPUTS name; missing
+      inputs keep their point value (default: default_distributions()).
+    - samples (int): Number of samples.
+    - seed (int): Seed of the random generator, for reproducible runs.
+    - chunk_size (int): Samples evaluated per array operation.
+
+    Returns:
+    - result (MonteCarloResult)
+    """
+    base = get_productivity_rates()
+    if distributions is None:
+        distributions = default_distributions(rates=base)
+    unknown = set(distributions) - set(UNCERTAIN_INPUTS)
+    if unknown:
+        raise ValueError(f"Unknown uncertain inputs: {', '.join(sorted(unknown))}")
+
+    result = run_pipeline(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f)
+    outputs = result["outputs"]
+    point = {name: getattr(outputs, name) for name in MONTE_CARLO_METRICS}
+    sizing_args = (
+        s1, s2, live_load, result["column_size_mm"], selected_column, selected_beam, result["selected_slab"], length, width,
+        result["b_s1_mm"], result["d_s1_mm"], result["b_s2_mm"], result["d_s2_mm"], result["b_s3_mm"], result["d_s3_mm"],
+        result["slab_thickness_mm"], result["slab_max_spacing_pt_mm"], result["hcs_slab_thickness_mm"], f2f)
+
+    # Rate-independent quantities of the scenario
+    hoist_count = outputs.hoist_count_tower_crane
+    no_tower_cranes = outputs.no_tower_cranes
+
+    rng = np.random.default_rng(seed)
+    collected = {name: np.empty(samples) for name in MONTE_CARLO_METRICS}
+    for start in range(0, samples, chunk_size):
+        size = min(chunk_size, samples - start)
+        drawn = {name: distributions[name].sample(rng, size) if name in distributions else None for name in UNCERTAIN_INPUTS}
+        rates = ProductivityRates(**{name: getattr(base, name) if drawn[name] is None else drawn[name] for name in RATE_FIELDS})
+        hoist_hours = HOIST_HOURS if drawn["hoist_hours"] is None else drawn["hoist_hours"]
+
+        batch = calculate_layout_outputs_batch(*sizing_args, rates=rates)
+        chunk = slice(start, start + size)
+        for name in ("total_mandays_crane", "beam_manhours", "slab_manhours", "column_manhours", "casting_manhours"):
+            collected[name][chunk] = getattr(batch, name)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # As LayoutOutputs.floor_cycle_days and unique_headcount
+            collected["floor_cycle_days"][chunk] = np.round(1.3*hoist_hours*hoist_count/no_tower_cranes/8, 2)
+            collected["unique_headcount"][chunk] = np.round(batch.total_mandays_crane/(1.3*hoist_count*0.8/no_tower_cranes/8))
+
+    return MonteCarloResult(collected, point, dict(distributions))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo P50/P90 mandays, floor cycle and headcount for one DfMA scenario.")
+    add_scenario_arguments(parser)
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--spread", type=float, default=0.2, help="Relative spread of the default distributions (default: 0.2)")
+    parser.add_argument("--kind", choices=DISTRIBUTION_KINDS, default="triangular", help="Kind of the default distributions")
+    parser.add_argument("--rate", action="append", default=[], metavar="NAME=KIND:PARAMS",
+                        help="Distribution for one input, e.g. loosebar_ton=triangular:20,25,35 (repeatable)")
+    parser.add_argument("--percentiles", type=float, nargs="+", default=[10, 50, 90])
+    args = parser.parse_args(argv)
+
+    distributions = default_distributions(args.spread, args.kind)
+    for spec in args.rate:
+        name, _, text = spec.partition("=")
+        if name not in UNCERTAIN_INPUTS:
+            parser.error(f"unknown input {name!r}; choose from {', '.join(UNCERTAIN_INPUTS)}")
+        distributions[name] = Distribution.parse(text)
+
+    result = run_monte_carlo(*scenario_inputs(args), distributions, samples=args.samples, seed=args.seed)
+    for name, distribution in distributions.items():
+        print(f"{name:<20} {distribution}")
+    print()
+    print(result.percentiles(args.percentiles).round(2).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
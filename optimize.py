@@ -0,0 +1,212 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from column_rc import calculate_column_size_batch
+from beam_rc import calculate_beam_size_batch
+from slab_rc import calculate_slab_thickness_batch, hcs_selected_slab_check_batch
+from output_data import calculate_layout_outputs_batch
+from pipeline import add_scenario_arguments, grid_footprint, run_pipeline
+
+# Layout outputs the span optimizer can minimise
+OBJECTIVES = ("total_mandays_crane", "cis_volume", "hoist_count_tower_crane")
+
+# Outputs also reported per m² of the floor kept after snapping to whole bays.
+# Spans snap the footprint to different sizes, so layouts are compared per m²:
+# on totals the layouts dropping the most building would always win.
+PER_M2_OUTPUTS = OBJECTIVES + ("no_trailer_deliveries",)
+
+# Smallest share of the footprint a layout must keep by default
+DEFAULT_MIN_COVERAGE = 0.9
+
+# Span ranges accepted by the UI (s2 = 0 has no bays and cannot be evaluated)
+S1_RANGE = (5.0, 13.0)
+S2_RANGE = (1.0, 12.0)
+
+# Columns reported for every candidate layout
+CANDIDATE_COLUMNS = (["s1", "s2", "building_length", "building_width", "coverage", "effective_slab"] + list(OBJECTIVES)
+                     + [f"{name}_per_m2" for name in OBJECTIVES])
+
+
+def evaluate_designs(selected_column, selected_beam, selected_slab, s1, s2, live_load, length_input, width_input, f2f, rates=None):
+    """
+    Evaluate a batch of layouts for one column/beam/slab combination with the
+    vectorised sizing and layout functions.
+
+    The footprint is snapped to whole bays per element, as the UI does.
+
+    Parameters:
+    - s1, s2, live_load, f2f (array-like): Broadcast against each other.
+    - length_input, width_input (float or array-like): Footprint before snapping (m).
+    - rates (ProductivityRates): Productivity rates (default: productivity_list.csv).
+
+    Returns:
+    - designs (DataFrame): One row per layout with the inputs, snapped footprint,
+      coverage (snapped area / input area), effective slab, sizing results,
+      every LayoutOutputs field and the PER_M2_OUTPUTS per m² of snapped
+      footprint ("<name>_per_m2").
+    - valid (ndarray of bool): Layouts the pipeline can evaluate; the others have
+      no bays after snapping, no suitable hollow core slab, or a zero live load
+      on a CIS or PT slab.
+    """
+    s1, s2, live_load, f2f, length_input, width_input = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (s1, s2, live_load, f2f, length_input, width_input)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        length = np.floor(length_input / s1) * s1
+        width = np.floor(width_input / s2) * s2
+
+    column_size_mm, column_weight_tonnes = calculate_column_size_batch(s1, s2, live_load, selected_column, f2f)
+    effective_slab = hcs_selected_slab_check_batch(s1, live_load, selected_slab)
+    beam_sizes = calculate_beam_size_batch(s1, s2, live_load, column_size_mm, selected_beam, effective_slab)
+
+    slab_thickness_mm = np.zeros(s1.shape, dtype=int)
+    slab_max_spacing_pt_mm = np.zeros(s1.shape, dtype=int)
+    hcs_slab_thickness_mm = np.zeros(s1.shape)
+    for slab_type in np.unique(effective_slab):
+        mask = effective_slab == slab_type
+        slab_thickness_mm[mask], slab_max_spacing_pt_mm[mask], hcs_slab_thickness_mm[mask] = calculate_slab_thickness_batch(
+            s1[mask], s2[mask], live_load[mask], slab_type, strict=False)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        outputs = calculate_layout_outputs_batch(
+            s1, s2, live_load, column_size_mm, selected_column, selected_beam, effective_slab, length, width,
+            *beam_sizes, slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm, f2f, rates=rates)
+
+    designs = pd.DataFrame({
+        "s1": s1.ravel(),
+        "s2": s2.ravel(),
+        "live_load": live_load.ravel(),
+        "f2f": f2f.ravel(),
+        "building_length": length.ravel(),
+        "building_width": width.ravel(),
+        "coverage": (length * width / (length_input * width_input)).ravel(),
+        "effective_slab": effective_slab.ravel(),
+        "column_size_mm": column_size_mm.ravel(),
+        "column_weight_tonnes": column_weight_tonnes.ravel(),
+        "hcs_slab_thickness_mm": hcs_slab_thickness_mm.ravel(),
+    })
+    for name, values in outputs.to_dict().items():
+        designs[name] = values.ravel()
+    floor_area = designs["building_length"] * designs["building_width"]
+    for name in PER_M2_OUTPUTS:
+        designs[f"{name}_per_m2"] = designs[name] / floor_area
+
+    # CIS and PT slab sizing divide by the live load
+    valid = (live_load.ravel() > 0) | np.isin(effective_slab.ravel(), ["1.2HC Slab", "2.4HC Slab", "1.2HCS_S3", "2.4HCS_S3"])
+    valid &= (s2.ravel() > 0) & (length.ravel() > 0) & (width.ravel() > 0) & np.isfinite(hcs_slab_thickness_mm.ravel())
+    valid &= np.isfinite(designs[list(OBJECTIVES)].to_numpy()).all(axis=1)
+    return designs, valid
+
+
+def span_grid(s1_range=S1_RANGE, s2_range=S2_RANGE, step=1.0):
+    """
+    Every (s1, s2) pair on a grid of step metres within the given ranges.
+    """
+    s1 = np.round(np.arange(s1_range[0], s1_range[1] + step / 2, step), 6)
+    s2 = np.round(np.arange(s2_range[0], s2_range[1] + step / 2, step), 6)
+    s1, s2 = np.meshgrid(s1, s2, indexing="ij")
+    return s1.ravel(), s2.ravel()
+
+
+def _rank(designs, valid, objective, min_coverage):
+    # Indices of the admissible candidates, best first by the objective per m²
+    # of the snapped footprint (ties broken by span, then by s2)
+    keep = np.flatnonzero(valid & (designs["coverage"].to_numpy() >= min_coverage))
+    order = np.lexsort((designs["s2"].to_numpy()[keep], designs["s1"].to_numpy()[keep], designs[f"{objective}_per_m2"].to_numpy()[keep]))
+    return keep[order]
+
+
+def optimize_spans(selected_column, selected_beam, selected_slab, live_load, length_input, width_input, f2f,
+                   objective="total_mandays_crane", top_k=5, step=1.0, min_coverage=DEFAULT_MIN_COVERAGE, refine_top=10,
+                   s1_range=S1_RANGE, s2_range=S2_RANGE, rates=None):
+    """
+    Search s1/s2 for the layouts minimising one layout output per m² of the
+    footprint kept after snapping to whole bays.
+
+    The whole grid is evaluated at once with the vectorised engine. With a step
+    finer than 1 m the search runs coarse to fine: the 1 m grid is evaluated
+    first and only the neighbourhoods (±1 m) of its refine_top best layouts
+    are searched at the fine step, instead of the full fine grid.
+
+    Parameters:
+    - live_load (float): Live load (kN/m²).
+    - length_input, width_input (float): Footprint before snapping to whole bays (m).
+    - f2f (float): Floor-to-floor height (m).
+    - objective (str): One of OBJECTIVES.
+    - top_k (int): Number of layouts returned.
+    - step (float): Span resolution (m); the UI accepts whole metres.
+    - min_coverage (float): Smallest fraction of the footprint that must remain
+      after snapping to whole bays (0 accepts any layout; default 0.9).
+    - refine_top (int): Coarse layouts whose neighbourhood is refined.
+    - s1_range, s2_range (tuple): Inclusive span ranges (m).
+
+    Returns:
+    - best (DataFrame): The top_k layouts (CANDIDATE_COLUMNS plus "result"),
+      best first. "result" is the run_pipeline result for that layout, so every
+      returned layout is confirmed by the scalar pipeline.
+    - evaluated (int): Number of layouts evaluated.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unsupported objective: {objective}")
+
+    def evaluate(s1, s2):
+        return evaluate_designs(selected_column, selected_beam, selected_slab, s1, s2, live_load, length_input, width_input, f2f, rates=rates)
+
+    coarse_step = max(step, 1.0)
+    s1, s2 = span_grid(s1_range, s2_range, coarse_step)
+    designs, valid = evaluate(s1, s2)
+    evaluated = len(designs)
+
+    if step < coarse_step:
+        # Refine around the best coarse layouts only
+        seeds = designs.iloc[_rank(designs, valid, objective, min_coverage)[:refine_top]]
+        fine = [span_grid((max(a - coarse_step, s1_range[0]), min(a + coarse_step, s1_range[1])),
+                          (max(b - coarse_step, s2_range[0]), min(b + coarse_step, s2_range[1])), step)
+                for a, b in zip(seeds["s1"], seeds["s2"])]
+        if fine:
+            pairs = np.unique(np.column_stack([np.concatenate([f[0] for f in fine]), np.concatenate([f[1] for f in fine])]), axis=0)
+            fine_designs, fine_valid = evaluate(pairs[:, 0], pairs[:, 1])
+            evaluated += len(fine_designs)
+            designs = pd.concat([designs, fine_designs], ignore_index=True)
+            valid = np.concatenate([valid, fine_valid])
+            unique = ~designs.duplicated(["s1", "s2"]).to_numpy()
+            designs, valid = designs[unique].reset_index(drop=True), valid[unique]
+
+    # Confirm the best layouts with the scalar pipeline (the reference results);
+    # layouts it rejects are skipped in favour of the next best
+    rows = []
+    for index in _rank(designs, valid, objective, min_coverage):
+        row = designs.iloc[index]
+        length, width = grid_footprint(length_input, width_input, row["s1"], row["s2"])
+        try:
+            result = run_pipeline(selected_column, selected_beam, selected_slab, row["s1"], row["s2"], live_load, length, width, f2f)
+        except Exception:
+            continue
+        rows.append({**row[CANDIDATE_COLUMNS].to_dict(), "result": result})
+        if len(rows) == top_k:
+            break
+
+    return pd.DataFrame(rows, columns=CANDIDATE_COLUMNS + ["result"]), evaluated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search beam spans s1/s2 for the layouts minimising one DfMA output.")
+    add_scenario_arguments(parser, spans=False)
+    parser.add_argument("--objective", choices=OBJECTIVES, default="total_mandays_crane")
+    parser.add_argument("--top", type=int, default=5, help="Layouts to report (default: 5)")
+    parser.add_argument("--step", type=float, default=1.0, help="Span resolution in metres (default: 1)")
+    parser.add_argument("--min-coverage", type=float, default=DEFAULT_MIN_COVERAGE,
+                        help=f"Smallest footprint fraction kept after snapping (default: {DEFAULT_MIN_COVERAGE})")
+    args = parser.parse_args(argv)
+
+    best, evaluated = optimize_spans(args.column, args.beam, args.slab, args.live_load, args.length, args.width, args.f2f,
+                                     objective=args.objective, top_k=args.top, step=args.step, min_coverage=args.min_coverage)
+    print(f"{evaluated} layouts evaluated")
+    print(best[CANDIDATE_COLUMNS].to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
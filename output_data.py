@@ -1,7 +1,264 @@
 import math
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+import numpy as np
 import pandas as pd
-
-def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column, selected_beam, selected_slab, length, width, b_s1_mm, d_s1_mm,b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm,slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm, f2f):
+from file_cache import load_cached
+from geometry import count_elements, element_counts
+
+
+@dataclass(frozen=True, slots=True)
+class ProductivityRates:
+    """
+    Immutable manhour rate table compiled from productivity_list.csv.
+
+    The rates used by calculate_layout_outputs are plain attributes; every
+    category in the file (including those not used by the model yet) is
+    available read-only through all_rates.
+    """
+    vertical_nonrc_pc: float
+    vertical_beamfw_pc: float
+    casting_pump_m3: float
+    loosebar_ton: float
+    mesh_ton: float
+    scaffold_m3: float
+    posttension_pc: float
+    all_rates: MappingProxyType = field(default_factory=lambda: MappingProxyType({}), repr=False, compare=False)
+
+    @classmethod
+    def from_mapping(cls, rates):
+        """
+        Build the table from a {category: manhour} mapping.
+        """
+        rates = {category: float(manhour) for category, manhour in rates.items()}
+        return cls(
+            vertical_nonrc_pc=rates["vertical_nonrc_pc"],
+            vertical_beamfw_pc=rates["vertical_beamfw_pc"],
+            casting_pump_m3=rates["casting_pump_m3"],
+            loosebar_ton=rates["loosebar_ton"],
+            mesh_ton=rates["mesh_ton"],
+            scaffold_m3=rates["scaffold_m3"],
+            posttension_pc=rates["posttension_pc"],
+            all_rates=MappingProxyType(rates),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RebarRatios:
+    """
+    Rebar content of each element as a percentage of its concrete volume
+    (weighed at 7.85 t/m³).
+
+    Like ProductivityRates, every attribute may also be a NumPy array for
+    calculate_layout_outputs_batch.
+    """
+    cis_beam: float = 3
+    pt_beam: float = 4
+    column: float = 2
+    cis_slab: float = 1.5
+    pt_slab: float = 4
+    hcs_topping: float = 1.5
+
+
+def _load_productivity_rates(path):
+    df = pd.read_csv(path)
+    return ProductivityRates.from_mapping(dict(zip(df['category'], df['manhour'])))
+
+
+def get_productivity_rates(file_name="productivity_list.csv"):
+    """
+    Return the shared ProductivityRates, reloading it only when the CSV file changes.
+    """
+    return load_cached(file_name, _load_productivity_rates)
+
+
+# Tower crane time per hoist (40 minutes), used for the floor cycle
+HOIST_HOURS = 0.6
+
+
+@dataclass(slots=True)
+class LayoutOutputs:
+    """
+    Named outputs of calculate_layout_outputs for one layout.
+
+    Values are unrounded; the design_output, equipment_output, utility_output
+    and manpower_output properties give the rounded figures shown in the app.
+    """
+    no_volumetric_pc_com: float
+    no_vertical_pc_com: float
+    no_propped_slabs: float
+    no_unpropped_slabs: float
+    formwork_area_slabs: float
+    formwork_area_beams: float
+    no_column_formworks: float
+    weight_loose_rebar: float
+    weight_slab_rebar: float
+    cis_volume: float
+    no_tower_cranes: float
+    no_concrete_pumps: float
+    no_construction_hoists: float
+    no_passenger_material_hoists: float
+    no_gondolas: float
+    no_mewps: float
+    hoist_count_passenger_material: float
+    hoist_count_tower_crane: float
+    no_concrete_truck_deliveries: float
+    no_trailer_deliveries: float
+    beam_manhours: float
+    slab_manhours: float
+    column_manhours: float
+    casting_manhours: float
+    total_mandays_crane: float
+    total_productivity_crane: float
+    slab_cis_volume: float
+    beam_cis_volume: float
+    column_cis_volume: float
+    weight_beam_rebar: float
+    weight_column_rebar: float
+    beam_hoist_count_tower_crane: float
+    slab_hoist_count_tower_crane: float
+    column_hoist_count_tower_crane: float
+
+    @property
+    def floor_cycle_days(self):
+        return round(1.3*HOIST_HOURS*self.hoist_count_tower_crane/self.no_tower_cranes/8,2) #1.3 weather, /8 for manhours
+
+    @property
+    def unique_headcount(self):
+        return round(self.total_mandays_crane/(1.3*self.hoist_count_tower_crane*0.8/self.no_tower_cranes/8))
+
+    @property
+    def design_output(self):
+        return [round(getattr(self, name)) for name, _ in DESIGN_OUTPUTS]
+
+    @property
+    def equipment_output(self):
+        return [round(getattr(self, name)) for name, _ in EQUIPMENT_OUTPUTS]
+
+    @property
+    def utility_output(self):
+        return [round(getattr(self, name)) for name, _ in UTILITY_OUTPUTS]
+
+    @property
+    def manpower_output(self):
+        return [round(self.total_mandays_crane), self.floor_cycle_days, self.unique_headcount]
+
+    @property
+    def misc_output(self):
+        return [getattr(self, name) for name in MISC_OUTPUT_FIELDS]
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in LAYOUT_OUTPUT_FIELDS}
+
+
+LAYOUT_OUTPUT_FIELDS = tuple(f.name for f in fields(LayoutOutputs))
+
+# (field, label) pairs for each output table in the app
+DESIGN_OUTPUTS = (
+    ("no_volumetric_pc_com", "Number of volumetric precast component(s)"),
+    ("no_vertical_pc_com", "Number of vertical precast component(s)"),
+    ("no_propped_slabs", "Number of propped horizontal component(s)"),
+    ("no_unpropped_slabs", "Number of unpropped horizontal component(s)"),
+    ("formwork_area_slabs", "Formwork area for slab(s)"),
+    ("formwork_area_beams", "Formwork area for beam(s)"),
+    ("no_column_formworks", "Number of column formwork(s)"),
+    ("weight_loose_rebar", "Weight of loose rebar (tonnes)"),
+    ("weight_slab_rebar", "Weight of slab rebar (tonnes)"),
+    ("cis_volume", "CIS Volume(m3)"),
+)
+
+EQUIPMENT_OUTPUTS = (
+    ("no_tower_cranes", "Number of tower crane(s)"),
+    ("no_concrete_pumps", "Number of concrete pump(s)"),
+    ("no_construction_hoists", "Number of construction hoist(s)"),
+    ("no_passenger_material_hoists", "Number of passenger/material hoist(s)"),
+    ("no_gondolas", "Number of Gondola(s)"),
+    ("no_mewps", "Number of MEWP(s)"),
+)
+
+UTILITY_OUTPUTS = (
+    ("hoist_count_passenger_material", "Hoist Count passenger/material hoist"),
+    ("hoist_count_tower_crane", "Hoist Count Tower Crane"),
+    ("no_concrete_truck_deliveries", "Number of concrete truck delivery(s)"),
+    ("no_trailer_deliveries", "Number of trailer delivery(s)"),
+)
+
+MANPOWER_OUTPUTS = (
+    ("total_mandays_crane", "Expected Mandays (Structure only)"),
+    ("floor_cycle_days", "Floor cycle(days)"),
+    ("unique_headcount", "Unique Headcount"),
+)
+
+MISC_OUTPUTS = DESIGN_OUTPUTS + EQUIPMENT_OUTPUTS + UTILITY_OUTPUTS + (
+    ("beam_manhours", "Beam manhours"),
+    ("slab_manhours", "Slab manhours"),
+    ("column_manhours", "Column manhours"),
+    ("casting_manhours", "Casting manhours"),
+    ("total_mandays_crane", "Total Mandays (Structure only)"),
+    ("total_productivity_crane", "Total Productivity m2/manday (Structure only)"),
+    ("slab_cis_volume", "Slab CIS Volume (m³)"),
+    ("beam_cis_volume", "Beam CIS Volume (m³)"),
+    ("column_cis_volume", "Column CIS Volume (m³)"),
+    ("weight_beam_rebar", "Weight of beam rebar (tonnes)"),
+    ("weight_column_rebar", "Weight of column rebar (tonnes)"),
+    ("weight_slab_rebar", "Weight of slab rebar (tonnes)"),
+    ("weight_loose_rebar", "Weight of loose rebar (tonnes)"),
+    ("beam_hoist_count_tower_crane", "Beam Hoist Count (Tower Crane)"),
+    ("slab_hoist_count_tower_crane", "Slab Hoist Count (Tower Crane)"),
+    ("column_hoist_count_tower_crane", "Column Hoist Count (Tower Crane)"),
+)
+
+# Order of the legacy 36-value misc_output list
+MISC_OUTPUT_FIELDS = tuple(name for name, _ in MISC_OUTPUTS)
+
+# Large sites (beyond the 100 m x 40 m of the regular form): one tower crane per
+# 35 m of length in each row (3 cranes at 100 m, as below), one row per 60 m of
+# width (two 30 m reaches)
+LARGE_SITE_MAX_LENGTH = 100
+LARGE_SITE_MAX_WIDTH = 40
+LARGE_SITE_CRANE_SPACING = 35.0
+LARGE_SITE_CRANE_ROW_SPACING = 60.0
+
+
+def is_large_site(length, width):
+    """
+    Whether a footprint exceeds the regular form limits, so that its tower cranes
+    follow tower_crane_grid. Works on scalars and NumPy arrays alike.
+    """
+    return (np.asarray(length) > LARGE_SITE_MAX_LENGTH) | (np.asarray(width) > LARGE_SITE_MAX_WIDTH)
+
+
+def tower_crane_grid(length, width):
+    """
+    Tower crane arrangement for a large site (see is_large_site).
+
+    Works on scalars and NumPy arrays alike.
+
+    Returns:
+    - cranes_per_row (int or array): Cranes along the building length.
+    - crane_rows (int or array): Rows of cranes across the building width.
+    """
+    cranes_per_row = np.ceil(np.asarray(length, dtype=float) / LARGE_SITE_CRANE_SPACING)
+    crane_rows = np.maximum(np.ceil(np.asarray(width, dtype=float) / LARGE_SITE_CRANE_ROW_SPACING), 1)
+    if cranes_per_row.ndim == 0:
+        return int(cranes_per_row), int(crane_rows)
+    return cranes_per_row, crane_rows
+
+
+def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column, selected_beam, selected_slab, length, width, b_s1_mm, d_s1_mm,b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm,slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm, f2f, rates=None, rebar_ratios=None, elements=None):
+    """
+    Calculate design, equipment, utility and manpower outputs for a layout.
+
+    rates (ProductivityRates) may be passed in to evaluate many scenarios against
+    one rate table; by default the shared table from productivity_list.csv is used.
+    rebar_ratios (RebarRatios) overrides the default rebar percentages.
+
+    Column, beam and panel counts come from geometry.element_counts, or are
+    counted from elements (an array from geometry.layout_elements) when given.
+
+    Returns:
+    - outputs (LayoutOutputs): Every quantity as a named field.
+    """
     building_height = f2f
     
 
@@ -43,22 +300,28 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
     slab_hoist_count_tower_crane = 0
     column_hoist_count_tower_crane = 0
 
-    file_name = "productivity_list.csv"
-    df = pd.read_csv(file_name)
-    
+    if rates is None:
+        rates = get_productivity_rates()
+    if rebar_ratios is None:
+        rebar_ratios = RebarRatios()
+
     # Export manhour values for each category
-    manhour_vertical_nonrc_pc = df.loc[df['category'] == "vertical_nonrc_pc", 'manhour'].iloc[0]
-    manhour_vertical_beamfw_pc = df.loc[df['category'] == "vertical_beamfw_pc", 'manhour'].iloc[0]
-    manhour_casting_pump_m3 = df.loc[df['category'] == "casting_pump_m3", 'manhour'].iloc[0]
-    manhour_loosebar_ton = df.loc[df['category'] == "loosebar_ton", 'manhour'].iloc[0]
-    manhour_mesh_ton = df.loc[df['category'] == "mesh_ton", 'manhour'].iloc[0]
-    manhour_scaffold_m3 = df.loc[df['category'] == "scaffold_m3", 'manhour'].iloc[0]
-    manhour_posttension_pc = df.loc[df['category'] == "posttension_pc", 'manhour'].iloc[0]
+    manhour_vertical_nonrc_pc = rates.vertical_nonrc_pc
+    manhour_vertical_beamfw_pc = rates.vertical_beamfw_pc
+    manhour_casting_pump_m3 = rates.casting_pump_m3
+    manhour_loosebar_ton = rates.loosebar_ton
+    manhour_mesh_ton = rates.mesh_ton
+    manhour_scaffold_m3 = rates.scaffold_m3
+    manhour_posttension_pc = rates.posttension_pc
     
-    no_s1 = (length/s1) * ((width/s2) + 1)
-    no_s2 = ((length/s1) + 1) * ((width/s2))
-    no_s3 = (length/s1) * (((width/s2) + 1)-1)
-    no_column = ((length/s1) + 1) * ((width/s2) + 1)
+    if elements is None:
+        counts = element_counts(length, width, s1, s2, column_size_mm, selected_beam, selected_slab)
+    else:
+        counts = count_elements(elements)
+    no_s1 = float(counts["beam_s1"])
+    no_s2 = float(counts["beam_s2"])
+    no_s3 = float(counts["beam_s3"])
+    no_column = float(counts["column"])
     
     b_s1_m = b_s1_mm / 1000
     d_s1_m = d_s1_mm / 1000
@@ -70,18 +333,21 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
     column_size_m = column_size_mm
     
     # assign values to equipment data
-    if length <= 30:
+    if is_large_site(length, width):
+        cranes_per_row, crane_rows = tower_crane_grid(length, width)
+        no_tower_cranes = cranes_per_row * crane_rows
+    elif length <= 30:
         no_tower_cranes = 1
     elif 30 < length <= 70:
         no_tower_cranes = 2
-    elif 70 < length <= 100:
+    else:
         no_tower_cranes = 3
     
 
     
     if (selected_beam == "CIS Beam"):
         formwork_area_beams = (no_s1 * s1 * (b_s1_m + 1)) + (no_s2 * s2 * (b_s2_m + 1))
-        beam_rebar_percentage = 3
+        beam_rebar_percentage = rebar_ratios.cis_beam
         weight_beam_rebar = math.ceil(((no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2)) * 7.85 * beam_rebar_percentage/100) #7.85 density rebar
         beam_cis_volume = math.ceil((no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2))
 
@@ -91,7 +357,7 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
         
     if (selected_beam == "PT Beam"):
         formwork_area_beams = (no_s1 * s1 * (b_s1_m + 1)) + (no_s2 * s2 * (b_s2_m + 1))
-        beam_rebar_percentage = 4
+        beam_rebar_percentage = rebar_ratios.pt_beam
         weight_beam_rebar = math.ceil(((no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2)) * 7.85 * beam_rebar_percentage/100) #7.85 density rebar
         beam_cis_volume = math.ceil((no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2))
         total_no_pt_tendon = int(length / s1 + 1 + width / s2 + 1)
@@ -104,7 +370,7 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
     if (selected_column == "CIS Column"):
         no_column_formworks = no_column
         column_cis_volume = math.ceil((no_column * column_size_m * column_size_m * building_height))
-        column_rebar_percentage = 2
+        column_rebar_percentage = rebar_ratios.column
         weight_column_rebar = math.ceil((no_column * column_size_m * column_size_m * building_height) * 7.85 * column_rebar_percentage/100) #7.85 density rebar
         
         column_manhours = math.ceil(no_column * manhour_vertical_nonrc_pc + weight_column_rebar * manhour_loosebar_ton + column_cis_volume)
@@ -114,7 +380,7 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
     if (selected_column == "PC Column"):
         no_vertical_pc_com = no_column
         column_cis_volume = math.ceil((no_column * column_size_m * column_size_m * building_height))
-        column_rebar_percentage = 2
+        column_rebar_percentage = rebar_ratios.column
         weight_column_rebar = math.ceil((no_column * column_size_m * column_size_m * building_height) * 7.85 * column_rebar_percentage/100) #7.85 density rebar
         
         column_manhours = math.ceil(no_column * manhour_vertical_nonrc_pc)
@@ -123,7 +389,7 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
     
     if (selected_slab == "CIS Slab"):
         formwork_area_slabs = length * width - (formwork_area_beams / 2)
-        slab_rebar_percentage = 1.5
+        slab_rebar_percentage = rebar_ratios.cis_slab
         weight_slab_rebar = math.ceil((formwork_area_slabs * slab_thickness_m) * 7.85 * slab_rebar_percentage/100)
         slab_cis_volume = formwork_area_slabs * slab_thickness_m
         
@@ -133,7 +399,7 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
         
     if (selected_slab == "PT Flat Slab"):
         formwork_area_slabs = length * width
-        slab_rebar_percentage = 4
+        slab_rebar_percentage = rebar_ratios.pt_slab
         weight_slab_rebar = math.ceil((formwork_area_slabs * slab_thickness_m) * 7.85 * slab_rebar_percentage/100)
         slab_cis_volume = formwork_area_slabs * slab_thickness_m
         
@@ -154,21 +420,12 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
     if (selected_slab == "1.2HC Slab"):
         topping_area_slabs = length * width - (formwork_area_beams / 2)
         formwork_area_slabs = 0
-        slab_rebar_percentage = 1.5
+        slab_rebar_percentage = rebar_ratios.hcs_topping
         weight_slab_rebar = math.ceil((topping_area_slabs * slab_thickness_m) * 7.85 * slab_rebar_percentage/100)
         slab_cis_volume = topping_area_slabs * slab_thickness_m
         
-        # Calculate the number of x positions
-        N_x = int(length / s1)
-
-        # Calculate the number of y positions
-        N_y = int(width/ s2)
-
-        # Calculate the number of stacked rectangles per position
-        N_stacked = int((s2 -column_size_mm) / 1.2)
-
-        # Calculate the total number of 1.2HCS
-        no_unpropped_slabs = int(N_x * N_y * N_stacked)
+        # Panels stacked in every bay, as laid out by geometry
+        no_unpropped_slabs = int(counts["hcs_panel"])
  
         slab_manhours = math.ceil(weight_slab_rebar * manhour_mesh_ton + no_unpropped_slabs * manhour_vertical_nonrc_pc) #prepare topping + hoisting
     
@@ -177,21 +434,12 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
     if (selected_slab == "2.4HC Slab"):
         topping_area_slabs = length * width - (formwork_area_beams / 2)
         formwork_area_slabs = 0
-        slab_rebar_percentage = 1.5
+        slab_rebar_percentage = rebar_ratios.hcs_topping
         weight_slab_rebar = math.ceil((topping_area_slabs * slab_thickness_m) * 7.85 * slab_rebar_percentage/100)
         slab_cis_volume = topping_area_slabs * slab_thickness_m
         
-        # Calculate the number of x positions
-        N_x = int((length + s1 - (s1 * 1.5)) / s1)
-
-        # Calculate the number of y positions
-        N_y = int((width + s2 - (s2 + 2 * column_size_mm)) / s2)
-
-        # Calculate the number of stacked rectangles per position
-        N_stacked = math.floor((s2 -column_size_mm) / 2.4)
-
-        # Calculate the total number of 2.4HCS
-        no_unpropped_slabs = int(N_x * N_y * N_stacked)
+        # Panels stacked in every bay, as laid out by geometry
+        no_unpropped_slabs = int(counts["hcs_panel"])
  
         slab_manhours = math.ceil(weight_slab_rebar * manhour_mesh_ton + no_unpropped_slabs * manhour_vertical_nonrc_pc) #prepare topping + hoisting
     
@@ -200,21 +448,12 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
     if (selected_slab == "1.2HCS_S3"):
         topping_area_slabs = length * width - (formwork_area_beams / 2)
         formwork_area_slabs = 0
-        slab_rebar_percentage = 1.5
+        slab_rebar_percentage = rebar_ratios.hcs_topping
         weight_slab_rebar = math.ceil((topping_area_slabs * slab_thickness_m) * 7.85 * slab_rebar_percentage/100)
         slab_cis_volume = topping_area_slabs * slab_thickness_m
         
-        # Calculate the number of x positions
-        N_x = int(length / (s1/2))
-
-        # Calculate the number of y positions
-        N_y = int(width/ s2)
-
-        # Calculate the number of stacked rectangles per position
-        N_stacked = int((s2 -column_size_mm) / 1.2)
-
-        # Calculate the total number of 1.2HCS
-        no_unpropped_slabs = int(N_x * N_y * N_stacked)
+        # Panels stacked in every bay, as laid out by geometry
+        no_unpropped_slabs = int(counts["hcs_panel"])
 
         slab_manhours = math.ceil(weight_slab_rebar * manhour_mesh_ton + no_unpropped_slabs * manhour_vertical_nonrc_pc) #prepare topping + hoisting
 
@@ -223,7 +462,7 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
         
         if (selected_beam == "CIS Beam"):
             formwork_area_beams = (no_s1 * s1 * (b_s1_m + 1)) + (no_s2 * s2 * (b_s2_m + 1)) + (no_s3 * s1 * (b_s3_m + 1))
-            beam_rebar_percentage = 3
+            beam_rebar_percentage = rebar_ratios.cis_beam
             weight_beam_rebar = math.ceil(((no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2) + (no_s3 * b_s3_m * d_s3_m * s1)) * 7.85 * beam_rebar_percentage/100) #7.85 density rebar
             beam_cis_volume = math.ceil((no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2) + (no_s3 * b_s3_m * d_s3_m * s1))
 
@@ -233,7 +472,7 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
             
         if (selected_beam == "PT Beam"):
             formwork_area_beams = (no_s1 * s1 * (b_s1_m + 1)) + (no_s2 * s2 * (b_s2_m + 1)) + (no_s3 * s1 * (b_s3_m + 1))
-            beam_rebar_percentage = 4
+            beam_rebar_percentage = rebar_ratios.pt_beam
             weight_beam_rebar = math.ceil(((no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2) + (no_s3 * b_s3_m * d_s3_m * s1)) * 7.85 * beam_rebar_percentage/100) #7.85 density rebar
             beam_cis_volume = math.ceil((no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2) + (no_s3 * b_s3_m * d_s3_m * s1))
             total_no_pt_tendon = int(length / s1 + 1 + width / s2 + 1)
@@ -245,21 +484,12 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
     if (selected_slab == "2.4HCS_S3"):
         topping_area_slabs = length * width - (formwork_area_beams / 2)
         formwork_area_slabs = 0
-        slab_rebar_percentage = 1.5
+        slab_rebar_percentage = rebar_ratios.hcs_topping
         weight_slab_rebar = math.ceil((topping_area_slabs * slab_thickness_m) * 7.85 * slab_rebar_percentage/100)
         slab_cis_volume = topping_area_slabs * slab_thickness_m
         
-        # Calculate the number of x positions
-        N_x = int(length / (s1/2))
-
-        # Calculate the number of y positions
-        N_y = int(width/ s2)
-
-        # Calculate the number of stacked rectangles per position
-        N_stacked = int((s2 -column_size_mm) / 2.4)
-
-        # Calculate the total number of 1.2HCS
-        no_unpropped_slabs = int(N_x * N_y * N_stacked)
+        # Panels stacked in every bay, as laid out by geometry
+        no_unpropped_slabs = int(counts["hcs_panel"])
 
         slab_manhours = math.ceil(weight_slab_rebar * manhour_mesh_ton + no_unpropped_slabs * manhour_vertical_nonrc_pc) #prepare topping + hoisting
 
@@ -267,7 +497,7 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
         
         if (selected_beam == "CIS Beam"):
             formwork_area_beams = (no_s1 * s1 * (b_s1_m + 1)) + (no_s2 * s2 * (b_s2_m + 1)) + (no_s3 * s1 * (b_s3_m + 1))
-            beam_rebar_percentage = 3
+            beam_rebar_percentage = rebar_ratios.cis_beam
             weight_beam_rebar = math.ceil(((no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2) + (no_s3 * b_s3_m * d_s3_m * s1)) * 7.85 * beam_rebar_percentage/100) #7.85 density rebar
             beam_cis_volume = math.ceil((no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2) + (no_s3 * b_s3_m * d_s3_m * s1))
 
@@ -277,14 +507,14 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
         
         if (selected_beam == "PT Beam"):
             formwork_area_beams = (no_s1 * s1 * (b_s1_m + 1)) + (no_s2 * s2 * (b_s2_m + 1)) + (no_s3 * s1 * (b_s3_m + 1))
-            beam_rebar_percentage = 4
+            beam_rebar_percentage = rebar_ratios.pt_beam
             weight_beam_rebar = math.ceil(((no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2) + (no_s3 * b_s3_m * d_s3_m * s1)) * 7.85 * beam_rebar_percentage/100) #7.85 density rebar
             beam_cis_volume = math.ceil((no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2) + (no_s3 * b_s3_m * d_s3_m * s1))
             total_no_pt_tendon = int(length / s1 + 1 + width / s2 + 1)
                 
-        beam_hoist_count_tower_crane = math.ceil(weight_beam_rebar/4 + formwork_area_beams /18) 
-        
-        beam_manhours = math.ceil(total_no_pt_tendon * manhour_posttension_pc + weight_beam_rebar * manhour_loosebar_ton + formwork_area_beams /8 * manhour_vertical_beamfw_pc + formwork_area_beams * building_height * 0.5 * manhour_scaffold_m3) #horizontal formwork 16m2 a pc
+            beam_hoist_count_tower_crane = math.ceil(weight_beam_rebar/4 + formwork_area_beams /18) 
+            
+            beam_manhours = math.ceil(total_no_pt_tendon * manhour_posttension_pc + weight_beam_rebar * manhour_loosebar_ton + formwork_area_beams /8 * manhour_vertical_beamfw_pc + formwork_area_beams * building_height * 0.5 * manhour_scaffold_m3) #horizontal formwork 16m2 a pc
 
         
     
@@ -304,84 +534,291 @@ def calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column,
     total_mandays_crane = ((beam_manhours + slab_manhours + column_manhours + casting_manhours)*1.3 +240)/ 8 #weather 1.1 manday 8hr safety 1.1 staircase 240 ramp 1400
     total_productivity_crane = ( (length * width) +600) / total_mandays_crane # ramp 600m2
     
-    # Design Outputs
-    design_output = [
-    round(no_volumetric_pc_com),
-    round(no_vertical_pc_com),
-    round(no_propped_slabs),
-    round(no_unpropped_slabs),
-    round(formwork_area_slabs),
-    round(formwork_area_beams),
-    round(no_column_formworks),
-    round(weight_loose_rebar),
-    round(weight_slab_rebar),
-    round(cis_volume)
-    ]
-
-    # Equipment Outputs
-    equipment_output = [
-    round(no_tower_cranes),
-    round(no_concrete_pumps),
-    round(no_construction_hoists),
-    round(no_passenger_material_hoists),
-    round(no_gondolas),
-    round(no_mewps)
-    ]
-
-    # Utility Outputs
-    utility_output = [
-    round(hoist_count_passenger_material),
-    round(hoist_count_tower_crane),
-    round(no_concrete_truck_deliveries),
-    round(no_trailer_deliveries)
-    ]
-
-    # Manpower Outputs
-    manpower_output = [
-    round(total_mandays_crane),
-    round(1.3*0.6*hoist_count_tower_crane/no_tower_cranes/8,2), #1.3 weather, /8 for manhours, 0.6 meaning 40minutes a hoist
-    round(total_mandays_crane/(1.3*hoist_count_tower_crane*0.8/no_tower_cranes/8))
-    ]
-    
-    # All Outputs for verification
-    misc_output = [
-        no_volumetric_pc_com,
-        no_vertical_pc_com,
-        no_propped_slabs,
-        no_unpropped_slabs,
-        formwork_area_slabs,
-        formwork_area_beams,
-        no_column_formworks,
-        weight_loose_rebar,
-        weight_slab_rebar,
-        cis_volume,
-        no_tower_cranes,
-        no_concrete_pumps,
-        no_construction_hoists,
-        no_passenger_material_hoists,
-        no_gondolas,
-        no_mewps,
-        hoist_count_passenger_material,
-        hoist_count_tower_crane,
-        no_concrete_truck_deliveries,
-        no_trailer_deliveries,
-        beam_manhours,
-        slab_manhours,
-        column_manhours,
-        casting_manhours,
-        total_mandays_crane,
-        total_productivity_crane,
-        slab_cis_volume,
-        beam_cis_volume,
-        column_cis_volume,
-        weight_beam_rebar,
-        weight_column_rebar,
-        weight_slab_rebar,
-        weight_loose_rebar,
-        beam_hoist_count_tower_crane,
-        slab_hoist_count_tower_crane,
-        column_hoist_count_tower_crane
-    ]
-
-
-    return misc_output, design_output,equipment_output,utility_output,manpower_output, beam_manhours, column_manhours, slab_manhours, casting_manhours
+    return LayoutOutputs(
+        no_volumetric_pc_com=no_volumetric_pc_com,
+        no_vertical_pc_com=no_vertical_pc_com,
+        no_propped_slabs=no_propped_slabs,
+        no_unpropped_slabs=no_unpropped_slabs,
+        formwork_area_slabs=formwork_area_slabs,
+        formwork_area_beams=formwork_area_beams,
+        no_column_formworks=no_column_formworks,
+        weight_loose_rebar=weight_loose_rebar,
+        weight_slab_rebar=weight_slab_rebar,
+        cis_volume=cis_volume,
+        no_tower_cranes=no_tower_cranes,
+        no_concrete_pumps=no_concrete_pumps,
+        no_construction_hoists=no_construction_hoists,
+        no_passenger_material_hoists=no_passenger_material_hoists,
+        no_gondolas=no_gondolas,
+        no_mewps=no_mewps,
+        hoist_count_passenger_material=hoist_count_passenger_material,
+        hoist_count_tower_crane=hoist_count_tower_crane,
+        no_concrete_truck_deliveries=no_concrete_truck_deliveries,
+        no_trailer_deliveries=no_trailer_deliveries,
+        beam_manhours=beam_manhours,
+        slab_manhours=slab_manhours,
+        column_manhours=column_manhours,
+        casting_manhours=casting_manhours,
+        total_mandays_crane=total_mandays_crane,
+        total_productivity_crane=total_productivity_crane,
+        slab_cis_volume=slab_cis_volume,
+        beam_cis_volume=beam_cis_volume,
+        column_cis_volume=column_cis_volume,
+        weight_beam_rebar=weight_beam_rebar,
+        weight_column_rebar=weight_column_rebar,
+        beam_hoist_count_tower_crane=beam_hoist_count_tower_crane,
+        slab_hoist_count_tower_crane=slab_hoist_count_tower_crane,
+        column_hoist_count_tower_crane=column_hoist_count_tower_crane,
+    )
+
+
+class LayoutOutputsBatch:
+    """
+    Column-oriented LayoutOutputs for a batch of layouts.
+
+    Every field of LayoutOutputs is a contiguous NumPy array, so the batch can be
+    handed to pandas or Arrow without copying the data.
+    """
+    __slots__ = LAYOUT_OUTPUT_FIELDS
+
+    def __init__(self, **columns):
+        for name in LAYOUT_OUTPUT_FIELDS:
+            setattr(self, name, np.ascontiguousarray(columns[name], dtype=float))
+
+    def __len__(self):
+        return len(self.cis_volume)
+
+    def __getitem__(self, index):
+        return LayoutOutputs(**{name: getattr(self, name)[index].item() for name in LAYOUT_OUTPUT_FIELDS})
+
+    @property
+    def floor_cycle_days(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.round(1.3*HOIST_HOURS*self.hoist_count_tower_crane/self.no_tower_cranes/8, 2)
+
+    @property
+    def unique_headcount(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.round(self.total_mandays_crane/(1.3*self.hoist_count_tower_crane*0.8/self.no_tower_cranes/8))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in LAYOUT_OUTPUT_FIELDS}
+
+    def to_dataframe(self):
+        """
+        DataFrame view of the batch (one row per layout, no data copied).
+        """
+        return pd.DataFrame(self.to_dict(), copy=False)
+
+    def to_arrow(self):
+        """
+        pyarrow Table of the batch; numeric columns are wrapped without copying.
+        """
+        import pyarrow as pa
+
+        return pa.table({name: pa.array(getattr(self, name)) for name in LAYOUT_OUTPUT_FIELDS})
+
+
+def calculate_layout_outputs_batch(s1, s2, live_load, column_size_mm, selected_column, selected_beam, selected_slab, length, width, b_s1_mm, d_s1_mm,b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm,slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm, f2f, rates=None, rebar_ratios=None):
+    """
+    Vectorised version of calculate_layout_outputs.
+
+    All numeric arguments may be NumPy arrays (or scalars) and are broadcast
+    against each other, as may the attributes of rates. selected_column and
+    selected_beam apply to the whole batch; selected_slab may be one slab type or
+    an array of them (e.g. from hcs_selected_slab_check_batch). The attributes of
+    rebar_ratios (RebarRatios) may be arrays too. Element by element the results
+    equal calculate_layout_outputs.
+
+    Returns:
+    - outputs (LayoutOutputsBatch): One array per LayoutOutputs field.
+    """
+    if rates is None:
+        rates = get_productivity_rates()
+    if rebar_ratios is None:
+        rebar_ratios = RebarRatios()
+
+    (s1, s2, column_size_mm, length, width, b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm, slab_thickness_mm, f2f,
+     manhour_vertical_nonrc_pc, manhour_vertical_beamfw_pc, manhour_casting_pump_m3, manhour_loosebar_ton,
+     manhour_mesh_ton, manhour_scaffold_m3, manhour_posttension_pc,
+     rebar_cis_beam, rebar_pt_beam, rebar_column, rebar_cis_slab, rebar_pt_slab, rebar_hcs_topping) = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (
+        s1, s2, column_size_mm, length, width, b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm, slab_thickness_mm, f2f,
+        rates.vertical_nonrc_pc, rates.vertical_beamfw_pc, rates.casting_pump_m3, rates.loosebar_ton,
+        rates.mesh_ton, rates.scaffold_m3, rates.posttension_pc,
+        rebar_ratios.cis_beam, rebar_ratios.pt_beam, rebar_ratios.column, rebar_ratios.cis_slab, rebar_ratios.pt_slab, rebar_ratios.hcs_topping)))
+    shape = s1.shape
+    selected_slab = np.broadcast_to(np.asarray(selected_slab, dtype=object), shape)
+    building_height = f2f
+    zeros = np.zeros(shape)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        counts = element_counts(length, width, s1, s2, column_size_mm, selected_beam, selected_slab)
+    no_s1 = counts["beam_s1"]
+    no_s2 = counts["beam_s2"]
+    no_s3 = counts["beam_s3"]
+    no_column = counts["column"]
+
+    b_s1_m = b_s1_mm / 1000
+    d_s1_m = d_s1_mm / 1000
+    b_s2_m = b_s2_mm / 1000
+    d_s2_m = d_s2_mm / 1000
+    b_s3_m = b_s3_mm / 1000
+    d_s3_m = d_s3_mm / 1000
+    slab_thickness_m = slab_thickness_mm/1000
+    column_size_m = column_size_mm
+
+    # assign values to equipment data
+    cranes_per_row, crane_rows = tower_crane_grid(length, width)
+    no_tower_cranes = np.select([is_large_site(length, width), length <= 30, length <= 70], [cranes_per_row * crane_rows, 1, 2], default=3).astype(float)
+
+    def beam_quantities(with_s3):
+        # formwork area, rebar weight, CIS volume, manhours and hoists of the selected beam
+        formwork_area_beams = (no_s1 * s1 * (b_s1_m + 1)) + (no_s2 * s2 * (b_s2_m + 1))
+        beam_volume = (no_s1 * b_s1_m * d_s1_m * s1) + (no_s2 * b_s2_m * d_s2_m * s2)
+        if with_s3:
+            formwork_area_beams = formwork_area_beams + (no_s3 * s1 * (b_s3_m + 1))
+            beam_volume = beam_volume + (no_s3 * b_s3_m * d_s3_m * s1)
+
+        if selected_beam == "CIS Beam":
+            weight_beam_rebar = np.ceil(beam_volume * 7.85 * rebar_cis_beam/100)
+            beam_manhours = np.ceil(weight_beam_rebar * manhour_loosebar_ton + formwork_area_beams /8 * manhour_vertical_beamfw_pc + formwork_area_beams * building_height * 0.5 * manhour_scaffold_m3)
+            beam_hoist_count_tower_crane = np.ceil(weight_beam_rebar/4 + formwork_area_beams /8)
+        else:
+            weight_beam_rebar = np.ceil(beam_volume * 7.85 * rebar_pt_beam/100)
+            total_no_pt_tendon = np.trunc(length / s1 + 1 + width / s2 + 1)
+            beam_hoist_count_tower_crane = np.ceil(weight_beam_rebar/4 + formwork_area_beams /18)
+            beam_manhours = np.ceil(total_no_pt_tendon * manhour_posttension_pc + weight_beam_rebar * manhour_loosebar_ton + formwork_area_beams /8 * manhour_vertical_beamfw_pc + formwork_area_beams * building_height * 0.5 * manhour_scaffold_m3)
+
+        return formwork_area_beams, weight_beam_rebar, np.ceil(beam_volume), beam_manhours, beam_hoist_count_tower_crane
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if selected_beam in ["CIS Beam", "PT Beam"]:
+            formwork_area_beams, weight_beam_rebar, beam_cis_volume, beam_manhours, beam_hoist_count_tower_crane = beam_quantities(False)
+        elif selected_beam == "PT Flat Slab":
+            formwork_area_beams = weight_beam_rebar = beam_cis_volume = beam_manhours = beam_hoist_count_tower_crane = zeros
+        else:
+            raise ValueError(f"Unsupported beam type: {selected_beam}")
+
+        column_cis_volume = np.ceil((no_column * column_size_m * column_size_m * building_height))
+        weight_column_rebar = np.ceil((no_column * column_size_m * column_size_m * building_height) * 7.85 * rebar_column/100)
+        if selected_column == "CIS Column":
+            no_column_formworks = no_column
+            no_vertical_pc_com = zeros
+            column_manhours = np.ceil(no_column * manhour_vertical_nonrc_pc + weight_column_rebar * manhour_loosebar_ton + column_cis_volume)
+            column_hoist_count_tower_crane = np.ceil(no_column + weight_column_rebar/6)
+        elif selected_column == "PC Column":
+            no_column_formworks = zeros
+            no_vertical_pc_com = no_column
+            column_manhours = np.ceil(no_column * manhour_vertical_nonrc_pc)
+            column_hoist_count_tower_crane = np.ceil(no_column)
+        else:
+            raise ValueError(f"Unsupported column type: {selected_column}")
+
+        # Slab quantities, evaluated per slab type present in the batch
+        formwork_area_slabs = zeros.copy()
+        weight_slab_rebar = zeros.copy()
+        slab_cis_volume = zeros.copy()
+        slab_manhours = zeros.copy()
+        slab_hoist_count_tower_crane = zeros.copy()
+        no_unpropped_slabs = zeros.copy()
+
+        for slab_type in np.unique(selected_slab):
+            mask = selected_slab == slab_type
+            unpropped = zeros
+
+            if slab_type == "CIS Slab":
+                formwork = length * width - (formwork_area_beams / 2)
+                rebar = np.ceil((formwork * slab_thickness_m) * 7.85 * rebar_cis_slab/100)
+                volume = formwork * slab_thickness_m
+                manhours = np.ceil(rebar * manhour_mesh_ton + formwork / 16 * manhour_vertical_beamfw_pc + formwork * building_height * 0.5 * manhour_scaffold_m3)
+                hoists = np.ceil(rebar /4 + formwork/16)
+
+            elif slab_type == "PT Flat Slab":
+                formwork = length * width
+                rebar = np.ceil((formwork * slab_thickness_m) * 7.85 * rebar_pt_slab/100)
+                volume = formwork * slab_thickness_m
+                tendon_spacing = 6 * slab_thickness_m
+                total_no_pt_tendon = np.ceil(length / tendon_spacing) + np.ceil(width / tendon_spacing)
+                manhours = np.ceil(total_no_pt_tendon * manhour_posttension_pc + rebar * manhour_mesh_ton + formwork * building_height * 0.5 * manhour_scaffold_m3)
+                hoists = np.ceil(rebar /4 + formwork/16)
+
+            elif slab_type in ["1.2HC Slab", "2.4HC Slab", "1.2HCS_S3", "2.4HCS_S3"]:
+                topping_area_slabs = length * width - (formwork_area_beams / 2)
+                formwork = zeros
+                rebar = np.ceil((topping_area_slabs * slab_thickness_m) * 7.85 * rebar_hcs_topping/100)
+                volume = topping_area_slabs * slab_thickness_m
+
+                unpropped = counts["hcs_panel"]
+                manhours = np.ceil(rebar * manhour_mesh_ton + unpropped * manhour_vertical_nonrc_pc)
+                hoists = np.ceil(unpropped + rebar/4)
+
+                # Secondary beams replace the beam quantities (after the topping used the primary ones)
+                if slab_type in ["1.2HCS_S3", "2.4HCS_S3"] and selected_beam in ["CIS Beam", "PT Beam"]:
+                    s3_beams = beam_quantities(True)
+                    formwork_area_beams = np.where(mask, s3_beams[0], formwork_area_beams)
+                    weight_beam_rebar = np.where(mask, s3_beams[1], weight_beam_rebar)
+                    beam_cis_volume = np.where(mask, s3_beams[2], beam_cis_volume)
+                    beam_manhours = np.where(mask, s3_beams[3], beam_manhours)
+                    beam_hoist_count_tower_crane = np.where(mask, s3_beams[4], beam_hoist_count_tower_crane)
+
+            else:
+                raise ValueError(f"Unsupported slab type: {slab_type}")
+
+            formwork_area_slabs = np.where(mask, formwork, formwork_area_slabs)
+            weight_slab_rebar = np.where(mask, rebar, weight_slab_rebar)
+            slab_cis_volume = np.where(mask, volume, slab_cis_volume)
+            slab_manhours = np.where(mask, manhours, slab_manhours)
+            slab_hoist_count_tower_crane = np.where(mask, hoists, slab_hoist_count_tower_crane)
+            no_unpropped_slabs = np.where(mask, unpropped, no_unpropped_slabs)
+
+        no_propped_slabs = zeros + 8
+        weight_loose_rebar = weight_column_rebar + weight_beam_rebar
+        cis_volume = beam_cis_volume + column_cis_volume + slab_cis_volume
+
+        casting_manhours = np.ceil(cis_volume * manhour_casting_pump_m3)
+
+        # assign values to utility data
+        hoist_count_tower_crane = column_hoist_count_tower_crane + slab_hoist_count_tower_crane + beam_hoist_count_tower_crane
+        no_concrete_truck_deliveries = np.ceil(cis_volume / 8.5)
+        no_trailer_deliveries = np.ceil((no_vertical_pc_com + no_propped_slabs + no_unpropped_slabs)/5 + (weight_beam_rebar + weight_slab_rebar + weight_column_rebar)/15)
+
+        # assign values to manpower data
+        total_mandays_crane = ((beam_manhours + slab_manhours + column_manhours + casting_manhours)*1.3 +240)/ 8
+        total_productivity_crane = ( (length * width) +600) / total_mandays_crane
+
+    return LayoutOutputsBatch(
+        no_volumetric_pc_com=zeros,
+        no_vertical_pc_com=no_vertical_pc_com,
+        no_propped_slabs=no_propped_slabs,
+        no_unpropped_slabs=no_unpropped_slabs,
+        formwork_area_slabs=formwork_area_slabs,
+        formwork_area_beams=formwork_area_beams,
+        no_column_formworks=no_column_formworks,
+        weight_loose_rebar=weight_loose_rebar,
+        weight_slab_rebar=weight_slab_rebar,
+        cis_volume=cis_volume,
+        no_tower_cranes=no_tower_cranes,
+        no_concrete_pumps=zeros + 1,
+        no_construction_hoists=zeros,
+        no_passenger_material_hoists=zeros + 1,
+        no_gondolas=zeros,
+        no_mewps=zeros,
+        hoist_count_passenger_material=zeros,
+        hoist_count_tower_crane=hoist_count_tower_crane,
+        no_concrete_truck_deliveries=no_concrete_truck_deliveries,
+        no_trailer_deliveries=no_trailer_deliveries,
+        beam_manhours=beam_manhours,
+        slab_manhours=slab_manhours,
+        column_manhours=column_manhours,
+        casting_manhours=casting_manhours,
+        total_mandays_crane=total_mandays_crane,
+        total_productivity_crane=total_productivity_crane,
+        slab_cis_volume=slab_cis_volume,
+        beam_cis_volume=beam_cis_volume,
+        column_cis_volume=column_cis_volume,
+        weight_beam_rebar=weight_beam_rebar,
+        weight_column_rebar=weight_column_rebar,
+        beam_hoist_count_tower_crane=beam_hoist_count_tower_crane,
+        slab_hoist_count_tower_crane=slab_hoist_count_tower_crane,
+        column_hoist_count_tower_crane=column_hoist_count_tower_crane,
+    )
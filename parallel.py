@@ -0,0 +1,81 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from output_data import get_productivity_rates
+from slab_rc import get_hcs_catalog
+
+
+def _init_worker(hcs_file, productivity_file):
+    # Parse the catalogues once per worker process; every task reuses them
+    get_hcs_catalog(hcs_file)
+    get_productivity_rates(productivity_file)
+
+
+def default_workers():
+    """
+    Number of worker processes used when none is given (one per available CPU).
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def create_executor(workers=None, hcs_file="hcs_data.csv", productivity_file="productivity_list.csv"):
+    """
+    Create a process pool whose workers pre-load the HCS and productivity catalogues.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers or default_workers(),
+        initializer=_init_worker,
+        initargs=(os.path.abspath(hcs_file), os.path.abspath(productivity_file)),
+    )
+
+
+def imap_ordered(executor, func, items, max_pending):
+    """
+    Apply func to every item on the executor and yield the results in input order.
+
+    At most max_pending tasks are in flight, so items can be a lazy stream of
+    chunks and memory stays bounded.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def split_frame(frame, chunk_size):
+    """
+    Yield consecutive row slices of a DataFrame with at most chunk_size rows.
+    """
+    for start in range(0, len(frame), chunk_size):
+        yield frame.iloc[start:start + chunk_size]
+
+
+def evaluate_scenarios_parallel(scenarios, workers=None, chunk_size=1000):
+    """
+    Evaluate a scenario DataFrame across a process pool.
+
+    Parameters:
+    - scenarios (DataFrame): One row per scenario, columns as dfma_batch.SCENARIO_COLUMNS.
+    - workers (int): Worker processes (default: one per available CPU).
+    - chunk_size (int): Scenarios per task sent to a worker.
+
+    Returns:
+    - results (DataFrame): As dfma_batch.evaluate_scenarios, in input order.
+    """
+    from dfma_batch import evaluate_scenarios
+
+    workers = workers or default_workers()
+    with create_executor(workers) as executor:
+        results = list(imap_ordered(executor, evaluate_scenarios, split_frame(scenarios, chunk_size), 2 * workers))
+    if not results:
+        return evaluate_scenarios(scenarios)
+    return pd.concat(results, ignore_index=True)
@@ -0,0 +1,212 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from design_options import available_combinations
+from optimize import DEFAULT_MIN_COVERAGE, S1_RANGE, S2_RANGE, evaluate_designs, span_grid
+
+# Layout outputs traded off against each other (all minimised)
+PARETO_OUTPUTS = ("total_mandays_crane", "cis_volume", "hoist_count_tower_crane", "no_trailer_deliveries")
+
+# Designs snap the footprint to different sizes, so they are compared per m²
+# of the footprint they keep (see optimize.PER_M2_OUTPUTS)
+PARETO_OBJECTIVES = tuple(f"{name}_per_m2" for name in PARETO_OUTPUTS)
+
+PARETO_LABELS = {
+    "total_mandays_crane_per_m2": "Expected Mandays (Structure only) per m²",
+    "cis_volume_per_m2": "CIS Volume(m3) per m²",
+    "hoist_count_tower_crane_per_m2": "Hoist Count Tower Crane per m²",
+    "no_trailer_deliveries_per_m2": "Number of trailer delivery(s) per m²",
+}
+
+DESIGN_COLUMNS = ["combination", "column", "beam", "slab", "effective_slab", "s1", "s2", "live_load",
+                  "building_length", "building_width", "coverage"]
+
+# Below these sizes a block of points is compared pairwise with NumPy
+# instead of being split further
+SKYLINE_LEAF_SIZE = 256
+DOMINANCE_LEAF_PAIRS = 1 << 16
+
+
+
+
+def _skyline_2d(points):
+    # points are unique and sorted lexicographically: a point is on the front
+    # when its second objective beats every point before it
+    best_before = np.minimum.accumulate(np.concatenate(([np.inf], points[:-1, 1])))
+    return points[:, 1] < best_before
+
+
+def _weakly_dominated(front, points):
+    # For each row of points, whether some row of front is <= it in every column.
+    # Divide and conquer on the first column: rows are split at the median of
+    # the first column (front rows before points rows on ties). Points in the
+    # lower half can only be dominated by front rows in the lower half; points
+    # in the upper half by front rows in the upper half, or by any front row of
+    # the lower half on the remaining columns alone.
+    dominated = np.zeros(len(points), dtype=bool)
+    if not len(front) or not len(points):
+        return dominated
+    if front.shape[1] == 1:
+        return points[:, 0] >= front[:, 0].min()
+    if front.shape[1] == 2:
+        # Sweep: best second column among front rows up to each first column
+        order = np.argsort(front[:, 0], kind="stable")
+        best_second = np.minimum.accumulate(front[order, 1])
+        j = np.searchsorted(front[order, 0], points[:, 0], side="right")
+        return (j > 0) & (best_second[np.maximum(j - 1, 0)] <= points[:, 1])
+    if len(front) * len(points) <= DOMINANCE_LEAF_PAIRS:
+        return (front[None, :, :] <= points[:, None, :]).all(axis=2).any(axis=1)
+
+    order = np.lexsort((np.r_[np.zeros(len(front)), np.ones(len(points))], np.r_[front[:, 0], points[:, 0]]))
+    lower = np.empty(len(order), dtype=bool)
+    lower[order] = np.arange(len(order)) < len(order) // 2
+    front_lower, points_lower = lower[:len(front)], lower[len(front):]
+
+    dominated[points_lower] = _weakly_dominated(front[front_lower], points[points_lower])
+    upper = np.flatnonzero(~points_lower)
+    dominated[upper] = _weakly_dominated(front[~front_lower], points[upper])
+    upper = upper[~dominated[upper]]
+    dominated[upper] = _weakly_dominated(front[front_lower][:, 1:], points[upper][:, 1:])
+    return dominated
+
+
+def _skyline_kung(points):
+    # Kung's divide and conquer: points are unique and sorted lexicographically,
+    # so no point is dominated by a later one. The front of the first half is
+    # final; a front point of the second half stays on the front unless a front
+    # point of the first half (never worse on the first objective) is no worse
+    # on all the other objectives.
+    if len(points) <= SKYLINE_LEAF_SIZE:
+        earlier = (points[None, :, :] <= points[:, None, :]).all(axis=2)
+        return ~np.tril(earlier, k=-1).any(axis=1)
+    half = len(points) // 2
+    on_front = np.concatenate([_skyline_kung(points[:half]), _skyline_kung(points[half:])])
+    candidates = half + np.flatnonzero(on_front[half:])
+    on_front[candidates] = ~_weakly_dominated(points[:half][on_front[:half]][:, 1:], points[candidates][:, 1:])
+    return on_front
+
+
+def pareto_front(values):
+    """
+    Find the non-dominated rows of a matrix of objectives (all minimised).
+
+    Duplicate rows are collapsed first and the unique rows sorted, which costs
+    O(n log n). Two objectives are then resolved by a single sweep. With d >= 3
+    objectives the front is found by Kung's divide and conquer, whose merge
+    step is itself a divide and conquer over the remaining objectives ending
+    in a sweep over the last two; this costs O(n log^(d-1) n) for n unique
+    rows, whatever the shape of the front.
+
+    Parameters:
+    - values (array-like): One row per design, one column per objective.
+
+    Returns:
+    - mask (ndarray of bool): True for the designs on the Pareto front. Equal
+      designs are either all on the front or all dominated.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 2:
+        raise ValueError("values must be a 2D array (designs x objectives)")
+    if len(values) == 0:
+        return np.zeros(0, dtype=bool)
+
+    # np.unique sorts the rows lexicographically
+    unique, inverse = np.unique(values, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    if unique.shape[1] == 1:
+        return values[:, 0] == unique[0, 0]
+    if unique.shape[1] == 2:
+        return _skyline_2d(unique)[inverse]
+    return _skyline_kung(unique)[inverse]
+
+
+def evaluate_design_space(live_loads, length_input, width_input, f2f, combinations=None, step=1.0,
+                          s1_range=S1_RANGE, s2_range=S2_RANGE, min_coverage=DEFAULT_MIN_COVERAGE, rates=None):
+    """
+    Evaluate every combination over the span grid and the given live loads.
+
+    Parameters:
+    - live_loads (array-like): Live loads (kN/m²) to include.
+    - length_input, width_input (float): Footprint before snapping to whole bays (m).
+    - f2f (float): Floor-to-floor height (m).
+    - combinations (list): Column/beam/slab dicts (default: available_combinations).
+    - step (float): Span resolution (m).
+    - min_coverage (float): Smallest fraction of the footprint that must remain
+      after snapping to whole bays (default 0.9).
+
+    Returns:
+    - designs (DataFrame): One row per valid design (DESIGN_COLUMNS, the
+      sizing results, every LayoutOutputs field and the per m² outputs of
+      optimize.evaluate_designs).
+    """
+    combinations = available_combinations if combinations is None else combinations
+    pair_s1, pair_s2 = span_grid(s1_range, s2_range, step)
+    live_loads = np.asarray(live_loads, dtype=float).ravel()
+    s1 = np.repeat(pair_s1, len(live_loads))
+    s2 = np.repeat(pair_s2, len(live_loads))
+    live_load = np.tile(live_loads, len(pair_s1))
+
+    frames = []
+    for combination in combinations:
+        designs, valid = evaluate_designs(combination["column"], combination["beam"], combination["slab"],
+                                          s1, s2, live_load, length_input, width_input, f2f, rates=rates)
+        designs = designs[valid & (designs["coverage"].to_numpy() >= min_coverage)]
+        designs.insert(0, "combination", f"{combination['column']} / {combination['beam']} / {combination['slab']}")
+        designs.insert(1, "column", combination["column"])
+        designs.insert(2, "beam", combination["beam"])
+        designs.insert(3, "slab", combination["slab"])
+        frames.append(designs)
+    return pd.concat(frames, ignore_index=True)
+
+
+def pareto_designs(designs, objectives=PARETO_OBJECTIVES, by_live_load=True):
+    """
+    Return the designs on the Pareto front of the given objectives, sorted by
+    live load and then by the objectives.
+
+    The live load is a requirement rather than a design choice, so by default
+    each live load gets its own front; otherwise lighter loads would dominate
+    every heavier one.
+    """
+    values = designs[list(objectives)].to_numpy()
+    mask = np.zeros(len(designs), dtype=bool)
+    if by_live_load:
+        for rows in designs.groupby("live_load").indices.values():
+            mask[rows] = pareto_front(values[rows])
+    else:
+        mask = pareto_front(values)
+    return designs[mask].sort_values(["live_load"] + list(objectives)).reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pareto front of all available combinations over the span/load grid.")
+    parser.add_argument("--live-loads", type=float, nargs="+", default=[3.0], help="Live loads in kN/m² (default: 3.0)")
+    parser.add_argument("--length", type=float, default=60, help="Building length before snapping to whole bays (m)")
+    parser.add_argument("--width", type=float, default=40, help="Building width before snapping to whole bays (m)")
+    parser.add_argument("--f2f", type=float, default=6)
+    parser.add_argument("--step", type=float, default=1.0, help="Span resolution in metres (default: 1)")
+    parser.add_argument("--min-coverage", type=float, default=DEFAULT_MIN_COVERAGE,
+                        help=f"Smallest footprint fraction kept after snapping (default: {DEFAULT_MIN_COVERAGE})")
+    parser.add_argument("--objectives", nargs="+", choices=PARETO_OUTPUTS, default=list(PARETO_OUTPUTS),
+                        help="Outputs traded off, each per m² of the footprint kept (default: all)")
+    parser.add_argument("--across-loads", action="store_true", help="One front over all live loads instead of one per load")
+    parser.add_argument("--output", help="Write the front to this CSV file")
+    args = parser.parse_args(argv)
+
+    designs = evaluate_design_space(args.live_loads, args.length, args.width, args.f2f, step=args.step, min_coverage=args.min_coverage)
+    objectives = [f"{name}_per_m2" for name in args.objectives]
+    front = pareto_designs(designs, objectives, by_live_load=not args.across_loads)
+    print(f"{len(front)} of {len(designs)} designs on the Pareto front")
+    columns = DESIGN_COLUMNS + list(args.objectives) + objectives
+    if args.output:
+        front[columns].to_csv(args.output, index=False)
+    else:
+        print(front[columns].to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+import math
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from column_rc import calculate_column_size
+from beam_rc import calculate_beam_size
+from slab_rc import calculate_slab_thickness, hcs_selected_slab_check
+from output_data import calculate_layout_outputs
+from answer_cube import get_answer_cube
+from metrics import get_metrics, stage_timer
+
+
+def grid_footprint(length_input, width_input, s1, s2):
+    """
+    Snap the building footprint down to whole bays, as the UI does.
+    """
+    length = math.floor((length_input) / s1) * s1
+    width = math.floor((width_input) / s2) * s2
+    return length, width
+
+
+def run_pipeline(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f, storeys=5):
+    """
+    Run column, slab and beam sizing followed by the layout outputs for one scenario.
+
+    length and width are the (already snapped) building dimensions in meters;
+    columns are sized for the load of the given number of storeys.
+
+    Returns:
+    - result (dict): Every sizing value (with the effective slab type after the
+      HCS check), the LayoutOutputs under "outputs" and "sizing_source", which
+      is "answer_cube" when sizing came from the precomputed cube and "live"
+      otherwise.
+    """
+    sizing = None
+    # The cube holds sizing for the default 5 storeys
+    answer_cube = get_answer_cube() if storeys == 5 else None
+    if answer_cube is not None:
+        with stage_timer("answer_cube_lookup"):
+            sizing = answer_cube.lookup(selected_column, selected_beam, selected_slab, s1, s2, live_load, f2f)
+
+    if sizing is not None:
+        sizing_source = "answer_cube"
+        selected_slab = sizing["selected_slab"]
+        column_size_mm, column_weight_tonnes = sizing["column_size_mm"], sizing["column_weight_tonnes"]
+        b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm = (
+            sizing["b_s1_mm"], sizing["d_s1_mm"], sizing["b_s2_mm"], sizing["d_s2_mm"], sizing["b_s3_mm"], sizing["d_s3_mm"])
+        slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm = (
+            sizing["slab_thickness_mm"], sizing["slab_max_spacing_pt_mm"], sizing["hcs_slab_thickness_mm"])
+    else:
+        # Outside the cube's domain, no cube built, or inputs the live path rejects
+        sizing_source = "live"
+        with stage_timer("column_sizing"):
+            column_size_mm, column_weight_tonnes = calculate_column_size(s1, s2, live_load, selected_column, f2f, storeys=storeys)
+        with stage_timer("hcs_slab_check"):
+            selected_slab = hcs_selected_slab_check(s1, live_load, selected_slab)
+        with stage_timer("beam_sizing"):
+            b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm = calculate_beam_size(s1, s2, live_load, column_size_mm, selected_beam, selected_slab)
+        with stage_timer("slab_sizing"):
+            slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm = calculate_slab_thickness(s1, s2, live_load, selected_slab)
+    with stage_timer("layout_outputs"):
+        outputs = calculate_layout_outputs(
+            s1, s2, live_load, column_size_mm, selected_column, selected_beam, selected_slab, length, width,
+            b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm, slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm, f2f)
+
+    return {
+        "selected_column": selected_column,
+        "selected_beam": selected_beam,
+        "selected_slab": selected_slab,
+        "s1": s1,
+        "s2": s2,
+        "live_load": live_load,
+        "length": length,
+        "width": width,
+        "f2f": f2f,
+        "storeys": storeys,
+        "column_size_mm": column_size_mm,
+        "column_weight_tonnes": column_weight_tonnes,
+        "b_s1_mm": b_s1_mm,
+        "d_s1_mm": d_s1_mm,
+        "b_s2_mm": b_s2_mm,
+        "d_s2_mm": d_s2_mm,
+        "b_s3_mm": b_s3_mm,
+        "d_s3_mm": d_s3_mm,
+        "slab_thickness_mm": slab_thickness_mm,
+        "slab_max_spacing_pt_mm": slab_max_spacing_pt_mm,
+        "hcs_slab_thickness_mm": hcs_slab_thickness_mm,
+        "outputs": outputs,
+        "sizing_source": sizing_source,
+    }
+
+
+def add_scenario_arguments(parser, spans=True, **defaults):
+    """
+    Add the scenario options shared by the command-line tools: --column,
+    --beam, --slab, --s1, --s2, --live-load, --length, --width and --f2f.
+
+    Parameters:
+    - parser (ArgumentParser): Parser to add the options to.
+    - spans (bool): Include --s1 and --s2 (tools searching the spans leave them out).
+    - defaults: Other default values by option name, e.g. column="PC Column".
+    """
+    group = parser.add_argument_group("scenario")
+    group.add_argument("--column", default="CIS Column")
+    group.add_argument("--beam", default="CIS Beam")
+    group.add_argument("--slab", default="CIS Slab")
+    if spans:
+        group.add_argument("--s1", type=float, default=10)
+        group.add_argument("--s2", type=float, default=10)
+    group.add_argument("--live-load", type=float, default=3.0)
+    group.add_argument("--length", type=float, default=60, help="Building length before snapping to whole bays (m)")
+    group.add_argument("--width", type=float, default=40, help="Building width before snapping to whole bays (m)")
+    group.add_argument("--f2f", type=float, default=6)
+    parser.set_defaults(**defaults)
+
+
+def scenario_inputs(args):
+    """
+    The run_pipeline inputs of parsed scenario options (see
+    add_scenario_arguments), with the footprint snapped to whole bays.
+    """
+    length, width = grid_footprint(args.length, args.width, args.s1, args.s2)
+    return args.column, args.beam, args.slab, args.s1, args.s2, args.live_load, length, width, args.f2f
+
+
+def scenario_result(args, **kwargs):
+    """
+    run_pipeline result for parsed scenario options; kwargs are passed on
+    (e.g. storeys).
+    """
+    return run_pipeline(*scenario_inputs(args), **kwargs)
+
+
+def create_result_plot(result):
+    """
+    Build the grid plot figure for a run_pipeline result.
+    """
+    from plot_data import create_grid_plot
+
+    with stage_timer("create_grid_plot"):
+        return create_grid_plot(
+            result["length"], result["width"], result["s1"], result["s2"], result["live_load"],
+            result["selected_column"], result["selected_beam"], result["selected_slab"],
+            result["column_size_mm"], result["column_weight_tonnes"],
+            result["b_s1_mm"], result["d_s1_mm"], result["b_s2_mm"], result["d_s2_mm"], result["b_s3_mm"], result["d_s3_mm"],
+            result["slab_thickness_mm"], result["slab_max_spacing_pt_mm"], result["hcs_slab_thickness_mm"])
+
+
+def figure_to_png(fig, dpi=200):
+    """
+    Rasterise a figure to PNG bytes with the same settings as st.pyplot, then close it.
+    """
+    import matplotlib.pyplot as plt
+
+    png = BytesIO()
+    with stage_timer("rasterize"):
+        fig.savefig(png, format="png", dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+    return png.getvalue()
+
+
+class PipelineCache:
+    """
+    Process-wide LRU cache of pipeline results and rendered plots.
+
+    Entries are evicted least recently used first once their combined size
+    exceeds max_mb. Hit and miss counters are kept for monitoring.
+    """
+
+    def __init__(self, max_mb=64):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Return the value cached for key, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, nbytes):
+        """
+        Store value under key, evicting old entries to stay within max_mb.
+        Values larger than the whole cache are not stored.
+        """
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Return hit/miss counters and memory use as a dict.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size_mb": self.current_bytes / (1024 * 1024),
+                "max_mb": self.max_bytes / (1024 * 1024),
+            }
+
+
+_pipeline_cache = PipelineCache(float(os.environ.get("DFMA_CACHE_MB", 64)))
+
+get_metrics().register_gauge("dfma_cache_hits", "Pipeline cache hits since start-up.", lambda: _pipeline_cache.hits)
+get_metrics().register_gauge("dfma_cache_misses", "Pipeline cache misses since start-up.", lambda: _pipeline_cache.misses)
+get_metrics().register_gauge("dfma_cache_size_bytes", "Memory held by the pipeline cache.", lambda: _pipeline_cache.current_bytes)
+
+
+def get_pipeline_cache():
+    """
+    Return the process-wide PipelineCache shared by every Streamlit session.
+    Its size cap (MB) is read from the DFMA_CACHE_MB environment variable.
+    """
+    return _pipeline_cache
+
+
+def cache_key(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f):
+    """
+    Normalised cache key so equal inputs hit regardless of int/float types or
+    floating point noise from the UI's 0.1 kN/m² steps.
+    """
+    return (
+        selected_column, selected_beam, selected_slab,
+        float(s1), float(s2), round(float(live_load), 6), float(length), float(width), float(f2f),
+    )
+
+
+def cached_result(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f, storeys=5, cache=None):
+    """
+    Run the pipeline without rendering the plot, memoised in the shared cache.
+
+    generate renders the plot from this result, so the app's tools and Generate
+    share one pipeline run per set of inputs.
+
+    Returns:
+    - result (dict): See run_pipeline.
+    """
+    if cache is None:
+        cache = get_pipeline_cache()
+    key = ("result", storeys) + cache_key(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f)
+
+    result = cache.get(key)
+    if result is None:
+        result = run_pipeline(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f, storeys=storeys)
+        cache.put(key, result, len(pickle.dumps(result)))
+    return result
+
+
+def generate(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f, cache=None):
+    """
+    Run the pipeline and render the grid plot, memoised in the shared cache.
+
+    Returns:
+    - result (dict): See run_pipeline.
+    - png (bytes): Rendered grid plot.
+    """
+    if cache is None:
+        cache = get_pipeline_cache()
+    key = cache_key(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = cached_result(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f, cache=cache)
+    png = figure_to_png(create_result_plot(result))
+    cache.put(key, (result, png), len(pickle.dumps(result)) + len(png))
+    return result, png
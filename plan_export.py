@@ -0,0 +1,303 @@
+import argparse
+import io
+import sys
+
+import numpy as np
+
+from geometry import (COLUMN, CRANE_REACH_RADII, CRANE_SQUARES, DROP_PANEL, HCS_PANEL, bay_positions, beam_outline_polygons,
+                      boundary_polyline, cis_slab_marks, crane_base_squares, crane_centres, crane_cross_segments,
+                      flat_slab_edge, grid_label, grid_positions, grid_segments, iter_layout_elements,
+                      rectangle_polygons, staircase_segments)
+from metrics import stage_timer
+
+# Plan export for CAD: the detailed plan geometry written straight to DXF (R12)
+# or SVG, without matplotlib. Element families are generated and written a
+# slice of grid positions at a time, so memory stays bounded by CHUNK_ELEMENTS
+# whatever the size of the site.
+
+# Layer name -> (AutoCAD colour index, SVG stroke colour, SVG stroke width in px)
+LAYERS = {
+    "BOUNDARY": (7, "black", 1.0),
+    "GRID": (8, "gray", 0.3),
+    "COLUMNS": (7, "black", 0.3),
+    "BEAMS": (7, "black", 0.3),
+    "SLAB": (8, "dimgray", 0.3),
+    "DROP_PANELS": (7, "black", 0.3),
+    "STAIRS": (7, "black", 0.2),
+    "CRANES": (1, "red", 0.5),
+    "CRANE_REACH": (30, "orange", 0.5),
+    "TEXT": (7, "black", 0.0),
+}
+
+# Most polygons or segments generated and formatted in one go
+CHUNK_ELEMENTS = 20000
+
+PLAN_FORMATS = ("dxf", "svg")
+
+
+class DxfWriter:
+    """
+    Streaming writer of an AutoCAD R12 (AC1009) ASCII DXF file.
+
+    Coordinates are given in meters and written in drawing units
+    (scale = drawing units per meter, 1000 for millimeters).
+    """
+
+    def __init__(self, stream, extents, scale=1000.0):
+        self.stream = stream
+        self.scale = scale
+        (x_min, y_min), (x_max, y_max) = extents
+        write = stream.write
+        write("0\nSECTION\n2\nHEADER\n9\n$ACADVER\n1\nAC1009\n")
+        write(f"9\n$EXTMIN\n10\n{x_min * scale:.4f}\n20\n{y_min * scale:.4f}\n30\n0.0\n")
+        write(f"9\n$EXTMAX\n10\n{x_max * scale:.4f}\n20\n{y_max * scale:.4f}\n30\n0.0\n")
+        write("0\nENDSEC\n")
+        write("0\nSECTION\n2\nTABLES\n")
+        write("0\nTABLE\n2\nLTYPE\n70\n1\n0\nLTYPE\n2\nCONTINUOUS\n70\n0\n3\nSolid line\n72\n65\n73\n0\n40\n0.0\n0\nENDTAB\n")
+        write(f"0\nTABLE\n2\nLAYER\n70\n{len(LAYERS)}\n")
+        for name, (color, _, _) in LAYERS.items():
+            write(f"0\nLAYER\n2\n{name}\n70\n0\n62\n{color}\n6\nCONTINUOUS\n")
+        write("0\nENDTAB\n0\nENDSEC\n")
+        write("0\nSECTION\n2\nENTITIES\n")
+
+    def lines(self, layer, segments):
+        """
+        Write an (n, 2, 2) segment array as LINE entities.
+        """
+        segments = np.asarray(segments, dtype=float).reshape(-1, 4) * self.scale
+        entity = f"0\nLINE\n8\n{layer}\n10\n%.4f\n20\n%.4f\n30\n0.0\n11\n%.4f\n21\n%.4f\n31\n0.0\n"
+        self.stream.write((entity * len(segments)) % tuple(segments.ravel().tolist()))
+
+    def polylines(self, layer, polygons, closed=True):
+        """
+        Write an (n, vertices, 2) polygon array as POLYLINE entities. Closed
+        polylines drop a repeated closing vertex.
+        """
+        polygons = np.asarray(polygons, dtype=float)
+        if closed and polygons.shape[1] > 2 and np.array_equal(polygons[:, 0], polygons[:, -1]):
+            polygons = polygons[:, :-1]
+        vertex = f"0\nVERTEX\n8\n{layer}\n10\n%.4f\n20\n%.4f\n30\n0.0\n"
+        entity = (f"0\nPOLYLINE\n8\n{layer}\n66\n1\n10\n0.0\n20\n0.0\n30\n0.0\n70\n{1 if closed else 0}\n"
+                  + vertex * polygons.shape[1] + f"0\nSEQEND\n8\n{layer}\n")
+        self.stream.write((entity * len(polygons)) % tuple((polygons * self.scale).ravel().tolist()))
+
+    def circles(self, layer, centres, radius):
+        """
+        Write a CIRCLE entity of the given radius around every (x, y) centre.
+        """
+        centres = np.asarray(centres, dtype=float).reshape(-1, 2) * self.scale
+        entity = f"0\nCIRCLE\n8\n{layer}\n10\n%.4f\n20\n%.4f\n30\n0.0\n40\n{radius * self.scale:.4f}\n"
+        self.stream.write((entity * len(centres)) % tuple(centres.ravel().tolist()))
+
+    def texts(self, layer, points, labels, height):
+        """
+        Write a TEXT entity centred on every (x, y) point.
+        """
+        height = height * self.scale
+        for (x, y), label in zip(np.asarray(points, dtype=float).reshape(-1, 2) * self.scale, labels):
+            self.stream.write(f"0\nTEXT\n8\n{layer}\n10\n{x:.4f}\n20\n{y:.4f}\n30\n0.0\n40\n{height:.4f}\n1\n{label}\n"
+                              f"72\n1\n73\n2\n11\n{x:.4f}\n21\n{y:.4f}\n31\n0.0\n")
+
+    def close(self):
+        self.stream.write("0\nENDSEC\n0\nEOF\n")
+
+
+class SvgWriter:
+    """
+    Streaming writer of an SVG plan.
+
+    Coordinates are given in meters (y up) and written in user units of
+    scale per meter inside a group that flips the y axis. Each layer has a CSS
+    class with its stroke; stroke widths do not scale with the drawing.
+    """
+
+    def __init__(self, stream, extents, scale=10.0):
+        self.stream = stream
+        self.scale = scale
+        (x_min, y_min), (x_max, y_max) = extents
+        margin = 2.0
+        x0, y0 = (x_min - margin) * scale, (y_min - margin) * scale
+        w, h = (x_max - x_min + 2 * margin) * scale, (y_max - y_min + 2 * margin) * scale
+        write = stream.write
+        write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        write(f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{x0:.2f} {-(y0 + h):.2f} {w:.2f} {h:.2f}">\n')
+        write("<style>\n")
+        write("path, circle { fill: none; vector-effect: non-scaling-stroke; }\n")
+        write("text { font-family: sans-serif; text-anchor: middle; dominant-baseline: central; }\n")
+        for name, (_, color, width) in LAYERS.items():
+            if name == "TEXT":
+                write(f".{name} {{ fill: {color}; }}\n")
+            else:
+                write(f".{name} {{ stroke: {color}; stroke-width: {width}px; }}\n")
+        write("</style>\n")
+        write('<g transform="scale(1,-1)">\n')
+
+    def lines(self, layer, segments):
+        """
+        Write an (n, 2, 2) segment array as one path.
+        """
+        segments = np.asarray(segments, dtype=float).reshape(-1, 4) * self.scale
+        if len(segments):
+            self.stream.write(f'<path class="{layer}" d="' + ("M%.2f %.2fL%.2f %.2f" * len(segments)) % tuple(segments.ravel().tolist()) + '"/>\n')
+
+    def polylines(self, layer, polygons, closed=True):
+        """
+        Write an (n, vertices, 2) polygon array as one path.
+        """
+        polygons = np.asarray(polygons, dtype=float)
+        if not len(polygons):
+            return
+        if closed and polygons.shape[1] > 2 and np.array_equal(polygons[:, 0], polygons[:, -1]):
+            polygons = polygons[:, :-1]
+        polygon = "M%.2f %.2f" + "L%.2f %.2f" * (polygons.shape[1] - 1) + ("Z" if closed else "")
+        self.stream.write(f'<path class="{layer}" d="' + (polygon * len(polygons)) % tuple((polygons * self.scale).ravel().tolist()) + '"/>\n')
+
+    def circles(self, layer, centres, radius):
+        """
+        Write a circle of the given radius around every (x, y) centre.
+        """
+        centres = np.asarray(centres, dtype=float).reshape(-1, 2) * self.scale
+        circle = f'<circle class="{layer}" cx="%.2f" cy="%.2f" r="{radius * self.scale:.2f}"/>\n'
+        self.stream.write((circle * len(centres)) % tuple(centres.ravel().tolist()))
+
+    def texts(self, layer, points, labels, height):
+        """
+        Write a label centred on every (x, y) point, upright in the flipped group.
+        """
+        height = height * self.scale
+        for (x, y), label in zip(np.asarray(points, dtype=float).reshape(-1, 2) * self.scale, labels):
+            label = str(label).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            self.stream.write(f'<text class="{layer}" transform="matrix(1 0 0 -1 {x:.2f} {y:.2f})" font-size="{height:.2f}">{label}</text>\n')
+
+    def close(self):
+        self.stream.write("</g>\n</svg>\n")
+
+
+def _chunks(x, per_x):
+    # Slices of x positions holding at most CHUNK_ELEMENTS elements each
+    step = max(CHUNK_ELEMENTS // max(per_x, 1), 1)
+    for start in range(0, len(x), step):
+        yield x[start:start + step]
+
+
+def write_plan(writer, result):
+    """
+    Write the detailed plan of a run_pipeline result: boundary, grid, columns,
+    slab panels or marks, drop panels, beams, staircases, cranes and labels.
+
+    Unlike the plot, the export never aggregates bays; large sites are written
+    a slice of grid positions at a time instead.
+    """
+    length, width, s1, s2 = result["length"], result["width"], result["s1"], result["s2"]
+    column_size_mm = result["column_size_mm"]
+    selected_slab, selected_beam = result["selected_slab"], result["selected_beam"]
+
+    writer.polylines("BOUNDARY", boundary_polyline(length, width, s1, s2)[None])
+
+    # Grid lines and their names
+    grid_x, grid_y = grid_positions(length, width, s1, s2)
+    for x in _chunks(grid_x, 1):
+        writer.lines("GRID", grid_segments(x, [], length, width, s1, s2))
+    for y in _chunks(grid_y, 1):
+        writer.lines("GRID", grid_segments([], y, length, width, s1, s2))
+    label_height = min(s1, s2) / 10
+    writer.texts("TEXT", np.column_stack([grid_x, np.full(len(grid_x), width + 2 * s2 + label_height)]),
+                 (grid_label(i) for i in range(len(grid_x))), label_height)
+    writer.texts("TEXT", np.column_stack([np.full(len(grid_y), -label_height), grid_y]),
+                 (i + 1 for i in range(len(grid_y))), label_height)
+
+    # Columns, beams, hollow core panels and drop panels, a slice at a time
+    for elements in iter_layout_elements(
+            length, width, s1, s2, column_size_mm, selected_beam, selected_slab,
+            result["b_s1_mm"], result["d_s1_mm"], result["b_s2_mm"], result["d_s2_mm"], result["b_s3_mm"], result["d_s3_mm"],
+            result["slab_thickness_mm"], result["hcs_slab_thickness_mm"], result["f2f"], chunk_size=CHUNK_ELEMENTS):
+        if not len(elements):
+            continue
+        element_type = elements["type"][0]
+        if element_type == COLUMN:
+            writer.polylines("COLUMNS", rectangle_polygons(elements))
+        elif element_type == HCS_PANEL:
+            writer.polylines("SLAB", rectangle_polygons(elements, closed=False))
+        elif element_type == DROP_PANEL:
+            writer.polylines("DROP_PANELS", rectangle_polygons(elements))
+        else:
+            writer.polylines("BEAMS", beam_outline_polygons(elements, column_size_mm))
+
+    # One-way slab marks and beam sizes
+    if selected_slab == "CIS Slab":
+        x, y = bay_positions(length, width, s1, s2)
+        for chunk in _chunks(x, len(y)):
+            marks = cis_slab_marks(chunk, y, s1, s2)
+            writer.texts("SLAB", marks, ["~"] * len(marks), label_height)
+    if selected_beam in ["CIS Beam", "PT Beam"]:
+        writer.texts("TEXT", [(length + 0.5 * s1, 0.5 * s2)], [f"{result['b_s1_mm']:.0f} x {result['d_s1_mm']}(d) mm"], label_height / 2)
+        writer.texts("TEXT", [(length + 1.5 * s1, 1.5 * s2)], [f"{result['b_s2_mm']:.0f} x {result['d_s2_mm']}(d) mm"], label_height / 2)
+    if selected_beam == "PT Flat Slab":
+        writer.polylines("BEAMS", flat_slab_edge(length, width, s1, s2, column_size_mm)[None])
+
+    writer.lines("STAIRS", staircase_segments(s1, s2, column_size_mm, length, width))
+
+    # Tower cranes: base squares, centre cross and reach circles
+    centres = np.asarray(crane_centres(length, width, s1, s2), dtype=float)
+    for start in range(0, len(centres), CHUNK_ELEMENTS):
+        chunk = centres[start:start + CHUNK_ELEMENTS]
+        for side in CRANE_SQUARES:
+            writer.polylines("CRANES", crane_base_squares(chunk, side))
+        writer.lines("CRANES", crane_cross_segments(chunk))
+        for radius in CRANE_REACH_RADII:
+            writer.circles("CRANE_REACH", chunk, radius)
+
+    writer.close()
+
+
+def export_plan(result, stream, fmt="dxf", scale=None):
+    """
+    Write the plan of a run_pipeline result to a text stream.
+
+    Parameters:
+    - result (dict): See pipeline.run_pipeline.
+    - stream (file-like): Text stream to write to.
+    - fmt (str): "dxf" or "svg".
+    - scale (float): Drawing units per meter (default: 1000, i.e. millimeters,
+      for DXF and 10 for SVG).
+    """
+    if fmt not in PLAN_FORMATS:
+        raise ValueError(f"Unsupported plan format: {fmt}")
+    writer_class = DxfWriter if fmt == "dxf" else SvgWriter
+    boundary = boundary_polyline(result["length"], result["width"], result["s1"], result["s2"])
+    extents = (boundary.min(axis=0), boundary.max(axis=0))
+    kwargs = {} if scale is None else {"scale": scale}
+    with stage_timer(f"plan_export_{fmt}"):
+        write_plan(writer_class(stream, extents, **kwargs), result)
+
+
+def plan_bytes(result, fmt="dxf", scale=None):
+    """
+    The plan of a run_pipeline result as encoded bytes, for download buttons.
+    """
+    stream = io.StringIO()
+    export_plan(result, stream, fmt, scale)
+    return stream.getvalue().encode("utf-8")
+
+
+def main(argv=None):
+    from pipeline import add_scenario_arguments, scenario_result
+
+    parser = argparse.ArgumentParser(description="Export the plan of one DfMA scenario to DXF (R12) or SVG.")
+    parser.add_argument("output", help="Output file (.dxf or .svg)")
+    parser.add_argument("--format", choices=PLAN_FORMATS, help="Output format (default: from the file extension)")
+    add_scenario_arguments(parser)
+    parser.add_argument("--scale", type=float, help="Drawing units per meter (default: 1000 for DXF, 10 for SVG)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or args.output.rsplit(".", 1)[-1].lower()
+    if fmt not in PLAN_FORMATS:
+        parser.error("cannot infer the format from the file name; pass --format")
+    result = scenario_result(args)
+    with open(args.output, "w", encoding="utf-8", newline="\n") as stream:
+        export_plan(result, stream, fmt, args.scale)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
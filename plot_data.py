@@ -1,144 +1,101 @@
+import math
+import os
+import matplotlib as mpl
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import matplotlib.transforms as transforms
+from matplotlib.collections import LineCollection, PatchCollection, PolyCollection
 import numpy as np
+from geometry import (BEAM_S1, BEAM_S2, BEAM_S3, COLUMN, DROP_PANEL, HCS_PANEL, HCS_SLABS, beam_outline_polygons, crane_centres,
+                      element_counts, flat_slab_edge, grid_label, layout_elements, polygon_array, rectangle_polygons,
+                      staircase_segments)
+
+# Above this many drawn elements (columns, panels, beams, ...) the plot switches
+# to aggregated bay blocks so rendering time stays bounded for large sites
+PLOT_ELEMENT_BUDGET = int(os.environ.get("DFMA_PLOT_ELEMENT_BUDGET", 20000))
+
+# Most tick or grid labels drawn along one axis
+MAX_AXIS_LABELS = 20
+
+# Aggregated plots draw crane reach circles only up to this many cranes
+MAX_CRANE_REACH_CIRCLES = 200
+
+
+def add_polygons(ax, xs, ys, use_collections=True, filled=True, **style):
+    """
+    Draw a family of polygons (columns, panels, beam outlines, ...).
+
+    xs and ys list the polygon vertices in drawing order, each entry being an
+    array with one coordinate per polygon (scalars broadcast). With
+    use_collections the whole family becomes a single PolyCollection (filled) or
+    LineCollection (outlines); otherwise each polygon is drawn with its own
+    ax.fill/ax.plot call. style takes the same keywords as ax.fill/ax.plot.
+    """
+    add_polygon_array(ax, polygon_array(xs, ys), use_collections, filled, **style)
+
+
+def add_polygon_array(ax, verts, use_collections=True, filled=True, **style):
+    """
+    Draw an (n, vertices, 2) polygon array from geometry.py, as add_polygons.
+    """
+    if not use_collections:
+        for polygon in verts:
+            if filled:
+                ax.fill(polygon[:, 0], polygon[:, 1], **style)
+            else:
+                ax.plot(polygon[:, 0], polygon[:, 1], **style)
+        return
+
+    if filled:
+        collection = PolyCollection(
+            verts,
+            facecolors=style.get("color", style.get("facecolor")),
+            edgecolors=style.get("edgecolor", style.get("color")),
+            linewidths=style.get("linewidth"),
+            alpha=style.get("alpha"),
+        )
+    else:
+        # Match Line2D cap/join styles so outlines render as ax.plot would
+        linestyle = style.get("linestyle", "solid")
+        solid = linestyle in ("solid", "-")
+        collection = LineCollection(
+            verts,
+            colors=style.get("color"),
+            linewidths=style.get("linewidth"),
+            linestyles=linestyle,
+            alpha=style.get("alpha"),
+            capstyle=mpl.rcParams["lines.solid_capstyle" if solid else "lines.dash_capstyle"],
+            joinstyle=mpl.rcParams["lines.solid_joinstyle" if solid else "lines.dash_joinstyle"],
+        )
+    ax.add_collection(collection, autolim=False)
 
 def plot_staircase(ax, s1, s2, column_size_mm, length, width):
     """
-    Plot a staircase layout within the grid (plan view).
+    Plot a staircase layout within the grid (plan view) as a single LineCollection.
     """
-    # Staircase parameters (in meters)
-    floor_to_floor_height = 6.0  # m
-    riser_height = 0.15  # m
-    tread_depth = 0.3  # m
-    landing_length = 2  # m
-    stair_width = 1.2  # m
-    wall_width = 0.2
-    Lift_external = 2.5
-
-    # Calculate number of risers and treads
-    num_risers = int(floor_to_floor_height / riser_height)
-    num_treads_per_flight = (num_risers // 2) - 1
-
-    # First flight of stairs 1
-    for i in range(num_treads_per_flight):
-        x_start = i * tread_depth + s1 + landing_length + column_size_mm/2
-        x_end = x_start + tread_depth
-        y_start = s2 - column_size_mm/2 - stair_width - wall_width
-        y_end = y_start + stair_width
-        ax.plot([x_start, x_end], [y_start, y_start], color='black', linewidth=0.1)
-        ax.plot([x_start, x_end], [y_end, y_end], color='black', linewidth=0.1)
-        ax.plot([x_start, x_start], [y_start, y_end], color='black', linewidth=0.1)
-
-    # Second flight of stairs 1
-    for i in range(num_treads_per_flight):
-        x_start = i * tread_depth + s1 + landing_length + column_size_mm/2
-        x_end = x_start + tread_depth
-        y_start = s2 - column_size_mm/2 - stair_width - stair_width - wall_width - wall_width
-        y_end = y_start + stair_width
-        ax.plot([x_start, x_end], [y_start, y_start], color='black', linewidth=0.1)
-        ax.plot([x_start, x_end], [y_end, y_end], color='black', linewidth=0.1)
-        ax.plot([x_start, x_start], [y_start, y_end], color='black', linewidth=0.1)
-
-    # Intermediate landing 1
-    landing_start = s1 + column_size_mm/2
-    landing_end = landing_start + landing_length
-    y_start = s2 - column_size_mm/2 - stair_width - stair_width - wall_width - wall_width
-    y_end = s2 - column_size_mm/2
-    ax.plot([landing_start, landing_end], [y_start, y_start], color='black', linewidth=0.1)
-    ax.plot([landing_start, landing_end], [y_end, y_end], color='black', linewidth=0.1)
-    ax.plot([landing_start, landing_start], [y_start, y_end], color='black', linewidth=0.1)
-    ax.plot([landing_end, landing_end], [y_start, y_end], color='black', linewidth=0.1)
-
-    # 2nd Intermediate landing 1
-    landing_start = s1 + column_size_mm/2 + num_treads_per_flight*tread_depth + landing_length
-    landing_end = landing_start + landing_length
-    y_start = s2 - column_size_mm/2 - stair_width - stair_width - wall_width - wall_width
-    y_end = y_start + stair_width + stair_width + wall_width
-    ax.plot([landing_start, landing_end], [y_start, y_start], color='black', linewidth=0.1)
-    ax.plot([landing_start, landing_end], [y_end, y_end], color='black', linewidth=0.1)
-    ax.plot([landing_start, landing_start], [y_start, y_end], color='black', linewidth=0.1)
-    ax.plot([landing_end, landing_end], [y_start, y_end], color='black', linewidth=0.1)
+    ax.add_collection(LineCollection(
+        staircase_segments(s1, s2, column_size_mm, length, width),
+        colors='black',
+        linewidths=0.1,
+        capstyle=mpl.rcParams["lines.solid_capstyle"],
+        joinstyle=mpl.rcParams["lines.solid_joinstyle"],
+    ), autolim=False)
     
-    # Wall1
-    wall_end = s1 + column_size_mm/2 + num_treads_per_flight*tread_depth + 2 * landing_length
-    wall_start = s1 + column_size_mm/2
-    wall_intermediate = s1 + column_size_mm/2 + landing_length
-    ywall_start = s2 - column_size_mm/2 - stair_width - stair_width - wall_width - wall_width
-    ywall_end = y_start + stair_width + stair_width + wall_width
-    ax.plot([wall_start - wall_width, wall_start - wall_width, wall_end + wall_width, wall_end + wall_width, wall_intermediate], [ywall_end, ywall_start - wall_width, ywall_start - wall_width, ywall_end + wall_width, ywall_end + wall_width], color='black', linewidth=0.1)
-
-    # lift1
-    corner_x = s1 - column_size_mm/2
-    corner_large = s2 + column_size_mm/2
-    corner_small = s2 + column_size_mm/2 + wall_width
-    ax.plot([corner_x, corner_x-Lift_external, corner_x-Lift_external, corner_x], [corner_large, corner_large, corner_large+Lift_external, corner_large+Lift_external], color='black', linewidth=0.1)
-    ax.plot([corner_x, corner_x-Lift_external+wall_width, corner_x-Lift_external+wall_width, corner_x], [corner_small, corner_small, corner_small+Lift_external-wall_width-wall_width, corner_small+Lift_external-wall_width-wall_width], color='black', linewidth=0.1)
-
-    # First flight of stairs 2
-    for i in range(num_treads_per_flight):
-        x_start = length + s1 - (i * tread_depth) - landing_length
-        x_end = x_start - tread_depth
-        y_start = width + s2 + column_size_mm/2 + wall_width
-        y_end = y_start + stair_width 
-        ax.plot([x_start, x_end], [y_start, y_start], color='black', linewidth=0.1)
-        ax.plot([x_start, x_end], [y_end, y_end], color='black', linewidth=0.1)
-        ax.plot([x_start, x_start], [y_start, y_end], color='black', linewidth=0.1)
-
-    # Second flight of stairs 2
-    for i in range(num_treads_per_flight):
-        x_start = length + s1 - (i * tread_depth) - landing_length 
-        x_end = x_start - tread_depth
-        y_start = width + s2 + column_size_mm/2 + wall_width + wall_width + stair_width
-        y_end = y_start + stair_width
-        ax.plot([x_start, x_end], [y_start, y_start], color='black', linewidth=0.1)
-        ax.plot([x_start, x_end], [y_end, y_end], color='black', linewidth=0.1)
-        ax.plot([x_start, x_start], [y_start, y_end], color='black', linewidth=0.1)
-        
-    # Intermediate landing 2
-    landing_start = length + s1 - landing_length - column_size_mm/2 + tread_depth
-    landing_end = landing_start + landing_length
-    y_start = width + s2 + column_size_mm/2 + wall_width + wall_width + stair_width + stair_width
-    y_end = width + s2 + column_size_mm/2 + wall_width
-    ax.plot([landing_start, landing_end], [y_start, y_start], color='black', linewidth=0.1)
-    ax.plot([landing_start, landing_end], [y_end, y_end], color='black', linewidth=0.1)
-    ax.plot([landing_start, landing_start], [y_start, y_end], color='black', linewidth=0.1)
-    ax.plot([landing_end, landing_end], [y_start, y_end], color='black', linewidth=0.1)
-
-    # 2nd Intermediate landing 2
-    landing_start = length + s1 - landing_length - column_size_mm/2 + tread_depth - num_treads_per_flight*tread_depth - landing_length
-    landing_end = landing_start + landing_length
-    y_start = width + s2 + column_size_mm/2 + wall_width + wall_width + stair_width + stair_width
-    y_end = width + s2 + column_size_mm/2
-    ax.plot([landing_start, landing_end], [y_start, y_start], color='black', linewidth=0.1)
-    ax.plot([landing_start, landing_end], [y_end, y_end], color='black', linewidth=0.1)
-    ax.plot([landing_start, landing_start], [y_start, y_end], color='black', linewidth=0.1)
-    ax.plot([landing_end, landing_end], [y_start, y_end], color='black', linewidth=0.1)
     
-     # Wall1
-    wall_end = length + s1 - landing_length - column_size_mm/2 + tread_depth - num_treads_per_flight*tread_depth - landing_length + num_treads_per_flight*tread_depth + 2 * landing_length
-    wall_start = length + s1 - landing_length - column_size_mm/2 + tread_depth - num_treads_per_flight*tread_depth - landing_length
-    wall_intermediate = length + s1 - landing_length - column_size_mm/2 + tread_depth - num_treads_per_flight*tread_depth
-    ywall_start = width + s2 + column_size_mm/2
-    ywall_end = ywall_start + (2 * stair_width) + (3 * wall_width)
-    ax.plot([wall_start - wall_width, wall_start - wall_width, wall_end + wall_width, wall_end + wall_width, wall_intermediate], [ywall_start, ywall_end, ywall_end, ywall_start, ywall_start], color='black', linewidth=0.1)
-
-    # lift2
-    corner_x = length + s1 + column_size_mm/2
-    corner_large = width + s2 - column_size_mm/2
-    corner_small = width + s2 - column_size_mm/2 + wall_width
-    ax.plot([corner_x, corner_x+Lift_external, corner_x+Lift_external, corner_x], [corner_large, corner_large, corner_large-Lift_external, corner_large-Lift_external], color='black', linewidth=0.1)
-    ax.plot([corner_x, corner_x+Lift_external+wall_width, corner_x+Lift_external+wall_width, corner_x], [corner_small, corner_small, corner_small-Lift_external-wall_width-wall_width, corner_small-Lift_external-wall_width-wall_width], color='black', linewidth=0.1)
-    
-    
-def plot_crane(ax, width, length, s1, s2):
-    # Determine number of cranes based on length
-    if length <= 31:
-        centers = [((length+2*s1) / 2, (width+2*s2) / 2)]
-    elif 31 < length <= 61:
-        centers = [((length+2*s1) / 3, (width+2*s2) / 2), (2 * (length+2*s1) / 3, (width+2*s2) / 2)]
-    elif 61 < length <= 100:
-        centers = [((length+2*s1) / 4, (width+2*s2) / 2), ((length+2*s1) / 2, (width+2*s2) / 2), (3 * (length+2*s1) / 4, (width+2*s2) / 2)]
+def plot_crane(ax, width, length, s1, s2, detailed=True):
+    """
+    Plot the tower cranes. Aggregated plots (detailed=False) draw only each
+    crane's position and, for up to MAX_CRANE_REACH_CIRCLES cranes, its 30m
+    reach, as two collections.
+    """
+    centers = crane_centres(length, width, s1, s2)
+
+    if not detailed:
+        centers = np.asarray(centers)
+        ax.scatter(centers[:, 0], centers[:, 1], marker="+", color="red", s=12, linewidths=0.5)
+        if len(centers) <= MAX_CRANE_REACH_CIRCLES:
+            ax.add_collection(PatchCollection([mpatches.Circle(c, 30) for c in centers], facecolor="none", edgecolor="orange", linewidth=0.3))
+        return
 
     # Plot each crane
     for center_x, center_y in centers:
@@ -163,61 +120,167 @@ def plot_crane(ax, width, length, s1, s2):
         ax.add_patch(circle_20)
         ax.add_patch(circle_25)
         ax.add_patch(circle_30)
-        
-        
-# Function to create a grid plot based on user inputs
-def create_grid_plot(length, width, s1, s2, live_load, selected_column, selected_beam, selected_slab, column_size_mm, column_weight_tonnes, b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm, slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm):
-    
-    fig, ax = plt.subplots(figsize=(8, 6))
 
-    # Draw boundary
-    ax.plot([0, (length + 2* s1), (length + 2* s1), 0, 0], [0, 0, (width + 2 * s2), (width + 2 * s2), 0], color='black', linewidth=2)
 
-    # Draw grid lines
-    for x in np.arange(0, length + 2 * s1, s1):
-        ax.axvline(x, color='gray', linestyle='--', linewidth= 0.3, alpha=0.7)
-    for y in np.arange(0, width + 2 * s2, s2):
-        ax.axhline(y, color='gray', linestyle='--', linewidth= 0.3, alpha=0.7)
-    
-     # Set primary axis labels (distances) in between grid lines
-    xticks = np.arange(s1 / 2, length + 2 * s1, s1)  # Midpoints for X-axis
-    yticks = np.arange(s2 / 2, width + 2 * s2, s2)  # Midpoints for Y-axis
+def plot_element_count(length, width, s1, s2, column_size_mm, selected_slab, selected_beam):
+    """
+    Closed-form number of elements a detailed plot draws (grid lines and
+    labels, structural elements from geometry.element_counts and slab marks).
+    """
+    bays_x = max(round(length / s1), 0)
+    bays_y = max(round(width / s2), 0)
+    counts = element_counts(bays_x * s1, bays_y * s2, s1, s2, column_size_mm, selected_beam, selected_slab)
+    count = 2 * (bays_x + bays_y + 4) + int(sum(counts.values()))
+    if selected_slab == "CIS Slab":
+        count += bays_x * bays_y
+    return count
+
+
+def _thin(values, max_count):
+    # Every k-th value so that at most max_count remain
+    step = max(math.ceil(len(values) / max_count), 1)
+    return values[::step]
+
+
+def plot_bay_blocks(ax, length, width, s1, s2, column_size_mm, selected_slab, block_size):
+    """
+    Draw the floor plate as blocks of block_size x block_size bays instead of
+    individual panels, with columns at the block corners, grid lines on the
+    block boundaries and thinned axis labels.
+
+    Returns:
+    - legend (Patch): Legend entry describing the blocks.
+    """
+    bays_x = round(length / s1)
+    bays_y = round(width / s2)
+    edges_x = np.unique(np.r_[np.arange(0, bays_x, block_size), bays_x])
+    edges_y = np.unique(np.r_[np.arange(0, bays_y, block_size), bays_y])
+    grid_x = s1 + edges_x * s1
+    grid_y = s2 + edges_y * s2
+
+    # Block boundaries as one LineCollection each way
+    ax.add_collection(LineCollection(
+        [[(x, 0), (x, width + 2 * s2)] for x in grid_x] + [[(0, y), (length + 2 * s1, y)] for y in grid_y],
+        colors="gray", linestyles="--", linewidths=0.3, alpha=0.7), autolim=False)
+
+    # Blocks
+    hcs = selected_slab in HCS_SLABS
+    x0, y0 = np.meshgrid(grid_x[:-1], grid_y[:-1], indexing="ij")
+    x1, y1 = np.meshgrid(grid_x[1:], grid_y[1:], indexing="ij")
+    inset = column_size_mm / 2
+    add_polygons(ax, [x0 + inset, x1 - inset, x1 - inset, x0 + inset], [y0 + inset, y0 + inset, y1 - inset, y1 - inset],
+                 color="lightgray" if hcs else "white", edgecolor="black", linewidth=0.3, alpha=0.7 if hcs else None)
+
+    # Columns at the block corners
+    x, y = np.meshgrid(grid_x, grid_y, indexing="ij")
+    add_polygons(ax, [
+        x - column_size_mm/2, x + column_size_mm/2, x + column_size_mm/2, x - column_size_mm/2
+    ], [
+        y - column_size_mm/2, y - column_size_mm/2, y + column_size_mm/2, y + column_size_mm/2
+    ], color="black", linewidth=0.3)
+
+    # Block spans between the boundaries and grid line names on them
+    xticks = (grid_x[:-1] + grid_x[1:]) / 2
+    yticks = (grid_y[:-1] + grid_y[1:]) / 2
+    xspans = np.diff(edges_x) * s1
+    yspans = np.diff(edges_y) * s2
+    xticks, xspans = _thin(xticks, MAX_AXIS_LABELS), _thin(xspans, MAX_AXIS_LABELS)
+    yticks, yspans = _thin(yticks, MAX_AXIS_LABELS), _thin(yspans, MAX_AXIS_LABELS)
     ax.set_xticks(xticks)
-    ax.set_xticklabels([f"{s1*1000}" for _ in xticks], rotation=90, fontsize=8)  # Distance labels
+    ax.set_xticklabels([f"{span*1000}" for span in xspans], rotation=90, fontsize=6)
     ax.set_yticks(yticks)
-    ax.set_yticklabels([f"{s2*1000}" for _ in yticks], fontsize=8)  # Distance labels
+    ax.set_yticklabels([f"{span*1000}" for span in yspans], fontsize=6)
     ax.yaxis.tick_right()
 
+    for x, index in zip(_thin(grid_x, MAX_AXIS_LABELS), _thin(edges_x + 1, MAX_AXIS_LABELS)):
+        ax.text(x, width + 2 * s2, grid_label(index), ha="center", va="center", fontsize=6, color="black")
+    for y, index in zip(_thin(grid_y, MAX_AXIS_LABELS), _thin(edges_y + 1, MAX_AXIS_LABELS)):
+        ax.text(-1, y, index + 1, ha="center", va="center", fontsize=6, color="black")
 
-    # Add secondary axis labels (ABCDE and 12345)
-    secondary_xticks = np.arange(0, length + 2 * s1, s1)  # Original gridline positions
-    secondary_yticks = np.arange(0, width + 2 * s2, s2)  # Original gridline positions
-    secondary_horizontal_labels = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")[:len(secondary_xticks)]
-    secondary_vertical_labels = list(range(1, len(secondary_yticks) + 1))
-
-    # Add secondary labels above the X-axis
-    for i, label in enumerate(secondary_horizontal_labels):
-        ax.text(
-            secondary_xticks[i],
-            ax.get_ylim()[1],  # Offset above the axis
-            label,
-            ha="center",
-            va="center",
-            fontsize=8,
-            color="black"
-        )
+    return mpatches.Patch(facecolor="lightgray" if hcs else "white", edgecolor="black",
+                          label=f"Blocks of up to {block_size} x {block_size} bays ({bays_x} x {bays_y} bays)")
 
-    # Add secondary labels to the left of the Y-axis
-    for i, label in enumerate(secondary_vertical_labels):
-        ax.text(
-            ax.get_xlim()[0] - 1,  # Offset to the left of the axis
-            secondary_yticks[i],
-            label,
-            ha="center",
-            va="center",
-            fontsize=8,
-            color="black"
-        )
+
+# Function to create a grid plot based on user inputs
+def create_grid_plot(length, width, s1, s2, live_load, selected_column, selected_beam, selected_slab, column_size_mm, column_weight_tonnes, b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm, slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm, use_collections=True, max_elements=None, elements=None):
+    """
+    Plot the structural grid, columns, beams, slabs, staircases and cranes.
+
+    With use_collections (default) each element family is drawn as a single
+    matplotlib collection; set it to False to draw one artist per element.
+
+    When the layout has more elements than max_elements (default
+    PLOT_ELEMENT_BUDGET) the floor plate is drawn as aggregated bay blocks with
+    thinned labels instead, so the cost of a plot is bounded for any footprint.
+
+    Detailed plots draw the columns, beams and panels of elements (an
+    ELEMENT_DTYPE array from geometry.layout_elements), built from the layout
+    when not given.
+    """
+    if max_elements is None:
+        max_elements = PLOT_ELEMENT_BUDGET
+    element_count = plot_element_count(length, width, s1, s2, column_size_mm, selected_slab, selected_beam)
+    detailed = element_count <= max_elements
+    if detailed and elements is None:
+        elements = layout_elements(length, width, s1, s2, column_size_mm, selected_beam, selected_slab,
+                                   b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm, slab_thickness_mm, hcs_slab_thickness_mm)
+    if detailed:
+        element_type = elements["type"]
+    
+    fig, ax = plt.subplots(figsize=(8, 6))
+
+    # Draw boundary
+    ax.plot([0, (length + 2* s1), (length + 2* s1), 0, 0], [0, 0, (width + 2 * s2), (width + 2 * s2), 0], color='black', linewidth=2)
+
+    if detailed:
+        # Draw grid lines
+        for x in np.arange(0, length + 2 * s1, s1):
+            ax.axvline(x, color='gray', linestyle='--', linewidth= 0.3, alpha=0.7)
+        for y in np.arange(0, width + 2 * s2, s2):
+            ax.axhline(y, color='gray', linestyle='--', linewidth= 0.3, alpha=0.7)
+    
+         # Set primary axis labels (distances) in between grid lines
+        xticks = np.arange(s1 / 2, length + 2 * s1, s1)  # Midpoints for X-axis
+        yticks = np.arange(s2 / 2, width + 2 * s2, s2)  # Midpoints for Y-axis
+        ax.set_xticks(xticks)
+        ax.set_xticklabels([f"{s1*1000}" for _ in xticks], rotation=90, fontsize=8)  # Distance labels
+        ax.set_yticks(yticks)
+        ax.set_yticklabels([f"{s2*1000}" for _ in yticks], fontsize=8)  # Distance labels
+        ax.yaxis.tick_right()
+
+
+        # Add secondary axis labels (ABCDE and 12345)
+        secondary_xticks = np.arange(0, length + 2 * s1, s1)  # Original gridline positions
+        secondary_yticks = np.arange(0, width + 2 * s2, s2)  # Original gridline positions
+        secondary_horizontal_labels = [grid_label(i) for i in range(len(secondary_xticks))]
+        secondary_vertical_labels = list(range(1, len(secondary_yticks) + 1))
+
+        # Add secondary labels above the X-axis
+        for i, label in enumerate(secondary_horizontal_labels):
+            ax.text(
+                secondary_xticks[i],
+                ax.get_ylim()[1],  # Offset above the axis
+                label,
+                ha="center",
+                va="center",
+                fontsize=8,
+                color="black"
+            )
+
+        # Add secondary labels to the left of the Y-axis
+        for i, label in enumerate(secondary_vertical_labels):
+            ax.text(
+                ax.get_xlim()[0] - 1,  # Offset to the left of the axis
+                secondary_yticks[i],
+                label,
+                ha="center",
+                va="center",
+                fontsize=8,
+                color="black"
+            )
+    else:
+        block_size = max(math.ceil(math.sqrt(2 * element_count / max_elements)), 2)
+        block_legend = plot_bay_blocks(ax, length, width, s1, s2, column_size_mm, selected_slab, block_size)
 
     # Remove tick lines
     ax.tick_params(axis="both", which="major", length=0)
@@ -229,14 +292,10 @@ def create_grid_plot(length, width, s1, s2, live_load, selected_column, selected
     ax.set_aspect('equal')
     
 
-    # Plot Columns
-    for x in np.arange(s1, length + 2 * s1, s1):
-        for y in np.arange(s2, width + 2 * s2, s2):
-            ax.fill([
-                x - column_size_mm/2, x + column_size_mm/2, x + column_size_mm/2, x - column_size_mm/2, x - column_size_mm/2
-            ], [
-                y - column_size_mm/2, y - column_size_mm/2, y + column_size_mm/2, y + column_size_mm/2, y - column_size_mm/2
-            ], color='black', linewidth=0.3)
+    # Plot Columns (aggregated plots draw them with the bay blocks)
+    if detailed:
+        add_polygon_array(ax, rectangle_polygons(elements[element_type == COLUMN]),
+                          use_collections, color='black', linewidth=0.3)
     
     if selected_column == "CIS Column":
         column_legend = mpatches.Patch(color='black', label=f"Column {column_size_mm*1000:.0f} x {column_size_mm*1000:.0f}mm ")
@@ -249,13 +308,14 @@ def create_grid_plot(length, width, s1, s2, live_load, selected_column, selected
             
     # Call secondary element plot function
     plot_staircase(ax, s1, s2, column_size_mm, length, width)
-    plot_crane(ax, width, length, s1, s2)
+    plot_crane(ax, width, length, s1, s2, detailed)
     
     # Plot Slab
     if selected_slab == "CIS Slab":
-        for x in np.arange(s1, length + s1, s1):
-            for y in np.arange(s2, width + s2, s2):        
-                ax.text(x + s1/2, y + s2/2, '~', fontsize=8, color='black', ha='center', va='center')
+        if detailed:
+            for x in np.arange(s1, length + s1, s1):
+                for y in np.arange(s2, width + s2, s2):        
+                    ax.text(x + s1/2, y + s2/2, '~', fontsize=8, color='black', ha='center', va='center')
     
         slab_legend = mpatches.Rectangle(
         (0, 0),  # Dummy position
@@ -267,76 +327,11 @@ def create_grid_plot(length, width, s1, s2, live_load, selected_column, selected
         )            
     
                 
-    if selected_slab == "1.2HC Slab":
-        # Rectangle dimensions in meters
-        rectangle_width = 1.2  # Width of each rectangle in meters
-        rectangle_length = s1  # Length of each rectangle in meters
-
-        # Calculate the starting y-coordinate range
-        y_positions = np.arange((s2 + 2*column_size_mm), width + s2, s2)  # Midpoints of y-grid
-
-        # Plot rectangles along both axes
-        for x in np.arange(s1 * 1.5, length + s1, s1):  # Iterate through x-grid positions
-            for y in y_positions:  # Iterate through y-grid positions
-                # Number of stacked rectangles
-                num_stacked_rectangles = int((s2 -column_size_mm) / rectangle_width)  # Number of rectangles to stack
-                
-                for i in range(num_stacked_rectangles):  # Iterate for stacking
-                    y_offset = i * rectangle_width  # Offset for stacking rectangles
-                    
-                    # Calculate the coordinates of each rectangle
-                    ax.fill(
-                        [
-                            x - rectangle_length / 2, x + rectangle_length / 2,  # Left and Right x-coordinates
-                            x + rectangle_length / 2, x - rectangle_length / 2,  # Close rectangle
-                        ],
-                        [
-                            y - rectangle_width / 2 + y_offset, y - rectangle_width / 2 + y_offset,  # Bottom y-coordinates
-                            y + rectangle_width / 2 + y_offset, y + rectangle_width / 2 + y_offset,  # Top y-coordinates
-                        ],
-                        color="lightgray", edgecolor="black", linewidth=0.5, alpha=0.7
-                    )
-        
-        slab_legend = mpatches.Rectangle(
-        (0, 0),  # Dummy position
-        width = 1,
-        height = 0.5,
-        edgecolor="black",
-        facecolor="lightgray",
-        alpha=0.7,
-        label=f"1.2m HCS {hcs_slab_thickness_mm:.0f} mm thick"
-        )    
-                    
-    if selected_slab == "2.4HC Slab":
-        # Rectangle dimensions in meters
-        rectangle_width = 2.4  # Width of each rectangle in meters
-        rectangle_length = s1  # Length of each rectangle in meters
-
-        # Calculate the starting y-coordinate range
-        y_positions = np.arange((s2 + 2*column_size_mm), width + s2, s2)  # Midpoints of y-grid
-
-        # Plot rectangles along both axes
-        for x in np.arange(s1 * 1.5, length + s1, s1):  # Iterate through x-grid positions
-            for y in y_positions:  # Iterate through y-grid positions
-                # Number of stacked rectangles
-                num_stacked_rectangles = int((s2) / rectangle_width)  # Number of rectangles to stack
-                
-                for i in range(num_stacked_rectangles):  # Iterate for stacking
-                    y_offset = i * rectangle_width  # Offset for stacking rectangles
-                    
-                    # Calculate the coordinates of each rectangle
-                    ax.fill(
-                        [
-                            x - rectangle_length / 2, x + rectangle_length / 2,  # Left and Right x-coordinates
-                            x + rectangle_length / 2, x - rectangle_length / 2,  # Close rectangle
-                        ],
-                        [
-                            y - rectangle_width / 2 + y_offset, y - rectangle_width / 2 + y_offset,  # Bottom y-coordinates
-                            y + rectangle_width / 2 + y_offset, y + rectangle_width / 2 + y_offset,  # Top y-coordinates
-                        ],
-                        color="lightgray", edgecolor="black", linewidth=0.5, alpha=0.7
-                    )
-                    
+    if selected_slab in HCS_SLABS:
+        # Plot the hollow core panels, stacked at each grid position
+        if detailed:
+            add_polygon_array(ax, rectangle_polygons(elements[element_type == HCS_PANEL], closed=False), use_collections, color="lightgray", edgecolor="black", linewidth=0.5, alpha=0.7)
+
         slab_legend = mpatches.Rectangle(
         (0, 0),  # Dummy position
         width = 1,
@@ -344,84 +339,21 @@ def create_grid_plot(length, width, s1, s2, live_load, selected_column, selected
         edgecolor="black",
         facecolor="lightgray",
         alpha=0.7,
-        label=f"2.4m HCS {hcs_slab_thickness_mm:.0f} mm thick"
-        )  
-        
-        
-    if selected_slab == "1.2HCS_S3":
-        # Rectangle dimensions in meters
-        rectangle_width = 1.2  # Width of each rectangle in meters
-        rectangle_length = (s1/2)  # Length of each rectangle in meters
-
-        # Calculate the starting y-coordinate range
-        y_positions = np.arange((s2 + 2*column_size_mm), width + s2, s2)  # Midpoints of y-grid
-
-        # Plot rectangles along both axes
-        for x in np.arange(s1 * 1.5, length + s1, s1/2):  # Iterate through x-grid positions
-            for y in y_positions:  # Iterate through y-grid positions
-                # Number of stacked rectangles
-                num_stacked_rectangles = int((s2 - column_size_mm) / rectangle_width)  # Number of rectangles to stack
-                
-                for i in range(num_stacked_rectangles):  # Iterate for stacking
-                    y_offset = i * rectangle_width  # Offset for stacking rectangles
-                    
-                    # Calculate the coordinates of each rectangle
-                    ax.fill(
-                        [
-                            x - rectangle_length, x + rectangle_length,  # Left and Right x-coordinates
-                            x + rectangle_length, x - rectangle_length,  # Close rectangle
-                        ],
-                        [
-                            y - rectangle_width / 2 + y_offset, y - rectangle_width / 2 + y_offset,  # Bottom y-coordinates
-                            y + rectangle_width / 2 + y_offset, y + rectangle_width / 2 + y_offset,  # Top y-coordinates
-                        ],
-                        color="lightgray", edgecolor="black", linewidth=0.5, alpha=0.7
-                    )
-
-        # Add the slab legend
-        slab_legend = mpatches.Rectangle(
-            (0, 0),  # Dummy position
-            width=1,
-            height=0.5,
-            edgecolor="black",
-            facecolor="lightgray",
-            alpha=0.7,
-            label=f"1.2m HCS {hcs_slab_thickness_mm:.0f} mm thick"
+        label=f"{selected_slab[:3]}m HCS {hcs_slab_thickness_mm:.0f} mm thick"
         )
 
-        # Plot the 'S3' columns within the same block
-        for x in np.arange(s1, length + s1, s1):
-            for y in np.arange(s2, width+s2, s2):        
-            
-                ax.plot([
-                    x - column_size_mm/2 + s1/2, x - column_size_mm/2+ s1/2, x + column_size_mm/2+ s1/2, x + column_size_mm/2+ s1/2, x - column_size_mm/2+ s1/2
-                ], [
-                    y + column_size_mm/2, y + column_size_mm/2 + s2, y + column_size_mm/2 + s2, y + column_size_mm/2, y + column_size_mm/2
-                ], color='black', linewidth=0.3, linestyle=':')
+    if selected_slab in ["1.2HCS_S3", "2.4HCS_S3"]:
+        # Plot the 'S3' beams within the same block
+        if detailed:
+            add_polygon_array(ax, beam_outline_polygons(elements[element_type == BEAM_S3], column_size_mm),
+                              use_collections, filled=False, color='black', linewidth=0.3, linestyle=':')
 
                 
     if selected_slab == "PT Flat Slab":
-        # Define the slab boundaries based on the grid
-        x_min_boundary = s1 - column_size_mm/2
-        x_max_boundary = length + s1 + column_size_mm/2
-        y_min_boundary = s2 - column_size_mm/2
-        y_max_boundary = width + s2 + column_size_mm/2
-
-        # Iterate through grid positions
-        for x in np.arange(s1, length + 2 * s1, s1):  # Iterate through x-grid positions
-            for y in np.arange(s2, width + 2 * s2, s2):  # Iterate through y-grid positions
-                # Calculate the coordinates of the drop panel
-                x_min = max(x - column_size_mm, x_min_boundary)  # Ensure the drop panel does not extend beyond the left boundary
-                x_max = min(x + column_size_mm, x_max_boundary)  # Ensure the drop panel does not extend beyond the right boundary
-                y_min = max(y - column_size_mm, y_min_boundary)  # Ensure the drop panel does not extend beyond the bottom boundary
-                y_max = min(y + column_size_mm, y_max_boundary)  # Ensure the drop panel does not extend beyond the top boundary
-
-                # Plot the adjusted drop panel
-                ax.plot(
-                    [x_min, x_max, x_max, x_min, x_min],  # Adjusted x-coordinates
-                    [y_min, y_min, y_max, y_max, y_min],  # Adjusted y-coordinates
-                    color='black', linewidth=0.3  # Define the color and line width of the square
-                )
+        if detailed:
+            # Drop panels around every column, clipped to the slab edge
+            add_polygon_array(ax, rectangle_polygons(elements[element_type == DROP_PANEL]),
+                              use_collections, filled=False, color='black', linewidth=0.3)
                 
         slab_legend = mpatches.Rectangle(
         (0, 0),  # Dummy position
@@ -448,37 +380,23 @@ def create_grid_plot(length, width, s1, s2, live_load, selected_column, selected
                 va='center',  # Vertical alignment
                 bbox=dict(boxstyle="round,pad=0.3", edgecolor="black", facecolor="white"))
         
+        if detailed:
             # Plot s1
-        for x in np.arange(s1, length+s1, s1):
-            for y in np.arange(s2, width + 2*s2, s2):        
-            
-                ax.plot([
-                    x + column_size_mm/2, x + column_size_mm/2, x + s1 - column_size_mm/2, x + s1 - column_size_mm/2, x + column_size_mm/2
-                ], [
-                    y - column_size_mm/2, y + column_size_mm/2, y + column_size_mm/2, y - column_size_mm/2, y - column_size_mm/2
-                ], color='black', linewidth=0.3, linestyle='--')
-            
+            add_polygon_array(ax, beam_outline_polygons(elements[element_type == BEAM_S1], column_size_mm),
+                              use_collections, filled=False, color='black', linewidth=0.3, linestyle='--')
+
             # Plot s2
-        for x in np.arange(s1, length + 2*s1, s1):
-            for y in np.arange(s2, width+s2, s2):        
-            
-                ax.plot([
-                    x - column_size_mm/2, x - column_size_mm/2, x + column_size_mm/2, x + column_size_mm/2, x - column_size_mm/2
-                ], [
-                    y + column_size_mm/2, y + column_size_mm/2 + s2, y + column_size_mm/2 + s2, y + column_size_mm/2, y + column_size_mm/2
-                ], color='black', linewidth=0.3, linestyle=':')
+            add_polygon_array(ax, beam_outline_polygons(elements[element_type == BEAM_S2], column_size_mm),
+                              use_collections, filled=False, color='black', linewidth=0.3, linestyle=':')
 
     #label Beams                
     if selected_beam in ["PT Flat Slab"]:
-        ax.plot([
-                    s1- column_size_mm/2, s1- column_size_mm/2, s1 + length + column_size_mm/2, s1 + length + column_size_mm/2, s1- column_size_mm/2
-                ], [
-                    s2 - column_size_mm/2, s2 + width + column_size_mm/2, s2 + width + column_size_mm/2, s2 - column_size_mm/2, s2 - column_size_mm/2
-                ], color='black', linewidth=0.6)
+        edge = flat_slab_edge(length, width, s1, s2, column_size_mm)
+        ax.plot(edge[:, 0], edge[:, 1], color='black', linewidth=0.6)
 
     
     # Add legend with the filled square
-    ax.legend(handles=[column_legend, slab_legend], loc='upper left',
+    ax.legend(handles=[column_legend, slab_legend] + ([] if detailed else [block_legend]), loc='upper left',
     bbox_to_anchor=(0.0, -0.2),  # Place the legend below the plot
     ncol=1,  # Arrange the legend entries in 2 columns
     fontsize=4)
@@ -0,0 +1,197 @@
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+from pipeline import add_scenario_arguments, create_result_plot, figure_to_png, run_pipeline, scenario_inputs
+
+
+class StackSampler:
+    """
+    Background thread sampling the Python stack of one thread at a fixed interval.
+
+    The samples are aggregated as collapsed stacks (root first, frames joined by
+    ";") which flamegraph.pl, speedscope and inferno read directly.
+    """
+
+    def __init__(self, thread_id=None, interval=0.001):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def frame_label(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(self.frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="dfma-stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self):
+        """
+        Return the samples in collapsed-stack format, one "stack count" per line.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileReport:
+    """
+    Everything captured from one profiled Generate run.
+
+    Attributes:
+    - result (dict): The run_pipeline result.
+    - png (bytes): The rendered grid plot.
+    - elapsed_s (float): Wall time of the run (with profiling overhead).
+    - peak_bytes (int): Peak traced Python memory during the run.
+    - pstats_bytes (bytes): cProfile statistics in the binary pstats format.
+    - stats_text (str): Top functions by cumulative time.
+    - allocations_text (str): Allocation sites that grew most over the run.
+    - collapsed_stacks (str): Sampled stacks for flame graphs.
+    """
+
+    def __init__(self, result, png, elapsed_s, peak_bytes, pstats_bytes, stats_text, allocations_text, collapsed_stacks):
+        self.result = result
+        self.png = png
+        self.elapsed_s = elapsed_s
+        self.peak_bytes = peak_bytes
+        self.pstats_bytes = pstats_bytes
+        self.stats_text = stats_text
+        self.allocations_text = allocations_text
+        self.collapsed_stacks = collapsed_stacks
+
+    def write(self, directory, prefix="dfma_profile"):
+        """
+        Write the pstats, allocation report and collapsed stacks into directory.
+
+        Returns:
+        - paths (list): The files written.
+        """
+        os.makedirs(directory, exist_ok=True)
+        files = {
+            f"{prefix}.pstats": self.pstats_bytes,
+            f"{prefix}_cumulative.txt": self.stats_text.encode(),
+            f"{prefix}_allocations.txt": self.allocations_text.encode(),
+            f"{prefix}.collapsed": self.collapsed_stacks.encode(),
+        }
+        paths = []
+        for name, data in files.items():
+            path = os.path.join(directory, name)
+            with open(path, "wb") as f:
+                f.write(data)
+            paths.append(path)
+        return paths
+
+
+def allocation_report(before, after, peak_bytes, top_n=25):
+    """
+    Format the top_n allocation sites that grew between two tracemalloc snapshots.
+    """
+    stats = after.compare_to(before, "lineno")
+    growth = sum(stat.size_diff for stat in stats)
+    lines = [f"Peak traced memory during run: {peak_bytes / 1024:.1f} KiB", f"Net growth over the run: {growth / 1024:.1f} KiB", ""]
+    for index, stat in enumerate(stats[:top_n], 1):
+        frame = stat.traceback[0]
+        lines.append(f"#{index}: {frame.filename}:{frame.lineno}: {stat.size_diff / 1024:+.1f} KiB "
+                     f"({stat.size / 1024:.1f} KiB in {stat.count} blocks)")
+    return "\n".join(lines) + "\n"
+
+
+def profile_run(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f, top_n=25, sample_interval=0.001):
+    """
+    Profile one uncached Generate run, from column sizing to the rendered PNG.
+
+    The run is executed under cProfile and tracemalloc while a sampler thread
+    records the stack for a flame graph. The pipeline cache is bypassed so the
+    capture always reflects real work.
+
+    Parameters:
+    - length, width (float): Snapped building dimensions, as for run_pipeline.
+    - top_n (int): Entries in the cumulative-time and allocation reports.
+    - sample_interval (float): Seconds between stack samples.
+
+    Returns:
+    - report (ProfileReport)
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    before = tracemalloc.take_snapshot().filter_traces(ignore)
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    sampler = StackSampler(interval=sample_interval)
+
+    sampler.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        result = run_pipeline(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f)
+        png = figure_to_png(create_result_plot(result))
+    finally:
+        profiler.disable()
+        elapsed_s = time.perf_counter() - start
+        sampler.stop()
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        if not was_tracing:
+            tracemalloc.stop()
+
+    stats_stream = io.StringIO()
+    pstats.Stats(profiler, stream=stats_stream).sort_stats("cumulative").print_stats(top_n)
+
+    # pstats can only be serialised through a file
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "run.pstats")
+        profiler.dump_stats(path)
+        with open(path, "rb") as f:
+            pstats_bytes = f.read()
+
+    return ProfileReport(result, png, elapsed_s, peak_bytes, pstats_bytes, stats_stream.getvalue(),
+                         allocation_report(before, after, peak_bytes, top_n), sampler.collapsed())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile one DfMA Generate run (cProfile, tracemalloc and a stack sampler).")
+    add_scenario_arguments(parser)
+    parser.add_argument("--top", type=int, default=25, help="Entries in the text reports (default: 25)")
+    parser.add_argument("--cold", action="store_true", help="Profile the first run, including imports and catalogue loading")
+    parser.add_argument("--output-dir", default="profiles", help="Directory for the report files (default: profiles)")
+    args = parser.parse_args(argv)
+
+    scenario = scenario_inputs(args)
+    if not args.cold:
+        # Warm up imports, catalogues and fonts so the capture matches a live server
+        figure_to_png(create_result_plot(run_pipeline(*scenario)))
+    report = profile_run(*scenario, top_n=args.top)
+    for path in report.write(args.output_dir):
+        print(path)
+    print(f"{report.elapsed_s:.3f} s, peak {report.peak_bytes / 1024 / 1024:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+import argparse
+import heapq
+import sys
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from metrics import stage_timer
+
+# Multi-storey programme from the per-floor manhours of calculate_layout_outputs.
+# Every floor is split into zones; in each zone the columns, beams, slab and
+# casting follow each other, and the columns of a zone start once the same
+# zone of the floor below is cast. Staircases and ramps of a floor follow the
+# casting of all its zones. Each trade has a limited number of crews, and an
+# activity takes one crew of its trade for its whole duration.
+#
+# The critical path without crew limits comes from a forward and a backward
+# pass in topological order (Kahn's algorithm). The crew-limited schedule is
+# built by list scheduling: activities whose predecessors are all scheduled
+# wait on a heap ordered by their latest start, and each is started as soon
+# as its predecessors are finished and a crew of its trade is free.
+
+TRADES = ("column", "beam", "slab", "casting", "stairs")
+
+TRADE_LABELS = {
+    "column": "Columns",
+    "beam": "Beams",
+    "slab": "Slab",
+    "casting": "Casting",
+    "stairs": "Staircase & ramp",
+}
+
+# Workers per crew of each trade
+DEFAULT_CREW_SIZES = {"column": 6, "beam": 8, "slab": 8, "casting": 6, "stairs": 4}
+
+# Weather allowance and staircase/ramp manhours per floor, as in total_mandays_crane
+WEATHER_FACTOR = 1.3
+STAIRS_MANHOURS = 240
+
+GANTT_COLUMNS = ["activity", "floor", "zone", "trade", "start_day", "finish_day", "duration_days", "crew",
+                 "manhours", "total_float_days", "critical"]
+
+
+class ActivityNetwork:
+    """
+    Activities of a multi-storey programme and their precedences.
+
+    Attributes:
+    - floor (ndarray): Floor of each activity (1 = lowest).
+    - zone (ndarray): Zone of each activity (1-based, 0 for whole-floor activities).
+    - trade (ndarray): Index of each activity's trade in TRADES.
+    - manhours (ndarray): Work of each activity, weather allowance included.
+    - predecessors (list): Indices of the predecessors of each activity.
+    """
+
+    def __init__(self, floor, zone, trade, manhours, predecessors):
+        self.floor = floor
+        self.zone = zone
+        self.trade = trade
+        self.manhours = manhours
+        self.predecessors = predecessors
+
+    def __len__(self):
+        return len(self.floor)
+
+    def names(self):
+        return [f"{TRADE_LABELS[TRADES[t]]} L{f}" + (f" Z{z}" if z else "")
+                for f, z, t in zip(self.floor.tolist(), self.zone.tolist(), self.trade.tolist())]
+
+
+def build_network(outputs, storeys, zones=1):
+    """
+    Expand the per-floor manhours of a layout into a multi-storey activity network.
+
+    Parameters:
+    - outputs (LayoutOutputs): See output_data.calculate_layout_outputs.
+    - storeys (int): Floors to build.
+    - zones (int): Zones per floor; each zone carries an equal share of the
+      floor's column, beam, slab and casting manhours.
+
+    Returns:
+    - network (ActivityNetwork)
+    """
+    zone_manhours = [WEATHER_FACTOR * hours / zones for hours in
+                     (outputs.column_manhours, outputs.beam_manhours, outputs.slab_manhours, outputs.casting_manhours)]
+    # Trades with work in each zone, in the order they follow each other
+    zone_trades = [t for t, hours in enumerate(zone_manhours) if hours > 0]
+
+    floor, zone, trade, manhours, predecessors = [], [], [], [], []
+    cast = [None] * zones
+    for f in range(1, storeys + 1):
+        floor_cast = []
+        for z in range(zones):
+            previous = cast[z]
+            for t in zone_trades:
+                floor.append(f)
+                zone.append(z + 1)
+                trade.append(t)
+                manhours.append(zone_manhours[t])
+                predecessors.append([] if previous is None else [previous])
+                previous = len(floor) - 1
+            cast[z] = previous
+            if previous is not None:
+                floor_cast.append(previous)
+        floor.append(f)
+        zone.append(0)
+        trade.append(TRADES.index("stairs"))
+        manhours.append(STAIRS_MANHOURS)
+        predecessors.append(floor_cast)
+
+    return ActivityNetwork(np.array(floor), np.array(zone), np.array(trade), np.array(manhours, dtype=float), predecessors)
+
+
+def topological_order(predecessors):
+    """
+    Activities ordered so that every activity follows its predecessors (Kahn's algorithm).
+    """
+    n = len(predecessors)
+    successors = [[] for _ in range(n)]
+    waiting = [len(p) for p in predecessors]
+    for activity, preds in enumerate(predecessors):
+        for p in preds:
+            successors[p].append(activity)
+    ready = deque(a for a in range(n) if not waiting[a])
+    order = []
+    while ready:
+        activity = ready.popleft()
+        order.append(activity)
+        for s in successors[activity]:
+            waiting[s] -= 1
+            if not waiting[s]:
+                ready.append(s)
+    if len(order) != n:
+        raise ValueError("The activity network has a cycle")
+    return order, successors
+
+
+def critical_path(durations, predecessors):
+    """
+    Earliest and latest starts of every activity without crew limits.
+
+    Parameters:
+    - durations (sequence): Duration of each activity.
+    - predecessors (list): Indices of the predecessors of each activity.
+
+    Returns:
+    - early_start (ndarray), late_start (ndarray): Per activity.
+    - duration (float): Length of the critical path.
+    """
+    order, successors = topological_order(predecessors)
+    durations = list(durations)
+    early_finish = [0.0] * len(durations)
+    early_start = [0.0] * len(durations)
+    for activity in order:
+        start = max((early_finish[p] for p in predecessors[activity]), default=0.0)
+        early_start[activity] = start
+        early_finish[activity] = start + durations[activity]
+    total = max(early_finish, default=0.0)
+    late_start = [0.0] * len(durations)
+    for activity in reversed(order):
+        finish = min((late_start[s] for s in successors[activity]), default=total)
+        late_start[activity] = finish - durations[activity]
+    return np.array(early_start), np.array(late_start), total
+
+
+def schedule_network(network, crews=None, crew_sizes=None, hours_per_day=8.0):
+    """
+    Crew-limited schedule of an activity network, as a Gantt table.
+
+    Parameters:
+    - network (ActivityNetwork): See build_network.
+    - crews (dict): Crews available per trade, at least 1 (default 1 each);
+      ValueError otherwise.
+    - crew_sizes (dict): Workers per crew of each trade (default
+      DEFAULT_CREW_SIZES).
+    - hours_per_day (float): Working hours per day.
+
+    Returns:
+    - gantt (DataFrame): One row per activity (GANTT_COLUMNS), in start
+      order. Days are working days from the start of the programme; crew is
+      the crew of the trade doing the activity; total_float_days is the slack
+      without crew limits; critical marks the chain of activities and crew
+      hand-overs that sets the finish of the crew-limited programme.
+    - summary (dict): activities, critical_path_days (without crew limits)
+      and duration_days (with them).
+    """
+    crews = {trade: 1 for trade in TRADES} | (crews or {})
+    crew_sizes = DEFAULT_CREW_SIZES | (crew_sizes or {})
+    for trade in TRADES:
+        if crews[trade] < 1:
+            raise ValueError(f"At least one {trade} crew is needed")
+        if crew_sizes[trade] <= 0:
+            raise ValueError(f"The {trade} crew size must be positive")
+    n = len(network)
+    predecessors = network.predecessors
+    trades = network.trade.tolist()
+    day_hours = np.array([crew_sizes[trade] * hours_per_day for trade in TRADES])
+    durations = (network.manhours / day_hours[network.trade]).tolist()
+
+    with stage_timer("schedule"):
+        early_start, late_start, critical_days = critical_path(durations, predecessors)
+        _, successors = topological_order(predecessors)
+
+        # Crews of each trade as (free from, crew, last activity) heaps
+        free = [[(0.0, c, -1) for c in range(crews[trade])] for trade in TRADES]
+        waiting = [len(p) for p in predecessors]
+        ready = [(late_start[a], a) for a in range(n) if not waiting[a]]
+        heapq.heapify(ready)
+        start = [0.0] * n
+        finish = [0.0] * n
+        crew = [0] * n
+        driver = [-1] * n
+        late_start_list = late_start.tolist()
+        while ready:
+            _, activity = heapq.heappop(ready)
+            preds = predecessors[activity]
+            ready_at, driven_by = 0.0, -1
+            for p in preds:
+                if finish[p] > ready_at:
+                    ready_at, driven_by = finish[p], p
+            crew_free, crew_number, crew_last = heapq.heappop(free[trades[activity]])
+            if crew_free > ready_at:
+                ready_at, driven_by = crew_free, crew_last
+            start[activity] = ready_at
+            finish[activity] = ready_at + durations[activity]
+            crew[activity] = crew_number + 1
+            driver[activity] = driven_by
+            heapq.heappush(free[trades[activity]], (finish[activity], crew_number, activity))
+            for s in successors[activity]:
+                waiting[s] -= 1
+                if not waiting[s]:
+                    heapq.heappush(ready, (late_start_list[s], s))
+
+        # Critical chain: back from the last activity to finish through what held each start
+        critical = np.zeros(n, dtype=bool)
+        activity = int(np.argmax(finish)) if n else -1
+        while activity >= 0:
+            critical[activity] = True
+            activity = driver[activity]
+
+    gantt = pd.DataFrame({
+        "activity": network.names(),
+        "floor": network.floor,
+        "zone": network.zone,
+        "trade": [TRADES[t] for t in trades],
+        "start_day": start,
+        "finish_day": finish,
+        "duration_days": durations,
+        "crew": crew,
+        "manhours": network.manhours,
+        "total_float_days": np.maximum(late_start - early_start, 0.0).round(9),
+        "critical": critical,
+    })
+    gantt = gantt.sort_values(["start_day", "floor", "zone"], kind="stable").reset_index(drop=True)
+    summary = {
+        "activities": n,
+        "critical_path_days": critical_days,
+        "duration_days": max(finish, default=0.0),
+    }
+    return gantt, summary
+
+
+def schedule_building(result, storeys=None, zones=None, crews=None, crew_sizes=None, hours_per_day=8.0):
+    """
+    Multi-storey schedule for a run_pipeline result.
+
+    Parameters:
+    - result (dict): See pipeline.run_pipeline.
+    - storeys (int): Floors to build (default: the storeys the columns were
+      sized for).
+    - zones (int): Zones per floor (default: one per tower crane).
+    - Other parameters as schedule_network.
+
+    Returns:
+    - gantt (DataFrame), summary (dict): See schedule_network.
+    """
+    outputs = result["outputs"]
+    if storeys is None:
+        storeys = result.get("storeys", 5)
+    if zones is None:
+        zones = max(int(outputs.no_tower_cranes), 1)
+    network = build_network(outputs, storeys, zones)
+    return schedule_network(network, crews, crew_sizes, hours_per_day)
+
+
+def main(argv=None):
+    from pipeline import add_scenario_arguments, scenario_result
+
+    parser = argparse.ArgumentParser(description="Crew-limited multi-storey programme for one DfMA scenario, as a Gantt table.")
+    add_scenario_arguments(parser)
+    parser.add_argument("--storeys", type=int, default=5, help="Storeys built (and carried by the columns)")
+    parser.add_argument("--zones", type=int, help="Zones per floor (default: one per tower crane)")
+    parser.add_argument("--crews", action="append", default=[], metavar="TRADE=N",
+                        help=f"Crews of a trade ({', '.join(TRADES)}; default 1 each, repeatable)")
+    parser.add_argument("--crew-size", action="append", default=[], metavar="TRADE=N", help="Workers per crew of a trade (repeatable)")
+    parser.add_argument("--output", help="Write the Gantt table to this CSV file")
+    args = parser.parse_args(argv)
+
+    def trade_counts(option, specs):
+        counts = {}
+        for spec in specs:
+            trade, _, count = spec.partition("=")
+            if trade not in TRADES:
+                parser.error(f"unknown trade {trade!r}; choose from {', '.join(TRADES)}")
+            try:
+                counts[trade] = int(count)
+            except ValueError:
+                parser.error(f"{option} {spec}: the count must be a whole number")
+            if counts[trade] < 1:
+                parser.error(f"{option} {spec}: the count must be at least 1")
+        return counts
+
+    result = scenario_result(args, storeys=args.storeys)
+    gantt, summary = schedule_building(result, args.storeys, args.zones, trade_counts("--crews", args.crews),
+                                       trade_counts("--crew-size", args.crew_size))
+    if args.output:
+        gantt.to_csv(args.output, index=False)
+    else:
+        print(gantt[gantt["critical"]].round(2).to_string(index=False))
+        print()
+    print(f"{summary['activities']} activities; {summary['duration_days']:.1f} working days with crew limits, "
+          f"{summary['critical_path_days']:.1f} without")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
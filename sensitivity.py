@@ -0,0 +1,244 @@
+import argparse
+import inspect
+import sys
+from dataclasses import fields
+
+import numpy as np
+import pandas as pd
+
+from column_rc import calculate_column_size_batch
+from beam_rc import calculate_beam_size_batch
+from slab_rc import calculate_slab_thickness, hcs_selected_slab_check
+from output_data import HOIST_HOURS, ProductivityRates, RebarRatios, calculate_layout_outputs_batch, get_productivity_rates
+from pipeline import add_scenario_arguments, scenario_inputs
+from parallel import create_executor, imap_ordered
+
+# Outputs whose drivers are analysed
+SENSITIVITY_OUTPUTS = ("total_mandays_crane", "floor_cycle_days")
+
+RATE_PARAMETERS = tuple(f.name for f in fields(ProductivityRates) if f.name != "all_rates")
+REBAR_PARAMETERS = tuple(f"rebar_{f.name}" for f in fields(RebarRatios))
+# Beam sizing factors (gamma_s does not enter the beam sizes, so it is left out)
+BEAM_PARAMETERS = ("beam_dead_load", "k_con", "k_pt", "gamma_c", "gamma_DL", "gamma_LL")
+COLUMN_PARAMETERS = ("column_dead_load",)
+
+PARAMETERS = RATE_PARAMETERS + ("hoist_hours",) + REBAR_PARAMETERS + BEAM_PARAMETERS + COLUMN_PARAMETERS
+
+
+def nominal_values(rates=None):
+    """
+    Current value of every parameter in PARAMETERS: the productivity rates, the
+    crane time per hoist, the rebar percentages and the sizing defaults.
+    """
+    rates = rates or get_productivity_rates()
+    beam_defaults = inspect.signature(calculate_beam_size_batch).parameters
+    values = {name: getattr(rates, name) for name in RATE_PARAMETERS}
+    values["hoist_hours"] = HOIST_HOURS
+    values.update({f"rebar_{f.name}": f.default for f in fields(RebarRatios)})
+    values["beam_dead_load"] = beam_defaults["dead_load"].default
+    for name in BEAM_PARAMETERS[1:]:
+        values[name] = beam_defaults[name].default
+    values["column_dead_load"] = inspect.signature(calculate_column_size_batch).parameters["dead_load"].default
+    return {name: float(values[name]) for name in PARAMETERS}
+
+
+def parameter_bounds(spread=0.2, names=PARAMETERS, rates=None):
+    """
+    Bounds of ±spread around the nominal value of each parameter.
+
+    Returns:
+    - bounds (DataFrame): "nominal", "low" and "high" per parameter.
+    """
+    nominal = nominal_values(rates)
+    return pd.DataFrame({
+        "nominal": [nominal[name] for name in names],
+        "low": [nominal[name] * (1 - spread) for name in names],
+        "high": [nominal[name] * (1 + spread) for name in names],
+    }, index=list(names))
+
+
+def evaluate_parameter_sets(scenario, names, values):
+    """
+    Evaluate the sensitivity outputs of one scenario for many parameter sets at once.
+
+    Parameters:
+    - scenario (tuple): (column, beam, slab, s1, s2, live_load, length, width, f2f),
+      with the snapped building dimensions.
+    - names (list): Parameter names, one per column of values; the other
+      parameters keep their nominal value.
+    - values (ndarray): One row per parameter set.
+
+    Returns:
+    - outputs (ndarray): One row per parameter set, one column per SENSITIVITY_OUTPUTS entry.
+    """
+    selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f = scenario
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    p = {name: np.full(n, value) for name, value in nominal_values().items()}
+    p.update({name: values[:, i] for i, name in enumerate(names)})
+
+    # The slab type and thickness depend on none of the parameters
+    effective_slab = hcs_selected_slab_check(s1, live_load, selected_slab)
+    slab_sizes = calculate_slab_thickness(s1, s2, live_load, effective_slab)
+    s1_array = np.full(n, float(s1))
+
+    column_size_mm, _ = calculate_column_size_batch(s1_array, s2, live_load, selected_column, f2f, dead_load=p["column_dead_load"])
+    beam_sizes = calculate_beam_size_batch(
+        s1_array, s2, live_load, column_size_mm, selected_beam, effective_slab, dead_load=p["beam_dead_load"],
+        k_con=p["k_con"], k_pt=p["k_pt"], gamma_c=p["gamma_c"], gamma_DL=p["gamma_DL"], gamma_LL=p["gamma_LL"])
+    rates = ProductivityRates(**{name: p[name] for name in RATE_PARAMETERS})
+    rebar_ratios = RebarRatios(**{f.name: p[f"rebar_{f.name}"] for f in fields(RebarRatios)})
+
+    outputs = calculate_layout_outputs_batch(
+        s1_array, s2, live_load, column_size_mm, selected_column, selected_beam, effective_slab, length, width,
+        *beam_sizes, *slab_sizes, f2f, rates=rates, rebar_ratios=rebar_ratios)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # As LayoutOutputs.floor_cycle_days, with the sampled crane time per hoist
+        floor_cycle_days = np.round(1.3*p["hoist_hours"]*outputs.hoist_count_tower_crane/outputs.no_tower_cranes/8, 2)
+    return np.column_stack([outputs.total_mandays_crane, floor_cycle_days])
+
+
+def _evaluate_shard(task):
+    return evaluate_parameter_sets(*task)
+
+
+def evaluate_sharded(scenario, names, values, workers=1, shard_size=50_000):
+    """
+    evaluate_parameter_sets over shards of values, on a process pool when
+    workers > 1. Results are returned in input order.
+    """
+    shards = [(scenario, names, values[start:start + shard_size]) for start in range(0, len(values), shard_size)]
+    if workers <= 1 or len(shards) <= 1:
+        return np.concatenate([_evaluate_shard(task) for task in shards])
+    with create_executor(workers) as executor:
+        return np.concatenate(list(imap_ordered(executor, _evaluate_shard, shards, 2 * workers)))
+
+
+def morris_trajectories(k, trajectories, levels=4, rng=None):
+    """
+    Morris one-at-a-time trajectories in the unit hypercube.
+
+    Returns:
+    - points (ndarray): Shape (trajectories, k + 1, k); consecutive points differ in one input.
+    - steps (ndarray): Shape (trajectories, k), the signed step taken at each move.
+    - order (ndarray): Shape (trajectories, k), the input changed at each move.
+    """
+    rng = rng or np.random.default_rng()
+    delta = levels / (2 * (levels - 1))
+    grid = np.arange(levels) / (levels - 1)
+
+    signs = rng.choice([-1.0, 1.0], size=(trajectories, k))
+    # Start low when stepping up and high when stepping down, so every point stays in [0, 1]
+    base = rng.choice(grid[grid <= 1 - delta + 1e-12], size=(trajectories, k))
+    base = np.where(signs < 0, base + delta, base)
+    order = np.argsort(rng.random((trajectories, k)), axis=1)
+
+    points = np.repeat(base[:, None, :], k + 1, axis=1)
+    steps = np.take_along_axis(signs, order, axis=1) * delta
+    rows = np.arange(trajectories)
+    for j in range(k):
+        # Move j changes one input for this point and every later one
+        points[rows, j + 1:, order[:, j]] += steps[:, j][:, None]
+    return points, steps, order
+
+
+def morris(scenario, spread=0.2, trajectories=50, levels=4, names=PARAMETERS, seed=None, workers=1):
+    """
+    Morris elementary-effects screening of the SENSITIVITY_OUTPUTS.
+
+    Every parameter is varied uniformly within ±spread of its nominal value;
+    elementary effects are expressed per full range of the parameter, so they
+    compare directly across parameters.
+
+    Returns:
+    - indices (DataFrame): mu_star (mean absolute effect), mu and sigma per
+      output and parameter, most influential first.
+    - evaluations (int): Number of model evaluations.
+    """
+    rng = np.random.default_rng(seed)
+    k = len(names)
+    bounds = parameter_bounds(spread, names)
+    points, steps, order = morris_trajectories(k, trajectories, levels, rng)
+    unit = points.reshape(-1, k)
+    y = evaluate_sharded(scenario, list(names), bounds["low"].to_numpy() + unit * (bounds["high"] - bounds["low"]).to_numpy(), workers)
+    y = y.reshape(trajectories, k + 1, len(SENSITIVITY_OUTPUTS))
+
+    effects = np.empty((trajectories, k, len(SENSITIVITY_OUTPUTS)))
+    rows = np.arange(trajectories)[:, None]
+    effects[rows, order] = (y[:, 1:, :] - y[:, :-1, :]) / steps[:, :, None]
+
+    frames = []
+    for o, output in enumerate(SENSITIVITY_OUTPUTS):
+        frames.append(pd.DataFrame({
+            "output": output,
+            "parameter": list(names),
+            "mu_star": np.abs(effects[:, :, o]).mean(axis=0),
+            "mu": effects[:, :, o].mean(axis=0),
+            "sigma": effects[:, :, o].std(axis=0, ddof=1) if trajectories > 1 else np.nan,
+        }))
+    indices = pd.concat(frames, ignore_index=True).sort_values(["output", "mu_star"], ascending=[True, False])
+    return indices.reset_index(drop=True), len(unit)
+
+
+def sobol(scenario, spread=0.2, samples=1024, names=PARAMETERS, seed=None, workers=1):
+    """
+    Variance-based (Sobol) sensitivity indices of the SENSITIVITY_OUTPUTS.
+
+    Uses the Saltelli design (matrices A, B and A with column i from B, for
+    samples * (k + 2) evaluations), the Saltelli (2010) estimator for first-order
+    indices and the Jansen estimator for total-order indices.
+
+    Returns:
+    - indices (DataFrame): S1 and ST per output and parameter, largest ST first.
+    - evaluations (int): Number of model evaluations.
+    """
+    rng = np.random.default_rng(seed)
+    k = len(names)
+    bounds = parameter_bounds(spread, names)
+    low, width = bounds["low"].to_numpy(), (bounds["high"] - bounds["low"]).to_numpy()
+
+    a = rng.random((samples, k))
+    b = rng.random((samples, k))
+    ab = np.repeat(a[None, :, :], k, axis=0)
+    ab[np.arange(k), :, np.arange(k)] = b.T
+    design = np.concatenate([a, b, ab.reshape(-1, k)])
+    y = evaluate_sharded(scenario, list(names), low + design * width, workers)
+
+    # Centring the outputs leaves the estimators unbiased and reduces their variance
+    y = y - np.concatenate([y[:samples], y[samples:2 * samples]]).mean(axis=0)
+    y_a, y_b = y[:samples], y[samples:2 * samples]
+    y_ab = y[2 * samples:].reshape(k, samples, -1)
+    variance = np.var(np.concatenate([y_a, y_b]), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        first = np.mean(y_b[None] * (y_ab - y_a[None]), axis=1) / variance
+        total = 0.5 * np.mean((y_a[None] - y_ab) ** 2, axis=1) / variance
+
+    frames = []
+    for o, output in enumerate(SENSITIVITY_OUTPUTS):
+        frames.append(pd.DataFrame({"output": output, "parameter": list(names), "S1": first[:, o], "ST": total[:, o]}))
+    indices = pd.concat(frames, ignore_index=True).sort_values(["output", "ST"], ascending=[True, False])
+    return indices.reset_index(drop=True), len(design)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sobol or Morris sensitivity of mandays and floor cycle to rates and design parameters.")
+    parser.add_argument("--method", choices=("morris", "sobol"), default="sobol")
+    add_scenario_arguments(parser)
+    parser.add_argument("--spread", type=float, default=0.2, help="Relative range of every parameter (default: 0.2)")
+    parser.add_argument("--samples", type=int, default=1024, help="Sobol base samples or Morris trajectories (default: 1024)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--workers", type=int, default=1, help="Processes to shard the evaluations over (default: 1)")
+    args = parser.parse_args(argv)
+
+    scenario = scenario_inputs(args)
+    if args.method == "sobol":
+        indices, evaluations = sobol(scenario, args.spread, args.samples, seed=args.seed, workers=args.workers)
+    else:
+        indices, evaluations = morris(scenario, args.spread, args.samples, seed=args.seed, workers=args.workers)
+    print(f"{evaluations} evaluations")
+    print(indices.round(4).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,95 @@
 import math
+from bisect import bisect_left
+import numpy as np
 import pandas as pd
+from file_cache import load_cached
+
+
+class HCSCatalog:
+    """
+    Hollow core slab catalogue parsed once and indexed for thickness lookups.
+
+    The maximum span is pre-indexed per (load capacity, thickness). For every load
+    capacity the "reach" table holds the longest span achievable with a slab no
+    thicker than each catalogue thickness, using only rows rated for at least that
+    capacity. The minimum thickness for span s at load q is then two bisections.
+    """
+    __slots__ = ("data", "load_capacities", "thicknesses", "max_span", "weights_kgm2", "_reach", "_reach_rows", "_capacity_list")
+
+    def __init__(self, data):
+        self.data = data
+        spans = data['s1'].to_numpy(dtype=float)
+        capacities = data['hcs_load_capacity'].to_numpy(dtype=float)
+        thickness = data['hcs_thickness'].to_numpy()
+
+        self.load_capacities = np.unique(capacities)
+        self.thicknesses = np.unique(thickness)
+
+        # Max span for each exact (load capacity, thickness) pair, -inf where absent
+        max_span = np.full((len(self.load_capacities), len(self.thicknesses)), -np.inf)
+        np.maximum.at(max_span, (np.searchsorted(self.load_capacities, capacities), np.searchsorted(self.thicknesses, thickness)), spans)
+        self.max_span = max_span
+
+        # Self-weight of each thickness (kg/m²)
+        weights_kgm2 = np.full(len(self.thicknesses), np.nan)
+        weights_kgm2[np.searchsorted(self.thicknesses, thickness)] = data['hcs_weight_kgm2'].to_numpy(dtype=float)
+        self.weights_kgm2 = weights_kgm2
+
+        # Rows rated for at least each capacity (suffix max), then best span up to each thickness
+        reach = np.maximum.accumulate(max_span[::-1], axis=0)[::-1]
+        reach = np.maximum.accumulate(reach, axis=1)
+        # Extra row for loads above every rated capacity
+        self._reach = np.vstack([reach, np.full(len(self.thicknesses), -np.inf)])
+        self._reach_rows = self._reach.tolist()
+        self._capacity_list = self.load_capacities.tolist()
+
+    def min_thickness(self, span, live_load):
+        """
+        Minimum catalogue thickness (mm) with span >= span and load capacity >= live_load,
+        or None if no entry qualifies.
+        """
+        row = self._reach_rows[bisect_left(self._capacity_list, live_load)]
+        j = bisect_left(row, span)
+        return self.thicknesses[j].item() if j < len(row) else None
+
+    def min_thickness_batch(self, span, live_load):
+        """
+        Vectorised min_thickness; returns a float array with NaN where no entry qualifies.
+        """
+        span, live_load = np.broadcast_arrays(np.asarray(span, dtype=float), np.asarray(live_load, dtype=float))
+        rows = self._reach[np.searchsorted(self.load_capacities, live_load, side="left")]
+        j = (rows < span[..., None]).sum(axis=-1)
+        return np.append(self.thicknesses.astype(float), np.nan)[j]
+
+    def weight_kgm2(self, thickness):
+        """
+        Self-weight (kg/m²) of a catalogue thickness (mm), or None if it is not in the catalogue.
+        """
+        j = np.searchsorted(self.thicknesses, thickness)
+        if j < len(self.thicknesses) and self.thicknesses[j] == thickness:
+            return self.weights_kgm2[j].item()
+        return None
 
-def hcs_selected_slab_check(s1, live_load, selected_slab):
-    # Read HCS data
-    file_name_hcs = "hcs_data.csv"
-    hcsdata = pd.read_csv(file_name_hcs)
-    
-    def find_min_hcs_thickness(s1, live_load):
-        # Filter HCS data based on span and load capacity
-        filtered_data = hcsdata[(hcsdata['s1'] >= s1) & (hcsdata['hcs_load_capacity'] >= live_load)]
-        return filtered_data['hcs_thickness'].min() if not filtered_data.empty else None
 
+def _load_hcs_catalog(path):
+    return HCSCatalog(pd.read_csv(path, skipinitialspace=True))
+
+
+def get_hcs_catalog(file_name="hcs_data.csv"):
+    """
+    Return the shared HCSCatalog, reloading it only when the CSV file changes.
+    """
+    return load_cached(file_name, _load_hcs_catalog)
+
+
+def hcs_selected_slab_check(s1, live_load, selected_slab):
     # If selected slab is in the given list, return the same value
     if selected_slab in ["CIS Slab", "PT Flat Slab"]:
         return selected_slab
 
+    # Shared HCS catalogue
+    find_min_hcs_thickness = get_hcs_catalog().min_thickness
+
     # For "1.2HC Slab" and "2.4HC Slab", check HCS thickness and possibly update slab type
     if selected_slab == "1.2HC Slab":
         hcs_slab_thickness_mm = find_min_hcs_thickness(s1, live_load)
@@ -57,10 +132,6 @@ def calculate_slab_thickness(s1, s2, live_load, selected_slab):
     slab_max_spacing_pt_mm = 0
     hcs_slab_thickness_mm = 0
 
-    # Read HCS data
-    file_name_hcs = "hcs_data.csv"
-    hcsdata = pd.read_csv(file_name_hcs)
-
     if selected_slab == "CIS Slab":
         # Step 1: Set parameters
         R_max = 25  # Base ratio for the lightest load
@@ -110,10 +181,8 @@ def calculate_slab_thickness(s1, s2, live_load, selected_slab):
         slab_max_spacing_pt_mm = math.floor(slab_max_spacing_pt_mm / 50) * 50
 
     elif selected_slab in ["1.2HC Slab", "2.4HC Slab", "1.2HCS_S3", "2.4HCS_S3"]:
-        # Function to find minimum thickness for a given span
-        def find_min_hcs_thickness(s1, live_load):
-            filtered_data = hcsdata[(hcsdata['s1'] >= s1) & (hcsdata['hcs_load_capacity'] >= live_load)]
-            return filtered_data['hcs_thickness'].min() if not filtered_data.empty else None
+        # Minimum thickness for a given span from the shared HCS catalogue
+        find_min_hcs_thickness = get_hcs_catalog().min_thickness
 
         # First attempt with full span s1
         hcs_slab_thickness_mm = find_min_hcs_thickness(s1, live_load)
@@ -130,3 +199,90 @@ def calculate_slab_thickness(s1, s2, live_load, selected_slab):
         slab_max_spacing_pt_mm = 0
 
     return slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm
+
+
+def hcs_selected_slab_check_batch(s1, live_load, selected_slab):
+    """
+    Vectorised version of hcs_selected_slab_check.
+
+    Returns an array of slab types, one per (s1, live_load) element, where
+    hollow core slabs without a suitable catalogue entry become the "_S3" variant.
+    """
+    s1, live_load = np.broadcast_arrays(np.asarray(s1, dtype=float), np.asarray(live_load, dtype=float))
+    selected = np.full(s1.shape, selected_slab, dtype=object)
+
+    if selected_slab in ["1.2HC Slab", "2.4HC Slab"]:
+        no_fit = np.isnan(get_hcs_catalog().min_thickness_batch(s1, live_load))
+        selected[no_fit] = selected_slab.replace("C Slab", "CS_S3")
+
+    return selected
+
+
+def calculate_slab_thickness_batch(s1, s2, live_load, selected_slab, strict=True):
+    """
+    Vectorised version of calculate_slab_thickness.
+
+    Parameters:
+    - s1, s2, live_load (array-like): Spans (m) and live load (kN/m²), broadcast against each other.
+    - selected_slab (str): Type of slab, applied to the whole batch.
+    - strict (bool): Raise ValueError when a hollow core slab cannot be found for
+      any element (as the scalar function does). When False, those elements get
+      NaN as hcs_slab_thickness_mm instead.
+
+    Returns:
+    - slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm (ndarray)
+    """
+    s1, s2, live_load = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (s1, s2, live_load)))
+    slab_thickness_mm = np.zeros(s1.shape, dtype=int)
+    slab_max_spacing_pt_mm = np.zeros(s1.shape, dtype=int)
+    hcs_slab_thickness_mm = np.zeros(s1.shape)
+
+    if selected_slab == "CIS Slab":
+        R_max = 25
+        L_ref = 3
+        k = 0.25
+        n = 0.2
+
+        with np.errstate(divide="ignore"):
+            R_base = R_max * (L_ref / live_load) ** k
+        R_adjusted = R_base * (10 / s1) ** n
+
+        effective_depth = s1 / R_adjusted
+        slab_thickness = effective_depth + 0.03 + 0.016
+        slab_thickness = np.maximum(slab_thickness, 0.15)
+        slab_thickness_mm = (np.floor(slab_thickness * 1000 / 50) * 50).astype(int)
+
+    elif selected_slab == "PT Flat Slab":
+        span_to_depth_ratio = np.select(
+            [live_load <= 3, live_load <= 5, live_load <= 10, live_load <= 15, live_load <= 25],
+            [45, 40, 37, 33, 30],
+            default=25,
+        )
+
+        effective_depth = s1 / span_to_depth_ratio
+        slab_thickness = effective_depth + 0.03 + 0.02
+        slab_thickness = np.maximum(slab_thickness, 0.2)
+        slab_thickness_mm = (np.ceil(slab_thickness * 1000 / 25) * 25).astype(int)
+
+        total_prestressing_force = 1.5 * live_load * s1 * s2
+        strand_capacity = 300
+        num_tendons = np.ceil(total_prestressing_force / (strand_capacity * 4))
+        with np.errstate(divide="ignore"):
+            slab_max_spacing_pt_mm = np.minimum(8 * slab_thickness * 1000, s1 * 1000 / num_tendons)
+        slab_max_spacing_pt_mm = (np.floor(slab_max_spacing_pt_mm / 50) * 50).astype(int)
+
+    elif selected_slab in ["1.2HC Slab", "2.4HC Slab", "1.2HCS_S3", "2.4HCS_S3"]:
+        catalog = get_hcs_catalog()
+
+        # First attempt with full span s1, then retry with s1/2
+        hcs_slab_thickness_mm = catalog.min_thickness_batch(s1, live_load)
+        retry = np.isnan(hcs_slab_thickness_mm)
+        if retry.any():
+            hcs_slab_thickness_mm[retry] = catalog.min_thickness_batch(s1[retry] / 2, live_load[retry])
+
+        if strict and np.isnan(hcs_slab_thickness_mm).any():
+            raise ValueError("No suitable hollow core slab found for given span and load, even after trying s1/2.")
+
+        slab_thickness_mm = np.full(s1.shape, 75)
+
+    return slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm
@@ -1,18 +1,50 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import matplotlib.transforms as transforms
-import numpy as np
 import math
-import shapely
-import pandas as pd
-from matplotlib.lines import Line2D
-from shapely.geometry import Polygon
-from io import BytesIO  # For handling the PDF export
+import os
+import threading
+from design_options import column_options, beam_options, slab_options, available_combinations
+from metrics import configure_from_env, export_metrics, get_metrics, stage_timer
+
+# numpy, pandas, matplotlib and the model modules are imported when Generate is
+# clicked (or by the pre-warm thread below), so the form renders without them.
 
 # Set the browser tab title and other configurations
 st.set_page_config(page_title="DfMA Model", page_icon="📊")
 
+# Serve /metrics when DFMA_METRICS_PORT is set
+configure_from_env()
+
+
+def _prewarm():
+    # Import the heavy modules, parse the data files and load the fonts once
+    with stage_timer("prewarm"):
+        from io import BytesIO
+        from matplotlib.figure import Figure
+        from output_data import get_productivity_rates
+        from slab_rc import get_hcs_catalog
+        import pandas
+        import pipeline
+        import plot_data
+
+        get_hcs_catalog()
+        get_productivity_rates()
+        fig = Figure()
+        fig.add_subplot().set_title("DfMA")
+        fig.savefig(BytesIO(), format="png")
+
+
+@st.cache_resource
+def start_prewarm():
+    """
+    Start pre-warming in a background thread, once per server process, so the
+    first Generate does not pay for the imports. Disabled with DFMA_PREWARM=0.
+    """
+    if os.environ.get("DFMA_PREWARM", "1") == "0":
+        return None
+    thread = threading.Thread(target=_prewarm, name="dfma-prewarm", daemon=True)
+    thread.start()
+    return thread
+
 # Function to save plot to PDF and return as BytesIO
 #def save_plot_to_pdf(fig):
 #    pdf_bytes = BytesIO()
@@ -23,58 +55,12 @@ st.set_page_config(page_title="DfMA Model", page_icon="📊")
 # Streamlit app
 st.title("DfMA Model Inputs")
 
-# Define the options for columns, beams, and slabs
-column_options = [
-    "CIS Column",
-    "PC Column",
-    "Steel Column (Not Available)",
-    "CES Column (Not Available)",
-    "SEC Column (Not Available)",
-]
-
-beam_options = [
-    "CIS Beam",
-    "PT Beam",
-    "PT Flat Slab",
-    "CES Beam (Not Available)",
-    "I Beam (Not Available)",
-    "Castellated I Beam (Not Available)",
-]
-
-slab_options = [
-    "CIS Slab",
-    "1.2HC Slab",
-    "2.4HC Slab",
-    "PT Flat Slab",
-    "Bubble Deck Slab (Not Available)",
-    "DoubleTee Slab (Not Available)",
-    "Bondek (Not Available)",
-]
-
 # Step 1: Create the dropdown menus
 selected_column = st.selectbox("Select Column Type:", options=column_options)
 selected_beam = st.selectbox("Select Beam Type:", options=beam_options)
 selected_slab = st.selectbox("Select Slab Type:", options=slab_options)
 
-# Step 2: Define multiple available combinations
-available_combinations = [
-    {"beam": "CIS Beam", "slab": "CIS Slab", "column": "CIS Column"},
-    {"beam": "CIS Beam", "slab": "CIS Slab", "column": "PC Column"},
-    {"beam": "CIS Beam", "slab": "1.2HC Slab", "column": "CIS Column"},
-    {"beam": "CIS Beam", "slab": "1.2HC Slab", "column": "PC Column"},
-    {"beam": "CIS Beam", "slab": "2.4HC Slab", "column": "CIS Column"},
-    {"beam": "CIS Beam", "slab": "2.4HC Slab", "column": "PC Column"},
-    {"beam": "PT Beam", "slab": "CIS Slab", "column": "CIS Column"},
-    {"beam": "PT Beam", "slab": "CIS Slab", "column": "PC Column"},
-    {"beam": "PT Beam", "slab": "1.2HC Slab", "column": "CIS Column"},
-    {"beam": "PT Beam", "slab": "1.2HC Slab", "column": "PC Column"},
-    {"beam": "PT Beam", "slab": "2.4HC Slab", "column": "CIS Column"},
-    {"beam": "PT Beam", "slab": "2.4HC Slab", "column": "PC Column"},
-    {"beam": "PT Flat Slab", "slab": "PT Flat Slab", "column": "CIS Column"},
-    {"beam": "PT Flat Slab", "slab": "PT Flat Slab", "column": "PC Column"},
-]
-
-# Step 3: Check if the selected combination matches any available option
+# Step 2: Check if the selected combination matches any available option
 selected_combination = {
     "beam": selected_beam,
     "slab": selected_slab,
@@ -89,32 +75,58 @@ else:
 s1 = st.number_input("Enter Beam Span S1 (Required Column to Column clear distance) (m):", min_value=5, max_value=13, step=1, value=10)
 s2 = st.number_input("Enter Beam Span S2 (may be adjusted based on chosen structure design) (m):", min_value=0, max_value=12, step=1, value=10)
 live_load = st.number_input("Enter Live Load (kN/m²):", min_value=0.0, max_value=20.0, step=0.1, value=3.0)
-lengthinput = st.number_input("Enter the building length (meters):", min_value=20, max_value=100, step=1, value=60)
-widthinput = st.number_input("Enter the building width (meters):", min_value=20, max_value=40, step=1, value=40)
+large_site = st.checkbox("Large-site mode (footprints beyond 100 m x 40 m, up to 5 km)", value=False)
+lengthinput = st.number_input("Enter the building length (meters):", min_value=20, max_value=5000 if large_site else 100, step=1, value=60)
+widthinput = st.number_input("Enter the building width (meters):", min_value=20, max_value=5000 if large_site else 40, step=1, value=40)
 f2f = st.number_input("Enter the F2F Height (meters):", min_value=2, max_value=6, step=1, value=6)
 length = math.floor((lengthinput) / s1) * s1
 width = math.floor((widthinput) / s2) * s2
 
+start_prewarm()
+
+
+def combination_available():
+    # The tools below only run for an available combination
+    if selected_combination in available_combinations:
+        return True
+    st.warning("The selected combination is not available. Please choose a valid option.")
+    return False
+
+
+def current_result(storeys=5):
+    """
+    Pipeline result of the current inputs, shared by Generate and the tools
+    below through the pipeline cache.
+    """
+    from pipeline import cached_result
+
+    return cached_result(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f, storeys=storeys)
+
+
 # Generate and display the gri d plot
 if st.button("Generate"):
-    from column_rc import calculate_column_size
-    from beam_rc import calculate_beam_size
-    from slab_rc import calculate_slab_thickness
-    from slab_rc import hcs_selected_slab_check
-    from output_data import calculate_layout_outputs
-    from plot_data import create_grid_plot
-    
-    column_size_mm, column_weight_tonnes = calculate_column_size(s1, s2, live_load,selected_column, f2f)
-    selected_slab = hcs_selected_slab_check(s1, live_load, selected_slab)
-    b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm = calculate_beam_size(s1, s2, live_load, column_size_mm, selected_beam, selected_slab)
-    slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm = calculate_slab_thickness(s1, s2, live_load,selected_slab)
-    misc_output, design_output, equipment_output, utility_output, manpower_output, beam_manhour, column_manhours, slab_manhours, casting_manhours = calculate_layout_outputs(s1, s2, live_load, column_size_mm, selected_column, selected_beam, selected_slab, length, width, b_s1_mm, d_s1_mm,b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm, slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm, f2f) 
-    fig = create_grid_plot(length, width, s1, s2, live_load,selected_column, selected_beam, selected_slab, column_size_mm, column_weight_tonnes, b_s1_mm, d_s1_mm, b_s2_mm, d_s2_mm, b_s3_mm, d_s3_mm, slab_thickness_mm, slab_max_spacing_pt_mm, hcs_slab_thickness_mm)
-    st.pyplot(fig)
-    #st.write(beam_manhour)
-    #st.write(column_manhours)
-    #st.write(slab_manhours)
-    #st.write(casting_manhours)
+    import pandas as pd
+    from output_data import DESIGN_OUTPUTS, EQUIPMENT_OUTPUTS, UTILITY_OUTPUTS, MANPOWER_OUTPUTS, MISC_OUTPUTS
+    from pipeline import generate
+
+    with stage_timer("generate"):
+        result, png = generate(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f)
+    outputs = result["outputs"]
+    with stage_timer("display_plot"):
+        st.image(png, width="stretch")
+
+    # CAD exports of the detailed plan, generated only when clicked
+    from plan_export import plan_bytes
+    plan_name = f"dfma_plan_{length:g}x{width:g}"
+    dxf_column, svg_column = st.columns(2)
+    with dxf_column:
+        st.download_button("Download plan (DXF)", lambda: plan_bytes(result, "dxf"), file_name=f"{plan_name}.dxf", mime="application/dxf", on_click="ignore")
+    with svg_column:
+        st.download_button("Download plan (SVG)", lambda: plan_bytes(result, "svg"), file_name=f"{plan_name}.svg", mime="image/svg+xml", on_click="ignore")
+    #st.write(outputs.beam_manhours)
+    #st.write(outputs.column_manhours)
+    #st.write(outputs.slab_manhours)
+    #st.write(outputs.casting_manhours)
     
    # # Allow user to download the grid plot as a PDF
     #pdf_file = save_plot_to_pdf(fig)
@@ -137,98 +149,14 @@ if st.button("Generate"):
         unsafe_allow_html=True,
     )
 
-    # Design Data
-    design_data = {
-        "Category": [
-            "Number of volumetric precast component(s)",
-            "Number of vertical precast component(s)",
-            "Number of propped horizontal component(s)",
-            "Number of unpropped horizontal component(s)",
-            "Formwork area for slab(s)",
-            "Formwork area for beam(s)",
-            "Number of column formwork(s)",
-            "Weight of loose rebar (tonnes)",
-            "Weight of slab rebar (tonnes)",
-            "CIS Volume(m3)"
-        ],
-        "Value": design_output
-    }
-
-    # Equipment Data
-    equipment_data = {
-        "Category": [
-            "Number of tower crane(s)",
-            "Number of concrete pump(s)",
-            "Number of passenger/material hoist(s)",
-            "Number of construction hoist(s)",
-            "Number of Gondola(s)",
-            "Number of MEWP(s)"
-        ],
-        "Value": equipment_output
-    }
-
-    # Equipment Utility
-    utility_data = {
-        "Category": [
-            "Hoist Count passenger/material hoist",
-            "Hoist Count Tower Crane",
-            "Number of concrete truck delivery(s)",
-            "Number of trailer delivery(s)"
-        ],
-        "Value": utility_output
-    }
+    def output_table(labels, values):
+        return {"Category": [label for _, label in labels], "Value": values}
 
-    # Manpower Data
-    manpower_data = {
-        "Category": [
-            "Expected Mandays (Structure only)",
-            "Floor cycle(days)",
-            "Unique Headcount"
-        ],
-        "Value": manpower_output
-    }
-    
-    miscellaneous_data = {
-    "Category": [
-        "Number of volumetric precast component(s)",
-        "Number of vertical precast component(s)",
-        "Number of propped horizontal component(s)",
-        "Number of unpropped horizontal component(s)",
-        "Formwork area for slab(s)",
-        "Formwork area for beam(s)",
-        "Number of column formwork(s)",
-        "Weight of loose rebar (tonnes)",
-        "Weight of slab rebar (tonnes)",
-        "CIS Volume(m3)",
-        "Number of tower crane(s)",
-        "Number of concrete pump(s)",
-        "Number of passenger/material hoist(s)",
-        "Number of construction hoist(s)",
-        "Number of Gondola(s)",
-        "Number of MEWP(s)",
-        "Hoist Count passenger/material hoist",
-        "Hoist Count Tower Crane",
-        "Number of concrete truck delivery(s)",
-        "Number of trailer delivery(s)",
-        "Beam manhours",
-        "Slab manhours",
-        "Column manhours",
-        "Casting manhours",
-        "Total Mandays (Structure only)",
-        "Total Productivity m2/manday (Structure only)",
-        "Slab CIS Volume (m³)",
-        "Beam CIS Volume (m³)",
-        "Column CIS Volume (m³)",
-        "Weight of beam rebar (tonnes)",
-        "Weight of column rebar (tonnes)",
-        "Weight of slab rebar (tonnes)",
-        "Weight of loose rebar (tonnes)",
-        "Beam Hoist Count (Tower Crane)",
-        "Slab Hoist Count (Tower Crane)",
-        "Column Hoist Count (Tower Crane)"
-    ],
-        "Value": misc_output
-    }
+    design_data = output_table(DESIGN_OUTPUTS, outputs.design_output)
+    equipment_data = output_table(EQUIPMENT_OUTPUTS, outputs.equipment_output)
+    utility_data = output_table(UTILITY_OUTPUTS, outputs.utility_output)
+    manpower_data = output_table(MANPOWER_OUTPUTS, outputs.manpower_output)
+    miscellaneous_data = output_table(MISC_OUTPUTS, outputs.misc_output)
 
 
     # Convert data to HTML tables
@@ -241,12 +169,17 @@ if st.button("Generate"):
         return html
 
 
-    # Create DataFrames
-    df_design = pd.DataFrame(design_data)
-    df_equipment = pd.DataFrame(equipment_data)
-    df_utility = pd.DataFrame(utility_data)
-    df_manpower = pd.DataFrame(manpower_data)
-    #df_misc = pd.DataFrame(miscellaneous_data)
+    # Create DataFrames and their HTML tables
+    with stage_timer("html_tables"):
+        df_design = pd.DataFrame(design_data)
+        df_equipment = pd.DataFrame(equipment_data)
+        df_utility = pd.DataFrame(utility_data)
+        df_manpower = pd.DataFrame(manpower_data)
+        #df_misc = pd.DataFrame(miscellaneous_data)
+        design_html = create_html_table(df_design)
+        equipment_html = create_html_table(df_equipment)
+        utility_html = create_html_table(df_utility)
+        manpower_html = create_html_table(df_manpower)
 
     # Streamlit Layout
     st.title("Data Tables")
@@ -256,22 +189,22 @@ if st.button("Generate"):
 
     with col1:
         st.subheader("Design")
-        st.markdown(create_html_table(df_design), unsafe_allow_html=True)
+        st.markdown(design_html, unsafe_allow_html=True)
 
     with col2:
         st.subheader("Equipment")
-        st.markdown(create_html_table(df_equipment), unsafe_allow_html=True)
+        st.markdown(equipment_html, unsafe_allow_html=True)
 
     # Second Row: Utility and Manpower
     col3, col4 = st.columns(2)  # Two columns in the second row
 
     with col3:
         st.subheader("Utility")
-        st.markdown(create_html_table(df_utility), unsafe_allow_html=True)
+        st.markdown(utility_html, unsafe_allow_html=True)
 
     with col4:
         st.subheader("Manpower")
-        st.markdown(create_html_table(df_manpower), unsafe_allow_html=True)
+        st.markdown(manpower_html, unsafe_allow_html=True)
         
     # Streamlit Layout
     #st.title("Additional Miscellaneous Data")
@@ -280,9 +213,246 @@ if st.button("Generate"):
     #st.subheader("Miscellaneous Outputs")
     #st.markdown(create_html_table(df_misc), unsafe_allow_html=True)
 
+    export_metrics()
 
-
-
-
-
-
+# Search the spans for the current combination, footprint, load and F2F height
+with st.expander("Span optimizer"):
+    objective_labels = {
+        "total_mandays_crane": "Expected Mandays (Structure only)",
+        "cis_volume": "CIS Volume(m3)",
+        "hoist_count_tower_crane": "Hoist Count Tower Crane",
+    }
+    objective = st.selectbox("Minimise:", options=list(objective_labels), format_func=objective_labels.get)
+    min_coverage = st.slider("Minimum share of the footprint kept after snapping to whole bays:", min_value=0.0, max_value=1.0, step=0.05, value=0.9)
+    top_k = st.number_input("Layouts to show:", min_value=1, max_value=20, step=1, value=5)
+    if st.button("Optimize spans") and combination_available():
+        from optimize import optimize_spans
+
+        with stage_timer("optimize"):
+            best, evaluated = optimize_spans(selected_column, selected_beam, selected_slab, live_load, lengthinput, widthinput, f2f,
+                                             objective=objective, top_k=top_k, min_coverage=min_coverage)
+        if best.empty:
+            st.warning("No layout keeps that share of the footprint.")
+        else:
+            st.write(f"Best {len(best)} of {evaluated} span layouts, per m² of the footprint kept:")
+            st.dataframe(best.drop(columns="result").rename(columns={
+                "s1": "S1 (m)", "s2": "S2 (m)", "building_length": "Length (m)", "building_width": "Width (m)",
+                "coverage": "Footprint kept", "effective_slab": "Slab", **objective_labels,
+                **{f"{name}_per_m2": f"{label} per m²" for name, label in objective_labels.items()}}), hide_index=True)
+        export_metrics()
+
+# Trade-offs between every available combination over the span/load grid
+with st.expander("Pareto explorer"):
+    default_load = min(max(round(live_load * 2) / 2, 0.5), 20.0)
+    pareto_loads = st.slider("Live load range (kN/m²):", min_value=0.5, max_value=20.0, step=0.5, value=(default_load, default_load))
+    pareto_coverage = st.slider("Minimum share of the footprint kept after snapping to whole bays:", min_value=0.0, max_value=1.0, step=0.05, value=0.9, key="pareto_coverage")
+    if st.button("Explore designs"):
+        import numpy as np
+        from pareto import evaluate_design_space, pareto_designs
+
+        with stage_timer("pareto"):
+            designs = evaluate_design_space(np.arange(pareto_loads[0], pareto_loads[1] + 0.25, 0.5), lengthinput, widthinput, f2f, min_coverage=pareto_coverage)
+            st.session_state["pareto"] = (len(designs), pareto_designs(designs))
+        export_metrics()
+
+    if "pareto" in st.session_state:
+        from pareto import DESIGN_COLUMNS, PARETO_LABELS, PARETO_OBJECTIVES
+
+        evaluated, front = st.session_state["pareto"]
+        st.write(f"{len(front)} of {evaluated} designs are on the Pareto front (one front per live load, outputs per m² of the footprint kept).")
+        if not front.empty:
+            x_axis = st.selectbox("X axis:", options=PARETO_OBJECTIVES, format_func=PARETO_LABELS.get)
+            y_axis = st.selectbox("Y axis:", options=PARETO_OBJECTIVES, index=1, format_func=PARETO_LABELS.get)
+            st.scatter_chart(front, x=x_axis, y=y_axis, color="combination", x_label=PARETO_LABELS[x_axis], y_label=PARETO_LABELS[y_axis])
+            st.dataframe(front[DESIGN_COLUMNS + list(PARETO_OBJECTIVES)].drop(columns=["column", "beam", "slab"]).rename(columns=PARETO_LABELS), hide_index=True)
+
+# P10/P50/P90 mandays, floor cycle and headcount with uncertain productivity rates
+with st.expander("Monte Carlo (productivity rates)"):
+    if st.checkbox("Set up a Monte Carlo run"):
+        from monte_carlo import DISTRIBUTION_KINDS, MONTE_CARLO_LABELS, Distribution, default_distributions
+
+        st.write("Low, mode and high for each rate (manhours per unit; hours per hoist for hoist_hours). "
+                 "Uniform ignores the mode, normal takes the mode as mean and the range as ±2 standard deviations.")
+        rate_table = st.data_editor(
+            [{"input": name, "distribution": d.kind, "low": d.params[0], "mode": d.params[1], "high": d.params[2]}
+             for name, d in default_distributions().items()],
+            column_config={"input": st.column_config.TextColumn(disabled=True),
+                           "distribution": st.column_config.SelectboxColumn(options=[k for k in DISTRIBUTION_KINDS if k != "lognormal"])},
+            hide_index=True, key="monte_carlo_rates")
+        mc_samples = st.select_slider("Samples:", options=[10_000, 100_000, 1_000_000], value=100_000)
+        if st.button("Run Monte Carlo") and combination_available():
+            from monte_carlo import run_monte_carlo
+
+            distributions = {}
+            try:
+                for row in rate_table:
+                    params = {"fixed": (row["mode"],), "uniform": (row["low"], row["high"]),
+                              "normal": (row["mode"], (row["high"] - row["low"]) / 4)}.get(row["distribution"], (row["low"], row["mode"], row["high"]))
+                    distributions[row["input"]] = Distribution(row["distribution"], *params)
+            except ValueError as e:
+                st.error(f"Invalid distribution: {e}")
+            else:
+                with stage_timer("monte_carlo"):
+                    st.session_state["monte_carlo"] = run_monte_carlo(selected_column, selected_beam, selected_slab, s1, s2, live_load,
+                                                                      length, width, f2f, distributions, samples=mc_samples)
+                export_metrics()
+
+        mc_result = st.session_state.get("monte_carlo")
+        if mc_result is not None:
+            st.write(f"{len(mc_result):,} samples")
+            st.dataframe(mc_result.percentiles().rename(index=MONTE_CARLO_LABELS).round(2))
+            metric = st.selectbox("Histogram of:", options=list(MONTE_CARLO_LABELS), format_func=MONTE_CARLO_LABELS.get)
+            st.bar_chart(mc_result.histogram(metric), x="value", y="count", x_label=MONTE_CARLO_LABELS[metric], y_label="Samples")
+
+# Which rates and design parameters drive mandays and the floor cycle
+with st.expander("Sensitivity analysis"):
+    sensitivity_method = st.radio("Method:", options=["Sobol", "Morris"], horizontal=True)
+    sensitivity_spread = st.slider("Range of every parameter (± % of its current value):", min_value=5, max_value=50, step=5, value=20)
+    if sensitivity_method == "Sobol":
+        sensitivity_samples = st.select_slider("Base samples:", options=[256, 512, 1024, 2048, 4096], value=1024)
+    else:
+        sensitivity_samples = st.select_slider("Trajectories:", options=[10, 20, 50, 100, 200], value=50)
+    if st.button("Run sensitivity analysis") and combination_available():
+        from sensitivity import morris, sobol
+
+        scenario = (selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f)
+        analyse = sobol if sensitivity_method == "Sobol" else morris
+        with stage_timer("sensitivity"):
+            st.session_state["sensitivity"] = (sensitivity_method, *analyse(scenario, sensitivity_spread / 100, sensitivity_samples))
+        export_metrics()
+
+    if "sensitivity" in st.session_state:
+        method, indices, evaluations = st.session_state["sensitivity"]
+        index_column = "ST" if method == "Sobol" else "mu_star"
+        st.write(f"{method}, {evaluations:,} model evaluations. "
+                 + ("ST is the share of the output variance involving the parameter, S1 the share from the parameter alone."
+                    if method == "Sobol" else "mu_star is the mean absolute change of the output over the parameter's full range."))
+        for output, label in (("total_mandays_crane", "Expected Mandays (Structure only)"), ("floor_cycle_days", "Floor Cycle (days)")):
+            st.subheader(label)
+            table = indices[indices["output"] == output].drop(columns="output")
+            st.bar_chart(table, x="parameter", y=index_column, horizontal=True, sort=f"-{index_column}")
+            st.dataframe(table.round(4), hide_index=True)
+
+# Which elements the tower cranes of the plot can lift at each reach radius
+with st.expander("Crane coverage"):
+    coverage_labels = {"centre": "Hook reaches the element centre", "whole": "Whole element within reach", "any": "Part of the element within reach"}
+    coverage_criterion = st.radio("An element can be lifted when:", options=list(coverage_labels), format_func=coverage_labels.get)
+    if st.button("Check crane coverage") and combination_available():
+        from crane_coverage import layout_coverage
+
+        result = current_result()
+        st.session_state["crane_coverage"] = layout_coverage(result, criterion=coverage_criterion)
+        export_metrics()
+
+    coverage = st.session_state.get("crane_coverage")
+    if coverage is not None:
+        st.write(f"{len(coverage.elements):,} elements, {len(coverage.centres)} tower crane(s).")
+        st.dataframe(coverage.summary().round(3))
+        reach = st.selectbox("Lifts per crane at reach (m):", options=coverage.radii, index=len(coverage.radii) - 1)
+        st.dataframe(coverage.crane_lifts(reach).round(2))
+
+# Fewest tower cranes lifting every precast column and hollow core panel
+with st.expander("Crane placement"):
+    if st.checkbox("Set up a crane placement"):
+        from crane_placement import TOWER_CRANE_JIB, TOWER_CRANE_LOAD_MOMENT, TOWER_CRANE_MAX_LOAD
+
+        load_moment_column, max_load_column, jib_column = st.columns(3)
+        with load_moment_column:
+            crane_load_moment = st.number_input("Load moment (t·m):", min_value=10.0, max_value=2000.0, step=10.0, value=TOWER_CRANE_LOAD_MOMENT)
+        with max_load_column:
+            crane_max_load = st.number_input("Heaviest lift (t):", min_value=1.0, max_value=100.0, step=1.0, value=TOWER_CRANE_MAX_LOAD)
+        with jib_column:
+            crane_jib = st.number_input("Jib radius (m):", min_value=10.0, max_value=90.0, step=5.0, value=TOWER_CRANE_JIB)
+        if st.button("Optimize crane positions") and combination_available():
+            from crane_placement import plan_cranes
+
+            result = current_result()
+            st.session_state["crane_plan"] = (result["outputs"].no_tower_cranes, plan_cranes(result, crane_load_moment, crane_max_load, crane_jib))
+            export_metrics()
+
+        if "crane_plan" in st.session_state:
+            rule_cranes, plan = st.session_state["crane_plan"]
+            if not len(plan.elements):
+                st.write("No precast columns or hollow core panels to lift.")
+            else:
+                st.write(f"{len(plan)} tower crane(s) lift {len(plan.elements) - len(plan.unlifted()):,} of {len(plan.elements):,} precast elements "
+                         f"(the quantities assume {rule_cranes:g}).")
+                if len(plan.unlifted()):
+                    st.warning(f"{len(plan.unlifted()):,} elements are too heavy for this crane or out of reach of every position.")
+                st.dataframe(plan.crane_lifts().round(2))
+
+# Floor cycle from a discrete-event replay of the hoists, deliveries and pours
+with st.expander("Floor cycle simulation"):
+    if st.checkbox("Set up a floor cycle simulation"):
+        sim_floors = st.number_input("Floors:", min_value=1, max_value=100, step=1, value=5)
+        sim_lift_spread = st.slider("Spread of the lift times (± % of 0.6 h):", min_value=0, max_value=50, step=5, value=20)
+        sim_truck_interval = st.number_input("Mean hours between concrete trucks:", min_value=0.0, max_value=4.0, step=0.05, value=0.25)
+        sim_pour_hours = st.number_input("Hours to pour one truck:", min_value=0.0, max_value=4.0, step=0.05, value=0.4)
+        if st.button("Simulate floor cycle") and combination_available():
+            from hoist_sim import SiteLogistics, simulate_hoisting
+
+            result = current_result()
+            logistics = SiteLogistics(lift_spread=sim_lift_spread / 100, truck_interval_hours=sim_truck_interval, pour_hours=sim_pour_hours)
+            st.session_state["hoist_sim"] = simulate_hoisting(result["outputs"], sim_floors, logistics=logistics)
+            export_metrics()
+
+        simulation = st.session_state.get("hoist_sim")
+        if simulation is not None:
+            summary = simulation.summary()
+            st.write(f"Mean floor cycle {summary['mean_cycle_days']:.1f} days (longest {summary['max_cycle_days']:.1f}) against "
+                     f"{summary['expected_cycle_days']:.1f} days from the hoist count; {summary['programme_days']:.1f} days for "
+                     f"{summary['floors']} floors, cranes busy {summary['crane_utilisation']:.0%} of the lifting time, {summary['events']:,} events.")
+            st.dataframe(simulation.floors.round(2), hide_index=True)
+
+with st.expander("Construction schedule"):
+    if st.checkbox("Set up a construction schedule"):
+        schedule_storeys = st.number_input("Storeys:", min_value=1, max_value=200, step=1, value=5)
+        schedule_zones = st.number_input("Zones per floor (0 = one per tower crane):", min_value=0, max_value=50, step=1, value=0)
+        crew_columns = st.columns(5)
+        schedule_crews = {trade: crew_columns[i].number_input(f"{label} crews:", min_value=1, max_value=50, step=1, value=1)
+                          for i, (trade, label) in enumerate([("column", "Column"), ("beam", "Beam"), ("slab", "Slab"),
+                                                              ("casting", "Casting"), ("stairs", "Staircase")])}
+        if st.button("Schedule") and combination_available():
+            from scheduler import schedule_building
+
+            result = current_result(schedule_storeys)
+            st.session_state["schedule"] = schedule_building(result, schedule_storeys, schedule_zones or None, schedule_crews)
+            export_metrics()
+
+        schedule = st.session_state.get("schedule")
+        if schedule is not None:
+            import altair as alt
+
+            gantt, summary = schedule
+            st.write(f"{summary['duration_days']:,.1f} working days with these crews, {summary['critical_path_days']:,.1f} days "
+                     f"with unlimited crews; {summary['activities']:,} activities, {int(gantt['critical'].sum()):,} on the critical chain.")
+            st.altair_chart(alt.Chart(gantt).mark_bar().encode(
+                x=alt.X("start_day", title="Working day"), x2="finish_day", y=alt.Y("floor:O", title="Floor", sort="descending"),
+                color="trade", tooltip=["activity", "start_day", "finish_day", "crew", "critical"]))
+            st.dataframe(gantt.round(2), hide_index=True)
+
+# Per-stage timings for this server process, shown with ?debug=1 or DFMA_DEBUG=1
+if st.query_params.get("debug") == "1" or os.environ.get("DFMA_DEBUG") == "1":
+    with st.sidebar:
+        st.subheader("Stage timings")
+        timings = get_metrics().summary()
+        if timings:
+            import pandas as pd
+
+            st.dataframe(pd.DataFrame(timings).set_index("stage").round(2))
+        else:
+            st.write("No stages timed yet.")
+        st.download_button("Download metrics (Prometheus)", get_metrics().to_prometheus(), file_name="dfma_metrics.prom", mime="text/plain")
+
+        # Deep profile of one uncached Generate with the current inputs
+        st.subheader("Profiling")
+        if st.button("Profile Generate"):
+            from profiling import profile_run
+
+            st.session_state["profile_report"] = profile_run(selected_column, selected_beam, selected_slab, s1, s2, live_load, length, width, f2f)
+        report = st.session_state.get("profile_report")
+        if report is not None:
+            st.write(f"{report.elapsed_s:.2f} s, peak traced memory {report.peak_bytes / 1024 / 1024:.1f} MiB")
+            st.download_button("cProfile stats (.pstats)", report.pstats_bytes, file_name="dfma_profile.pstats", mime="application/octet-stream", on_click="ignore")
+            st.download_button("Allocation report", report.allocations_text, file_name="dfma_profile_allocations.txt", mime="text/plain", on_click="ignore")
+            st.download_button("Flame graph stacks (collapsed)", report.collapsed_stacks, file_name="dfma_profile.collapsed", mime="text/plain", on_click="ignore")
@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+# The modules are flat files in the repository root and read their CSV data
+# relative to the working directory.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def repository_root(monkeypatch):
+    monkeypatch.chdir(ROOT)
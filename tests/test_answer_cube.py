@@ -0,0 +1,42 @@
+import json
+import shutil
+
+import numpy as np
+
+import answer_cube
+from answer_cube import CUBE_DTYPE, CUBE_SHAPE, _load_answer_cube, write_cube
+
+
+def write_empty_cube(tmp_path):
+    path = str(tmp_path / "cube.npy")
+    write_cube(np.zeros(CUBE_SHAPE, dtype=CUBE_DTYPE), path)
+    return path
+
+
+def test_cube_with_current_metadata_is_used(tmp_path):
+    assert _load_answer_cube(write_empty_cube(tmp_path)) is not None
+
+
+def test_cube_with_other_axes_is_ignored(tmp_path):
+    path = write_empty_cube(tmp_path)
+    sidecar = tmp_path / "cube.json"
+    meta = json.loads(sidecar.read_text())
+    meta["design_pairs"] = meta["design_pairs"][::-1]
+    sidecar.write_text(json.dumps(meta))
+    assert _load_answer_cube(path) is None
+
+
+def test_reordered_design_pairs_invalidate_the_cube(tmp_path, monkeypatch):
+    path = write_empty_cube(tmp_path)
+    # Same shape, but every pair index would now point at another pair's sizes
+    monkeypatch.setattr(answer_cube, "DESIGN_PAIRS", answer_cube.DESIGN_PAIRS[::-1])
+    assert _load_answer_cube(path) is None
+
+
+def test_fingerprint_covers_the_design_options(tmp_path):
+    for name in answer_cube.SOURCE_FILES:
+        shutil.copy(name, tmp_path / name)
+    before = answer_cube.source_fingerprint(str(tmp_path))
+    with open(tmp_path / "design_options.py", "a") as f:
+        f.write("\n")
+    assert answer_cube.source_fingerprint(str(tmp_path)) != before
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+import shapely
+
+from crane_coverage import COVERAGE_CRITERIA, crane_coverage, element_geometries, result_elements
+from pipeline import grid_footprint, run_pipeline
+
+RADII = (10.0, 15.0, 22.5, 30.0)
+
+
+@pytest.fixture(scope="module", params=[("PC Column", "CIS Beam", "1.2HC Slab"), ("CIS Column", "PT Beam", "CIS Slab"),
+                                        ("CIS Column", "PT Flat Slab", "PT Flat Slab")], ids="/".join)
+def layout(request):
+    length, width = grid_footprint(60, 40, 8, 7)
+    result = run_pipeline(*request.param, 8, 7, 3.0, length, width, 6)
+    elements = result_elements(result)
+    # Random centres avoid ties between cranes at the same distance
+    centres = np.random.default_rng(5).uniform(0, [length + 16, width + 14], (6, 2))
+    return elements, centres
+
+
+def reach_distances(elements, centres, criterion):
+    # Brute force over every crane/element pair with shapely
+    geometries = element_geometries(elements)
+    points = shapely.points(centres)[:, None]
+    if criterion == "centre":
+        return np.hypot(centres[:, None, 0] - elements["x"], centres[:, None, 1] - elements["y"])
+    if criterion == "any":
+        return shapely.distance(points, geometries[None, :])
+    # Elements are convex, so their farthest point from a crane is a vertex
+    farthest = np.empty((len(centres), len(elements)))
+    for j, geometry in enumerate(geometries):
+        vertices = shapely.get_coordinates(geometry)
+        farthest[:, j] = np.hypot(centres[:, None, 0] - vertices[:, 0], centres[:, None, 1] - vertices[:, 1]).max(axis=1)
+    return farthest
+
+
+@pytest.mark.parametrize("criterion", COVERAGE_CRITERIA)
+def test_coverage_matches_brute_force(layout, criterion):
+    elements, centres = layout
+    coverage = crane_coverage(elements, centres, RADII, criterion)
+    reach = reach_distances(elements, centres, criterion)
+    centre_distance = np.hypot(centres[:, None, 0] - elements["x"], centres[:, None, 1] - elements["y"])
+    for radius in RADII:
+        within = reach <= radius
+        cranes, indices = coverage.pairs[radius]
+        assert sorted(zip(cranes.tolist(), indices.tolist())) == sorted(zip(*np.nonzero(within))), radius
+        nearest = np.where(within, centre_distance, np.inf).argmin(axis=0)
+        assert np.array_equal(coverage.assigned[radius], np.where(within.any(axis=0), nearest, -1)), radius
+
+
+@pytest.mark.parametrize("criterion", COVERAGE_CRITERIA)
+def test_coverage_grows_with_the_radius(layout, criterion):
+    coverage = crane_coverage(*layout, RADII, criterion)
+    for smaller, larger in zip(RADII, RADII[1:]):
+        assert set(zip(*coverage.pairs[smaller])) <= set(zip(*coverage.pairs[larger]))
+        assert set(coverage.uncovered(larger)) <= set(coverage.uncovered(smaller))
+
+
+def test_whole_within_centre_within_any(layout):
+    pairs = {criterion: crane_coverage(*layout, RADII, criterion).pairs for criterion in COVERAGE_CRITERIA}
+    for radius in RADII:
+        whole, centre, any_part = (set(zip(*pairs[criterion][radius])) for criterion in ("whole", "centre", "any"))
+        assert whole <= centre <= any_part
+        assert whole < any_part
+
+
+def test_unknown_criterion_is_rejected(layout):
+    with pytest.raises(ValueError):
+        crane_coverage(*layout, RADII, "corner")
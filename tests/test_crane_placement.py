@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from crane_placement import (candidate_positions, coverage_spacing, lift_elements, lift_reach, optimize_cranes,
+                             plan_cranes)
+from geometry import ELEMENT_DTYPE, HCS_PANEL
+from pipeline import grid_footprint, run_pipeline
+
+LOAD_MOMENT, MAX_LOAD, JIB = 120.0, 10.0, 30.0
+
+
+def scattered_elements(n=600, size=150.0, seed=3):
+    rng = np.random.default_rng(seed)
+    elements = np.zeros(n, dtype=ELEMENT_DTYPE)
+    elements["type"] = HCS_PANEL
+    elements["x"], elements["y"] = rng.uniform(0, size, (2, n))
+    # Mostly light enough for the whole jib, some limited by the load moment
+    # and a few above the heaviest lift
+    weights = rng.choice([2.0, 6.0, 9.0, 12.0], n, p=[0.6, 0.2, 0.15, 0.05])
+    return elements, weights
+
+
+def reachable(elements, weights, centres):
+    # Brute force: whether each centre can lift each element
+    distance = np.hypot(centres[:, None, 0] - elements["x"], centres[:, None, 1] - elements["y"])
+    return distance <= lift_reach(weights, LOAD_MOMENT, MAX_LOAD, JIB)
+
+
+@pytest.fixture(scope="module")
+def plan():
+    elements, weights = scattered_elements()
+    candidates = candidate_positions(150, 150, 0, 0, spacing=10)
+    return optimize_cranes(elements, weights, candidates, LOAD_MOMENT, MAX_LOAD, JIB)
+
+
+def test_lift_reach_follows_the_load_moment():
+    assert lift_reach([2.0, 6.0, 10.0, 12.0], LOAD_MOMENT, MAX_LOAD, JIB) == pytest.approx([30.0, 20.0, 12.0, np.nan], nan_ok=True)
+
+
+def test_elements_go_to_a_crane_that_can_lift_them(plan):
+    lifted = plan.assigned >= 0
+    can_lift = reachable(plan.elements, plan.weights, plan.centres)
+    assert can_lift[plan.assigned[lifted], np.flatnonzero(lifted)].all()
+    # Only elements no candidate can lift are left out
+    assert (plan.unlifted() == np.flatnonzero(plan.weights > MAX_LOAD)).all()
+    assert len(plan.unlifted())
+
+
+def test_no_crane_is_redundant(plan):
+    can_lift = reachable(plan.elements, plan.weights, plan.centres)[:, plan.assigned >= 0]
+    for crane in range(len(plan)):
+        others = np.delete(can_lift, crane, axis=0)
+        assert not others.any(axis=0).all(), crane
+
+
+def test_without_balancing_elements_go_to_the_nearest_crane():
+    elements, weights = scattered_elements()
+    candidates = candidate_positions(150, 150, 0, 0, spacing=10)
+    plan = optimize_cranes(elements, weights, candidates, LOAD_MOMENT, MAX_LOAD, JIB, balance_rounds=0)
+    lifted = np.flatnonzero(plan.assigned >= 0)
+    can_lift = reachable(elements, weights, plan.centres)
+    distance = np.hypot(plan.centres[:, None, 0] - elements["x"], plan.centres[:, None, 1] - elements["y"])
+    nearest = np.where(can_lift, distance, np.inf).min(axis=0)
+    assert distance[plan.assigned[lifted], lifted] == pytest.approx(nearest[lifted])
+
+
+def test_candidates_stay_within_reach_on_large_plots():
+    length, width = grid_footprint(600, 400, 10, 10)
+    result = run_pipeline("PC Column", "CIS Beam", "1.2HC Slab", 10, 10, 3.0, length, width, 6)
+    plan = plan_cranes(result, max_candidates=50)
+    elements, weights = lift_elements(result)
+    assert plan.candidates > 50
+    assert np.array_equal(plan.unlifted(), np.flatnonzero(weights > 16.0))
+
+    spacing = coverage_spacing(weights)
+    candidates = candidate_positions(length, width, 10, 10, max_candidates=50, max_spacing=spacing)
+    assert np.diff(np.unique(candidates[:, 0])).max() <= spacing
+    assert np.diff(np.unique(candidates[:, 1])).max() <= spacing
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+import dfma_batch
+
+SCENARIOS = pd.DataFrame([
+    ["CIS Column", "CIS Beam", "CIS Slab", 10, 10, 3.0, 60, 40, 6],
+    ["PC Column", "PT Beam", "1.2HC Slab", 8, 9, 5.0, 60, 40, 4],
+], columns=dfma_batch.SCENARIO_COLUMNS)
+
+
+def test_results_written_in_input_order(tmp_path):
+    scenarios = tmp_path / "scenarios.csv"
+    output = tmp_path / "results.csv"
+    SCENARIOS.to_csv(scenarios, index=False)
+    output.write_text("stale")
+    assert dfma_batch.main([str(scenarios), str(output), "--chunk-size", "1", "--quiet"]) == 0
+    results = pd.read_csv(output, keep_default_na=False)
+    assert results[["column", "slab"]].values.tolist() == SCENARIOS[["column", "slab"]].values.tolist()
+    assert (results["error"] == "").all()
+    # No temporary file is left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["results.csv", "scenarios.csv"]
+
+
+def test_refuses_to_overwrite_the_scenario_file(tmp_path):
+    scenarios = tmp_path / "scenarios.csv"
+    SCENARIOS.to_csv(scenarios, index=False)
+    before = scenarios.read_bytes()
+    with pytest.raises(SystemExit):
+        dfma_batch.main([str(scenarios), str(tmp_path / "." / "scenarios.csv")])
+    assert scenarios.read_bytes() == before
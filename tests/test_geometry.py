@@ -0,0 +1,44 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from design_options import beam_options, slab_options
+from geometry import count_elements, element_counts, iter_layout_elements, layout_elements
+from pipeline import grid_footprint
+
+FOOTPRINTS = ((20, 20), (60, 40), (97, 43))
+SPANS = ((5, 6), (8, 9), (10, 10), (13, 12))
+COLUMN_SIZES_MM = (0.3, 0.6)
+
+
+def layouts():
+    for (length, width), (s1, s2), column_size_mm in itertools.product(FOOTPRINTS, SPANS, COLUMN_SIZES_MM):
+        yield (*grid_footprint(length, width, s1, s2), s1, s2, column_size_mm)
+
+
+@pytest.mark.parametrize("selected_beam", beam_options)
+@pytest.mark.parametrize("selected_slab", slab_options)
+def test_element_counts_match_the_elements(selected_beam, selected_slab):
+    for layout in layouts():
+        counts = element_counts(*layout, selected_beam, selected_slab)
+        expected = count_elements(layout_elements(*layout, selected_beam, selected_slab))
+        assert {name: int(round(count)) for name, count in counts.items()} == expected, layout
+
+
+@pytest.mark.parametrize("selected_beam", beam_options)
+def test_element_counts_batch_matches_scalar(selected_beam):
+    rows = [(*layout, slab) for layout in layouts() for slab in slab_options]
+    length, width, s1, s2, column_size_mm = (np.array([row[i] for row in rows], dtype=float) for i in range(5))
+    batch = element_counts(length, width, s1, s2, column_size_mm, selected_beam, np.array([row[5] for row in rows]))
+    for i, row in enumerate(rows):
+        for name, count in element_counts(*row[:5], selected_beam, row[5]).items():
+            assert np.broadcast_to(batch[name], len(rows))[i] == pytest.approx(count), (row, name)
+
+
+def test_chunks_hold_the_same_elements():
+    layout = (*grid_footprint(97, 43, 8, 9), 8, 9, 0.6)
+    elements = layout_elements(*layout, "CIS Beam", "1.2HCS_S3")
+    chunks = list(iter_layout_elements(*layout, "CIS Beam", "1.2HCS_S3", chunk_size=50))
+    assert max(len(chunk) for chunk in chunks) <= 50
+    assert np.array_equal(np.concatenate(chunks), elements)
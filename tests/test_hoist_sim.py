@@ -0,0 +1,48 @@
+import dataclasses
+import math
+
+import pytest
+
+from hoist_sim import SiteLogistics, floor_lifts, simulate_hoisting
+from pipeline import run_pipeline
+
+# No lift spread, no waiting for trailers, trucks or material hoists
+DETERMINISTIC = SiteLogistics(lift_spread=0, poisson_arrivals=False, trailer_interval_hours=0, truck_interval_hours=0,
+                              pour_hours=0, material_hoist_hours=0)
+
+COMBINATIONS = (("CIS Column", "CIS Beam", "CIS Slab"), ("PC Column", "CIS Beam", "1.2HC Slab"),
+                ("PC Column", "PT Beam", "2.4HCS_S3"))
+FOOTPRINTS = ((60, 40), (100, 40), (300, 100))
+
+
+def scenario_outputs():
+    return [run_pipeline(*combination, 10, 10, 3.0, length, width, 6)["outputs"]
+            for combination in COMBINATIONS for length, width in FOOTPRINTS]
+
+
+@pytest.mark.parametrize("outputs", scenario_outputs())
+def test_single_crane_cycle_is_floor_cycle_days(outputs):
+    outputs = dataclasses.replace(outputs, no_tower_cranes=1)
+    result = simulate_hoisting(outputs, floors=3, logistics=DETERMINISTIC)
+    assert result.summary()["expected_cycle_days"] == outputs.floor_cycle_days
+    # floor_cycle_days is rounded to 0.01 day
+    assert result.floors["cycle_days"].to_numpy() == pytest.approx(outputs.floor_cycle_days, abs=0.01)
+
+
+@pytest.mark.parametrize("outputs", scenario_outputs())
+def test_cranes_round_up_whole_lifts_per_phase(outputs):
+    result = simulate_hoisting(outputs, floors=3, logistics=DETERMINISTIC)
+    lift_days = DETERMINISTIC.weather_factor * DETERMINISTIC.hoist_hours / DETERMINISTIC.hours_per_day
+    lifts, _ = floor_lifts(outputs)
+    assert sum(lifts) == outputs.hoist_count_tower_crane
+    cycle_days = result.floors["cycle_days"].to_numpy()
+    assert cycle_days == pytest.approx(sum(math.ceil(n / outputs.no_tower_cranes) for n in lifts) * lift_days)
+    # At most one partly used round of lifts per phase beyond the closed form
+    assert (cycle_days >= outputs.floor_cycle_days - 0.01).all()
+    assert (cycle_days <= outputs.floor_cycle_days + len(lifts) * lift_days).all()
+
+
+def test_random_runs_repeat_with_a_seed():
+    outputs = scenario_outputs()[0]
+    first, second = (simulate_hoisting(outputs, floors=2, seed=7).floors for _ in range(2))
+    assert first.equals(second)
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from optimize import OBJECTIVES, evaluate_designs, optimize_spans, span_grid
+
+
+@pytest.mark.parametrize("objective", OBJECTIVES)
+def test_best_layouts_minimise_the_objective_per_m2(objective):
+    best, _ = optimize_spans("CIS Column", "CIS Beam", "CIS Slab", 3.0, 60, 40, 6, objective=objective, top_k=5, min_coverage=0.0)
+    per_m2 = best[f"{objective}_per_m2"].to_numpy()
+    assert (np.diff(per_m2) >= 0).all()
+
+    s1, s2 = span_grid()
+    designs, valid = evaluate_designs("CIS Column", "CIS Beam", "CIS Slab", s1, s2, 3.0, 60, 40, 6)
+    assert per_m2[0] == designs[valid][f"{objective}_per_m2"].min()
+    for _, row in best.iterrows():
+        outputs = row["result"]["outputs"]
+        assert getattr(outputs, objective) == row[objective]
+        assert row[f"{objective}_per_m2"] == pytest.approx(row[objective] / (row["building_length"] * row["building_width"]))
+
+
+def test_layouts_dropping_footprint_do_not_win():
+    # On totals a 55 m x 31.5 m layout (72% of the footprint) used to come first
+    best, _ = optimize_spans("CIS Column", "CIS Beam", "CIS Slab", 3.0, 60, 40, 6, top_k=1, min_coverage=0.0)
+    assert best["coverage"].iloc[0] == 1.0
@@ -0,0 +1,61 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from design_options import available_combinations
+from geometry import crane_centres
+from output_data import calculate_layout_outputs_batch
+from pipeline import grid_footprint, run_pipeline
+
+SIZING_ARGUMENTS = ("b_s1_mm", "d_s1_mm", "b_s2_mm", "d_s2_mm", "b_s3_mm", "d_s3_mm", "slab_thickness_mm",
+                    "slab_max_spacing_pt_mm", "hcs_slab_thickness_mm")
+
+# Footprints inside the regular form and large sites, long or wide
+FOOTPRINTS = ((20, 20), (60, 40), (100, 40), (300, 100), (60, 2000), (2000, 60))
+SPANS = ((5, 6), (8, 9), (10, 10), (13, 12))
+LIVE_LOADS = (2.5, 7.5)
+
+
+def scenario_results(combination):
+    results = []
+    for (length, width), (s1, s2), live_load, f2f in itertools.product(FOOTPRINTS, SPANS, LIVE_LOADS, (3, 6)):
+        building_length, building_width = grid_footprint(length, width, s1, s2)
+        try:
+            results.append(run_pipeline(combination["column"], combination["beam"], combination["slab"], s1, s2, live_load,
+                                        building_length, building_width, f2f))
+        except ValueError:
+            continue
+    return results
+
+
+@pytest.mark.parametrize("combination", available_combinations, ids=lambda c: f"{c['column']}/{c['beam']}/{c['slab']}")
+def test_layout_batch_matches_scalar(combination):
+    results = scenario_results(combination)
+    assert results
+
+    def column(name):
+        return np.array([r[name] for r in results], dtype=float)
+
+    batch = calculate_layout_outputs_batch(
+        column("s1"), column("s2"), column("live_load"), column("column_size_mm"), combination["column"], combination["beam"],
+        np.array([r["selected_slab"] for r in results], dtype=object), column("length"), column("width"),
+        *(column(name) for name in SIZING_ARGUMENTS), column("f2f"))
+    for i, result in enumerate(results):
+        assert batch[i] == result["outputs"]
+
+
+@pytest.mark.parametrize("length, width", FOOTPRINTS)
+def test_crane_count_matches_crane_positions(length, width):
+    s1, s2 = 10, 10
+    length, width = grid_footprint(length, width, s1, s2)
+    outputs = run_pipeline("CIS Column", "CIS Beam", "CIS Slab", s1, s2, 3.0, length, width, 6)["outputs"]
+    assert len(crane_centres(length, width, s1, s2)) == outputs.no_tower_cranes
+
+
+def test_wide_site_gets_rows_of_cranes():
+    narrow = run_pipeline("CIS Column", "CIS Beam", "CIS Slab", 10, 10, 3.0, 60, 40, 6)["outputs"]
+    wide = run_pipeline("CIS Column", "CIS Beam", "CIS Slab", 10, 10, 3.0, 60, 2000, 6)["outputs"]
+    assert wide.no_tower_cranes > narrow.no_tower_cranes
+    # A 50 times wider floor should not take 50 times longer to hoist
+    assert wide.floor_cycle_days < 2 * narrow.floor_cycle_days
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from pareto import PARETO_OBJECTIVES, evaluate_design_space, pareto_designs, pareto_front
+
+
+def pairwise_front(values):
+    # Reference: a row is dominated when another row is no worse everywhere and better somewhere
+    no_worse = (values[None, :, :] <= values[:, None, :]).all(axis=2)
+    better = (values[None, :, :] < values[:, None, :]).any(axis=2)
+    return ~(no_worse & better).any(axis=1)
+
+
+@pytest.mark.parametrize("objectives", [1, 2, 3, 4, 5])
+@pytest.mark.parametrize("seed", range(5))
+def test_front_matches_pairwise_check_with_ties(objectives, seed):
+    rng = np.random.default_rng(seed)
+    # Few distinct values, so many rows tie on some or all objectives
+    values = rng.integers(0, rng.integers(2, 30), size=(rng.integers(1, 2000), objectives)).astype(float)
+    assert (pareto_front(values) == pairwise_front(values)).all()
+
+
+@pytest.mark.parametrize("objectives", [3, 4])
+def test_front_matches_pairwise_check_on_anticorrelated_data(objectives):
+    # Points near a simplex: most of them are on the front
+    rng = np.random.default_rng(objectives)
+    values = rng.random((3000, objectives))
+    values = values / values.sum(axis=1, keepdims=True) + rng.normal(0, 0.01, values.shape)
+    assert (pareto_front(values) == pairwise_front(values)).all()
+
+
+def test_front_is_per_m2_of_the_kept_footprint():
+    designs = evaluate_design_space([3.0], 60, 40, 6)
+    front = pareto_designs(designs)
+    assert len(front) and (front["coverage"] >= 0.9).all()
+    area = front["building_length"] * front["building_width"]
+    for objective in PARETO_OBJECTIVES:
+        assert np.allclose(front[objective], front[objective.removesuffix("_per_m2")] / area)
@@ -0,0 +1,37 @@
+import argparse
+
+from pipeline import (PipelineCache, add_scenario_arguments, cached_result, generate, grid_footprint, run_pipeline,
+                      scenario_inputs, scenario_result)
+
+
+def parse(argv, **kwargs):
+    parser = argparse.ArgumentParser()
+    add_scenario_arguments(parser, **kwargs)
+    return parser.parse_args(argv)
+
+
+def test_scenario_inputs_snap_the_footprint():
+    args = parse(["--s1", "7", "--s2", "9", "--length", "60", "--width", "40"])
+    assert scenario_inputs(args) == ("CIS Column", "CIS Beam", "CIS Slab", 7, 9, 3.0, *grid_footprint(60, 40, 7, 9), 6)
+
+
+def test_scenario_defaults_can_be_overridden():
+    args = parse([], column="PC Column", slab="1.2HC Slab")
+    assert (args.column, args.beam, args.slab) == ("PC Column", "CIS Beam", "1.2HC Slab")
+    assert not hasattr(parse([], spans=False), "s1")
+
+
+def test_scenario_result_runs_the_pipeline():
+    args = parse(["--live-load", "5"])
+    result = scenario_result(args, storeys=10)
+    assert result["storeys"] == 10
+    assert result["outputs"] == run_pipeline(*scenario_inputs(args), storeys=10)["outputs"]
+
+
+def test_generate_reuses_the_cached_result():
+    cache = PipelineCache()
+    scenario = ("CIS Column", "CIS Beam", "CIS Slab", 10, 10, 3.0, 60, 40, 6)
+    result = cached_result(*scenario, cache=cache)
+    assert cached_result(*scenario, cache=cache) is result
+    assert generate(*scenario, cache=cache)[0] is result
+    assert cached_result(*scenario, storeys=10, cache=cache)["storeys"] == 10
@@ -0,0 +1,76 @@
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+import pytest
+
+import plan_export
+from design_options import available_combinations
+from geometry import CRANE_REACH_RADII, CRANE_SQUARES, crane_centres, element_counts
+from plan_export import LAYERS, plan_bytes
+from pipeline import grid_footprint, run_pipeline
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+@pytest.fixture(params=available_combinations, ids=lambda c: f"{c['column']}/{c['beam']}/{c['slab']}")
+def result(request, monkeypatch):
+    # Small chunks, so that every family is written in several slices
+    monkeypatch.setattr(plan_export, "CHUNK_ELEMENTS", 7)
+    combination = request.param
+    length, width = grid_footprint(40, 30, 8, 7)
+    return run_pipeline(combination["column"], combination["beam"], combination["slab"], 8, 7, 3.0, length, width, 6)
+
+
+def expected_polylines(result):
+    counts = element_counts(result["length"], result["width"], result["s1"], result["s2"], result["column_size_mm"],
+                            result["selected_beam"], result["selected_slab"])
+    cranes = len(crane_centres(result["length"], result["width"], result["s1"], result["s2"]))
+    expected = {
+        "BOUNDARY": 1,
+        "COLUMNS": counts["column"],
+        "BEAMS": counts["beam_s1"] + counts["beam_s2"] + counts["beam_s3"] + (result["selected_beam"] == "PT Flat Slab"),
+        "SLAB": counts["hcs_panel"],
+        "DROP_PANELS": counts["drop_panel"],
+        "CRANES": cranes * len(CRANE_SQUARES),
+    }
+    return {layer: round(count) for layer, count in expected.items() if count}, cranes
+
+
+def dxf_entities(text):
+    lines = text.split("\n")
+    assert lines[-1] == ""
+    pairs = list(zip(lines[:-1:2], lines[1:-1:2]))
+    assert len(lines[:-1]) == 2 * len(pairs)
+    assert pairs[-1] == ("0", "EOF")
+
+    # (entity, layer) of every entity in the ENTITIES section
+    start = pairs.index(("2", "ENTITIES"))
+    entities = []
+    for (code, value), (next_code, layer) in zip(pairs[start:], pairs[start + 1:]):
+        if code == "0" and value in ("LINE", "POLYLINE", "CIRCLE", "TEXT"):
+            assert next_code == "8"
+            entities.append((value, layer))
+    return entities
+
+
+def test_dxf_entities_match_the_elements(result):
+    entities = dxf_entities(plan_bytes(result, "dxf").decode("utf-8"))
+    assert {layer for _, layer in entities} <= set(LAYERS)
+    expected, cranes = expected_polylines(result)
+    polylines = Counter(layer for entity, layer in entities if entity == "POLYLINE")
+    assert dict(polylines) == expected
+    assert Counter(layer for entity, layer in entities if entity == "CIRCLE") == {"CRANE_REACH": cranes * len(CRANE_REACH_RADII)}
+
+
+def test_svg_paths_match_the_elements(result):
+    root = ET.fromstring(plan_bytes(result, "svg"))
+    subpaths = Counter()
+    for path in root.iter(f"{SVG}path"):
+        assert path.get("class") in LAYERS
+        subpaths[path.get("class")] += path.get("d").count("M")
+    expected, cranes = expected_polylines(result)
+    # Line segments are subpaths too (crane crosses, grid and stairs)
+    subpaths["CRANES"] -= 2 * cranes
+    del subpaths["GRID"], subpaths["STAIRS"]
+    assert dict(subpaths) == expected
+    assert Counter(c.get("class") for c in root.iter(f"{SVG}circle")) == {"CRANE_REACH": cranes * len(CRANE_REACH_RADII)}
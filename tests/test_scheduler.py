@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from pipeline import run_pipeline
+from scheduler import TRADES, build_network, critical_path, main, schedule_network, topological_order
+
+CREWS = ({}, {"column": 2, "beam": 3, "slab": 2}, {"casting": 4, "stairs": 2})
+
+
+@pytest.fixture(scope="module")
+def network():
+    result = run_pipeline("PC Column", "CIS Beam", "1.2HC Slab", 10, 10, 3.0, 100, 40, 6)
+    return build_network(result["outputs"], storeys=6, zones=3)
+
+
+def schedule_by_activity(network, crews):
+    gantt, summary = schedule_network(network, crews)
+    # Back to network order, so rows line up with the predecessors
+    return gantt.set_index("activity").loc[network.names()].reset_index(), summary
+
+
+@pytest.mark.parametrize("crews", CREWS)
+def test_crews_never_overlap(network, crews):
+    gantt, _ = schedule_by_activity(network, crews)
+    for (trade, crew), jobs in gantt.groupby(["trade", "crew"]):
+        assert 1 <= crew <= crews.get(trade, 1)
+        jobs = jobs.sort_values("start_day")
+        assert (jobs["start_day"].to_numpy()[1:] >= jobs["finish_day"].to_numpy()[:-1] - 1e-9).all(), (trade, crew)
+
+
+@pytest.mark.parametrize("crews", CREWS)
+def test_activities_follow_their_predecessors(network, crews):
+    gantt, summary = schedule_by_activity(network, crews)
+    start, finish = gantt["start_day"].to_numpy(), gantt["finish_day"].to_numpy()
+    for activity, predecessors in enumerate(network.predecessors):
+        assert all(start[activity] >= finish[p] - 1e-9 for p in predecessors)
+    assert summary["duration_days"] >= summary["critical_path_days"] - 1e-9
+    assert gantt.loc[gantt["critical"], "finish_day"].max() == pytest.approx(summary["duration_days"])
+
+
+def test_unlimited_crews_finish_on_the_critical_path(network):
+    gantt, summary = schedule_by_activity(network, {trade: len(network) for trade in TRADES})
+    assert summary["duration_days"] == pytest.approx(summary["critical_path_days"])
+    early_start, _, _ = critical_path(gantt["duration_days"], network.predecessors)
+    assert np.allclose(gantt["start_day"], early_start)
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(ValueError):
+        topological_order([[2], [0], [1]])
+
+
+def test_trades_without_crews_are_rejected(network):
+    with pytest.raises(ValueError, match="beam crew"):
+        schedule_network(network, {"beam": 0})
+
+
+@pytest.mark.parametrize("option", ["--crews", "--crew-size"])
+@pytest.mark.parametrize("count", ["0", "-2", "1.5", "many"])
+def test_cli_rejects_bad_counts(option, count, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main([option, f"column={count}"])
+    assert exit_info.value.code == 2
+    assert f"{option} column={count}" in capsys.readouterr().err
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from output_data import HOIST_HOURS
+from pipeline import run_pipeline
+from sensitivity import PARAMETERS, RATE_PARAMETERS, evaluate_sharded, morris, nominal_values, sobol
+
+SCENARIO = ("PC Column", "CIS Beam", "1.2HC Slab", 10, 10, 3.0, 60, 40, 6)
+
+# The productivity rates leave the hoist counts alone, so over these
+# parameters the floor cycle is linear in hoist_hours alone
+NAMES = RATE_PARAMETERS + ("hoist_hours",)
+SPREAD = 0.2
+
+
+def floor_cycle(indices):
+    return indices[indices["output"] == "floor_cycle_days"].set_index("parameter")
+
+
+def test_sobol_puts_the_floor_cycle_on_hoist_hours():
+    indices, evaluations = sobol(SCENARIO, SPREAD, samples=4096, names=NAMES, seed=1)
+    assert evaluations == 4096 * (len(NAMES) + 2)
+    indices = floor_cycle(indices)
+    assert indices.loc["hoist_hours", "ST"] == pytest.approx(1, abs=0.05)
+    assert indices.loc["hoist_hours", "S1"] == pytest.approx(1, abs=0.05)
+    assert indices.drop("hoist_hours")["ST"].abs().max() < 1e-3
+
+
+def test_morris_effect_is_the_analytic_slope():
+    indices, evaluations = morris(SCENARIO, SPREAD, trajectories=20, names=NAMES, seed=1)
+    assert evaluations == 20 * (len(NAMES) + 1)
+    outputs = run_pipeline(*SCENARIO)["outputs"]
+    # Change of 1.3*hoist_hours*hoist_count/cranes/8 over the full range of hoist_hours
+    slope = 1.3 * 2 * SPREAD * HOIST_HOURS * outputs.hoist_count_tower_crane / outputs.no_tower_cranes / 8
+    indices = floor_cycle(indices)
+    # Rounding the floor cycle to 0.01 day moves each effect by at most 0.015
+    assert indices.loc["hoist_hours", "mu"] == pytest.approx(slope, abs=0.02)
+    assert indices.loc["hoist_hours", "mu_star"] == pytest.approx(slope, abs=0.02)
+    assert indices.drop("hoist_hours")["mu_star"].max() < 0.02
+
+
+def test_nominal_parameters_reproduce_the_pipeline():
+    nominal = nominal_values()
+    outputs = evaluate_sharded(SCENARIO, list(PARAMETERS), np.array([[nominal[name] for name in PARAMETERS]]))
+    expected = run_pipeline(*SCENARIO)["outputs"]
+    assert outputs[0] == pytest.approx([expected.total_mandays_crane, expected.floor_cycle_days])
+
+
+def test_sharded_workers_match_the_serial_run():
+    values = np.random.default_rng(2).uniform(0.8, 1.2, (300, len(NAMES))) * [nominal_values()[name] for name in NAMES]
+    serial = evaluate_sharded(SCENARIO, list(NAMES), values, workers=1, shard_size=64)
+    assert np.array_equal(evaluate_sharded(SCENARIO, list(NAMES), values, workers=2, shard_size=64), serial)
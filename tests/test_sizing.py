@@ -0,0 +1,65 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from beam_rc import calculate_beam_size, calculate_beam_size_batch
+from column_rc import calculate_column_size, calculate_column_size_batch
+from design_options import available_combinations
+from slab_rc import (calculate_slab_thickness, calculate_slab_thickness_batch, hcs_selected_slab_check,
+                     hcs_selected_slab_check_batch)
+
+# Whole-metre spans, floor heights and a spread of live loads over the UI domain
+S1 = range(5, 14)
+S2 = range(1, 13)
+LIVE_LOADS = (0.5, 2.5, 3.0, 5.0, 7.5, 10.0, 12.5, 15.0, 20.0)
+F2F = range(2, 7)
+DESIGN_PAIRS = sorted({(c["beam"], c["slab"]) for c in available_combinations})
+
+
+def grid(*axes):
+    return [np.array(values, dtype=float) for values in zip(*itertools.product(*axes))]
+
+
+@pytest.mark.parametrize("selected_column", ["CIS Column", "PC Column"])
+@pytest.mark.parametrize("storeys", [1, 5, 60])
+def test_column_batch_matches_scalar(selected_column, storeys):
+    s1, s2, live_load, f2f = grid(S1, S2, LIVE_LOADS, F2F)
+    size, weight = calculate_column_size_batch(s1, s2, live_load, selected_column, f2f, storeys=storeys)
+    expected = [calculate_column_size(*args, selected_column, f2f_, storeys=storeys)
+                for *args, f2f_ in zip(s1.tolist(), s2.tolist(), live_load.tolist(), f2f.tolist())]
+    assert size.tolist() == [s for s, _ in expected]
+    assert weight.tolist() == [w for _, w in expected]
+
+
+@pytest.mark.parametrize("selected_slab", ["CIS Slab", "PT Flat Slab", "1.2HC Slab", "2.4HC Slab"])
+def test_slab_check_batch_matches_scalar(selected_slab):
+    s1, live_load = grid(S1, LIVE_LOADS)
+    checked = hcs_selected_slab_check_batch(s1, live_load, selected_slab)
+    assert checked.tolist() == [hcs_selected_slab_check(a, q, selected_slab) for a, q in zip(s1.tolist(), live_load.tolist())]
+
+
+@pytest.mark.parametrize("selected_slab", ["CIS Slab", "PT Flat Slab", "1.2HC Slab", "2.4HC Slab", "1.2HCS_S3", "2.4HCS_S3"])
+def test_slab_thickness_batch_matches_scalar(selected_slab):
+    s1, s2, live_load = grid(S1, S2, LIVE_LOADS)
+    batch = calculate_slab_thickness_batch(s1, s2, live_load, selected_slab, strict=False)
+    for i, args in enumerate(zip(s1.tolist(), s2.tolist(), live_load.tolist())):
+        try:
+            expected = calculate_slab_thickness(*args, selected_slab)
+        except ValueError:
+            # The scalar function raises where the batch leaves NaN
+            assert math.isnan(batch[2][i])
+            continue
+        assert (batch[0][i], batch[1][i], batch[2][i]) == expected
+
+
+@pytest.mark.parametrize("selected_beam, selected_slab", DESIGN_PAIRS)
+def test_beam_batch_matches_scalar(selected_beam, selected_slab):
+    s1, s2, live_load, f2f = grid(S1, S2, LIVE_LOADS, F2F)
+    column_size, _ = calculate_column_size_batch(s1, s2, live_load, "CIS Column", f2f)
+    effective_slab = hcs_selected_slab_check_batch(s1, live_load, selected_slab)
+    batch = np.column_stack(calculate_beam_size_batch(s1, s2, live_load, column_size, selected_beam, effective_slab))
+    expected = [calculate_beam_size(*args) for args in
+                zip(s1.tolist(), s2.tolist(), live_load.tolist(), column_size.tolist(), [selected_beam] * len(s1), effective_slab.tolist())]
+    assert batch.tolist() == [list(sizes) for sizes in expected]